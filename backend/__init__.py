@@ -0,0 +1,8 @@
+"""
+Backend package for the Daily Wellness Tracker application.
+"""
+
+import time
+
+# Reference point for the startup report printed from the application lifespan
+IMPORT_STARTED_AT = time.perf_counter()
@@ -0,0 +1,271 @@
+"""
+Weighted, category-aware affirmation sampling and bulk import.
+
+Affirmations are loaded into memory and a Walker alias table is built per category
+(plus one over all affirmations), so drawing a weighted random affirmation costs
+two random numbers no matter how many affirmations exist. The tables are rebuilt
+after a TTL, or within seconds when the table's row count or newest id changes, so
+affirmations imported from the command line show up without a restart.
+
+Imports stream CSV or NDJSON files row by row and insert in batches, so large
+curated collections load in one transaction without being read into memory.
+"""
+
+import csv
+import json
+import math
+import random
+import threading
+import time
+import unicodedata
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from typing import IO
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from .database import Affirmation
+
+
+class AliasTable:
+    """
+    Walker alias table for O(1) sampling from a discrete weighted distribution.
+
+    Built with Vose's method in O(n); each sample picks a column uniformly and then
+    either keeps it or takes its alias.
+    """
+
+    def __init__(self, weights: list[float]):
+        """Build the table; weights must be non-negative with a positive sum."""
+        total = sum(weights)
+        if not weights or total <= 0:
+            raise ValueError("weights must contain a positive value")
+
+        n = len(weights)
+        scaled = [weight * n / total for weight in weights]
+        self.probabilities = [1.0] * n
+        self.aliases = list(range(n))
+
+        small = [i for i, value in enumerate(scaled) if value < 1]
+        large = [i for i, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+        # Whatever is left is 1 up to rounding error and keeps probability 1
+
+    def __len__(self) -> int:
+        return len(self.probabilities)
+
+    def sample(self, rng: random.Random) -> int:
+        """Index of a randomly drawn item."""
+        column = int(rng.random() * len(self.probabilities))
+        return column if rng.random() < self.probabilities[column] else self.aliases[column]
+
+
+def normalize_category(category: str | None) -> str | None:
+    """Categories are matched case-insensitively; blank means no category."""
+    category = (category or "").strip().lower()
+    return category or None
+
+
+def load_affirmations(db: Session) -> list[tuple[int, str, str | None, float]]:
+    """All affirmations that can be shown, as (id, text, category, weight) rows."""
+    rows = db.execute(
+        select(Affirmation.id, Affirmation.text, Affirmation.category, Affirmation.weight).where(Affirmation.weight > 0)
+    ).all()
+    return [(row.id, row.text, row.category, row.weight) for row in rows]
+
+
+def affirmations_version(db: Session) -> tuple[int, int]:
+    """Row count and newest id of the affirmations table, which change whenever rows are added or removed."""
+    count, newest_id = db.execute(select(func.count(), func.max(Affirmation.id)).select_from(Affirmation)).one()
+    return count, newest_id or 0
+
+
+class AffirmationSampler:
+    """
+    Draws affirmations with probability proportional to their weight.
+
+    Attributes:
+        ttl: Seconds before the tables are rebuilt from the database
+        check_interval: Seconds between checks of the data version, when the caller passes one
+    """
+
+    # Key of the table spanning every category
+    ALL = ""
+
+    def __init__(self, ttl: float = 300, check_interval: float = 5):
+        """Initialize an empty sampler; tables are built on the first draw."""
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+        self._tables: dict[str, tuple[list[tuple[int, str]], AliasTable]] | None = None
+        self._built_at = 0.0
+        self._version: Hashable = None
+        self._checked_at = 0.0
+
+    def invalidate(self) -> None:
+        """Rebuild the tables on the next draw, e.g. after importing affirmations."""
+        with self._lock:
+            self._tables = None
+
+    def sample(
+        self,
+        loader: Callable[[], Iterable[tuple[int, str, str | None, float]]],
+        category: str | None = None,
+        version: Callable[[], Hashable] | None = None,
+    ) -> tuple[int, str] | None:
+        """
+        Draw a weighted random affirmation.
+
+        Args:
+            loader: Returns (id, text, category, weight) rows when the tables need building
+            category: Only draw from this category (case-insensitive); None draws from all
+            version: Returns a cheap fingerprint of the data, e.g. `affirmations_version`;
+                the tables are rebuilt when it changes
+
+        Returns:
+            tuple[int, str] | None: The affirmation's id and text, or None if none match.
+        """
+        tables = self._current_tables(loader, version)
+        entry = tables.get(normalize_category(category) or self.ALL)
+        if entry is None:
+            return None
+
+        items, table = entry
+        return items[table.sample(self._rng)]
+
+    def categories(
+        self,
+        loader: Callable[[], Iterable[tuple[int, str, str | None, float]]],
+        version: Callable[[], Hashable] | None = None,
+    ) -> list[str]:
+        """Names of the categories that have affirmations."""
+        return sorted(key for key in self._current_tables(loader, version) if key != self.ALL)
+
+    def _current_tables(self, loader, version=None) -> dict[str, tuple[list[tuple[int, str]], AliasTable]]:
+        now = time.monotonic()
+        with self._lock:
+            tables, built_version = self._tables, self._version
+            fresh = tables is not None and now - self._built_at < self.ttl
+            check = fresh and version is not None and now - self._checked_at >= self.check_interval
+            if check:
+                self._checked_at = now
+        if fresh and not check:
+            return tables
+
+        # Read the version before the rows, so rows added in between trigger another rebuild
+        current_version = version() if version is not None else None
+        if fresh and current_version == built_version:
+            return tables
+
+        # Build outside the lock; concurrent rebuilds produce equivalent tables
+        tables = self._build(loader())
+        with self._lock:
+            self._tables = tables
+            self._version = current_version
+            self._built_at = self._checked_at = time.monotonic()
+        return tables
+
+    def _build(self, rows: Iterable[tuple[int, str, str | None, float]]) -> dict:
+        grouped: dict[str, tuple[list[tuple[int, str]], list[float]]] = {}
+        for affirmation_id, text, category, weight in rows:
+            for key in {self.ALL, normalize_category(category) or self.ALL}:
+                items, weights = grouped.setdefault(key, ([], []))
+                items.append((affirmation_id, text))
+                weights.append(weight)
+
+        return {key: (items, AliasTable(weights)) for key, (items, weights) in grouped.items()}
+
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+def normalize_affirmation(text: str) -> str:
+    """Canonical form of an affirmation: NFC-normalized with single spaces."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def read_affirmation_rows(stream: IO[str], import_format: str) -> Iterator[dict | None]:
+    """
+    Lazily parse an import file into row dicts.
+
+    CSV files need a `text` header and may have `category` and `weight`; NDJSON lines
+    are objects with the same keys. Unparseable lines yield None.
+    """
+    if import_format == "csv":
+        yield from csv.DictReader(stream)
+    elif import_format == "ndjson":
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                yield None
+                continue
+            yield row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f"Unsupported import format: {import_format}")
+
+
+def import_affirmations(db: Session, rows: Iterable[dict | None], batch_size: int = 1000) -> dict:
+    """
+    Insert new affirmations from parsed rows in batches within a single transaction.
+
+    Texts are normalized and compared case-insensitively against a hash set seeded
+    with the affirmations already stored, so duplicates (in the file or the database)
+    are skipped and re-running an import is harmless.
+
+    Args:
+        db: Database session; committed once all rows are inserted.
+        rows: Parsed rows with `text` and optional `category` and `weight`
+        batch_size: Rows per executemany call
+
+    Returns:
+        dict: Rows read, inserted, skipped as duplicates or invalid, and throughput.
+    """
+    started = time.perf_counter()
+    seen = {normalize_affirmation(text).casefold() for text in db.execute(select(Affirmation.text)).scalars()}
+    report = {"read": 0, "inserted": 0, "duplicates": 0, "invalid": 0}
+    batch: list[dict] = []
+
+    for row in rows:
+        report["read"] += 1
+        row = row or {}
+        text = normalize_affirmation(str(row.get("text") or ""))
+        raw_weight = row.get("weight")
+        try:
+            weight = 1.0 if raw_weight in (None, "") else float(raw_weight)
+        except (TypeError, ValueError):
+            weight = math.nan
+        if not text or not math.isfinite(weight) or weight < 0:
+            report["invalid"] += 1
+            continue
+
+        key = text.casefold()
+        if key in seen:
+            report["duplicates"] += 1
+            continue
+        seen.add(key)
+
+        category = normalize_category(str(row.get("category") or ""))
+        batch.append({"text": text, "category": category, "weight": weight})
+        if len(batch) >= batch_size:
+            db.execute(insert(Affirmation), batch)
+            report["inserted"] += len(batch)
+            batch = []
+
+    if batch:
+        db.execute(insert(Affirmation), batch)
+        report["inserted"] += len(batch)
+    db.commit()
+
+    seconds = time.perf_counter() - started
+    report["seconds"] = round(seconds, 3)
+    report["rows_per_second"] = round(report["read"] / seconds) if seconds > 0 else 0
+    return report
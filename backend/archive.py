@@ -0,0 +1,116 @@
+"""
+Archival of old daily tasks into a cold table.
+
+The planner mostly shows recent days, so tasks older than a configurable horizon
+are moved from `daily_tasks` to `daily_tasks_archive` by a scheduled job. Each
+chunk is moved in its own short transaction so the job never holds SQLite's write
+lock for long.
+
+Readers decide from the data whether to consult the archive: a user's newest archived
+date is an index-only lookup, and only days up to it are read from both tables. Tasks
+archived under an earlier, shorter horizon thus stay visible when the horizon is
+raised or archival is turned off, which keeps archival invisible to the API.
+"""
+
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from .database import ArchivedTask, DailyTask
+
+TASK_COLUMNS = ["id", "task_text", "completed", "created_date", "user_id"]
+
+
+def archive_cutoff(horizon_days: int, today: date | None = None) -> str:
+    """First date (YYYY-MM-DD) that is still kept in the hot table."""
+    today = today or date.today()
+    return (today - timedelta(days=horizon_days)).isoformat()
+
+
+def archived_through(db: Session, user_id: str) -> str | None:
+    """Newest date (YYYY-MM-DD) of a user's archived tasks, or None when none were archived."""
+    return db.execute(select(func.max(ArchivedTask.created_date)).where(ArchivedTask.user_id == user_id)).scalar()
+
+
+def may_be_archived(db: Session, user_id: str, task_date: str) -> bool:
+    """Whether some of a user's tasks for `task_date` may have been moved to the archive."""
+    watermark = archived_through(db, user_id)
+    return watermark is not None and task_date <= watermark
+
+
+def get_tasks_for_date(db: Session, user_id: str, task_date: str) -> list[DailyTask | ArchivedTask]:
+    """All of a user's tasks for a date, reading the archive too when the date was archived."""
+    tasks: list[DailyTask | ArchivedTask] = list(
+        db.query(DailyTask).filter(DailyTask.created_date == task_date, DailyTask.user_id == user_id).all()
+    )
+
+    if may_be_archived(db, user_id, task_date):
+        archived = (
+            db.query(ArchivedTask)
+            .filter(ArchivedTask.user_id == user_id, ArchivedTask.created_date == task_date)
+            .order_by(ArchivedTask.id)
+            .all()
+        )
+        tasks = sorted(tasks + archived, key=lambda task: task.id)
+
+    return tasks
+
+
+def find_task(db: Session, task_id: int, user_id: str) -> DailyTask | ArchivedTask | None:
+    """Look up a user's task by id in the hot table, falling back to the archive."""
+    task = db.query(DailyTask).filter(DailyTask.id == task_id, DailyTask.user_id == user_id).first()
+    if task is None:
+        return db.query(ArchivedTask).filter(ArchivedTask.id == task_id, ArchivedTask.user_id == user_id).first()
+    return task
+
+
+def archive_old_tasks(
+    session_factory: Callable[[], Session], horizon_days: int, chunk_size: int = 500, max_chunks: int = 20
+) -> int:
+    """
+    Move tasks older than the horizon into the archive in bounded chunks.
+
+    Args:
+        session_factory: Callable returning a new database session.
+        horizon_days: Tasks dated more than this many days ago are archived.
+        chunk_size: Tasks moved per transaction.
+        max_chunks: Upper bound on transactions per call; the rest waits for the next run.
+
+    Returns:
+        int: Number of tasks moved.
+    """
+    cutoff = archive_cutoff(horizon_days)
+    moved = 0
+
+    for _ in range(max_chunks):
+        with session_factory() as db:
+            task_ids = (
+                db.execute(
+                    select(DailyTask.id).where(DailyTask.created_date < cutoff).order_by(DailyTask.id).limit(chunk_size)
+                )
+                .scalars()
+                .all()
+            )
+            if not task_ids:
+                break
+
+            hot_columns = [getattr(DailyTask, column) for column in TASK_COLUMNS]
+            db.execute(
+                insert(ArchivedTask).from_select(TASK_COLUMNS, select(*hot_columns).where(DailyTask.id.in_(task_ids)))
+            )
+            db.execute(delete(DailyTask).where(DailyTask.id.in_(task_ids)))
+            db.commit()
+
+        moved += len(task_ids)
+        if len(task_ids) < chunk_size:
+            break
+
+    if moved:
+        # Freed pages are reused by new rows; refresh planner statistics for the smaller table
+        with session_factory() as db:
+            if db.get_bind().dialect.name == "sqlite":
+                db.connection().exec_driver_sql("PRAGMA optimize")
+
+    return moved
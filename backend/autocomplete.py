@@ -0,0 +1,172 @@
+"""
+In-memory autocomplete for task text.
+
+Most new tasks repeat earlier ones, so each user's distinct task texts are kept in a
+sorted array searched with bisect. An index is loaded from the database the first
+time a user asks for suggestions and updated as tasks are created, so typing never
+queries the database. Both the number of users and the texts kept per user are
+bounded, keeping memory flat.
+
+Task text is stored HTML-escaped, while suggestions are typed back into the task
+form and escaped again on save, so the index keeps texts as the user wrote them.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from html import unescape
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .database import DailyTask
+
+
+class _Entry:
+    """A distinct task text with how often and how recently it was used."""
+
+    def __init__(self, text: str, count: int, last_date: str):
+        self.text = text
+        self.count = count
+        self.last_date = last_date
+
+    @property
+    def rank(self) -> tuple[int, str]:
+        return self.count, self.last_date
+
+
+class _UserIndex:
+    """Sorted, lower-cased task texts of one user with their usage."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.keys: list[str] = []
+        self.entries: dict[str, _Entry] = {}
+
+    def add(self, stored_text: str, last_date: str, count: int = 1) -> None:
+        text = unescape(stored_text)
+        key = text.lower()
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry.text = text
+            entry.count += count
+            entry.last_date = max(entry.last_date, last_date)
+            return
+
+        if len(self.keys) >= self.max_entries:
+            # Make room by forgetting the least used, least recent text
+            evicted = min(self.entries, key=lambda k: self.entries[k].rank)
+            del self.entries[evicted]
+            del self.keys[bisect_left(self.keys, evicted)]
+
+        self.entries[key] = _Entry(text, count, last_date)
+        insort(self.keys, key)
+
+    def suggest(self, prefix: str, limit: int, scan_limit: int) -> list[str]:
+        prefix = prefix.lower()
+        candidates = []
+        start = bisect_left(self.keys, prefix)
+        for key in self.keys[start : start + scan_limit]:
+            if not key.startswith(prefix):
+                break
+            if key != prefix:
+                candidates.append(self.entries[key])
+
+        candidates.sort(key=lambda entry: entry.rank, reverse=True)
+        return [entry.text for entry in candidates[:limit]]
+
+
+def load_task_history(db: Session, user_id: str, max_entries: int) -> list[tuple[str, int, str]]:
+    """A user's most recently used distinct task texts with their use counts and last dates."""
+    rows = db.execute(
+        select(DailyTask.task_text, func.count(), func.max(DailyTask.created_date))
+        .where(DailyTask.user_id == user_id)
+        .group_by(DailyTask.task_text)
+        .order_by(func.max(DailyTask.created_date).desc())
+        .limit(max_entries)
+    ).all()
+    return [(text, count, last_date or "") for text, count, last_date in rows]
+
+
+class PrefixIndex:
+    """
+    Per-user task text suggestions ranked by frequency, then recency.
+
+    Attributes:
+        max_users: Number of user indexes kept before the least recently used is dropped
+        max_entries_per_user: Distinct task texts remembered per user
+        scan_limit: Prefix matches ranked per lookup, bounding the work for short prefixes
+    """
+
+    def __init__(self, max_users: int = 1000, max_entries_per_user: int = 500, scan_limit: int = 200):
+        """Initialize an empty index."""
+        self.max_users = max_users
+        self.max_entries_per_user = max_entries_per_user
+        self.scan_limit = scan_limit
+
+        self._lock = threading.Lock()
+        self._users: OrderedDict[str, _UserIndex] = OrderedDict()
+        self.hits = 0
+        self.loads = 0
+
+    def __contains__(self, user_id: str) -> bool:
+        with self._lock:
+            return user_id in self._users
+
+    def suggest(
+        self,
+        user_id: str,
+        prefix: str,
+        limit: int,
+        loader: Callable[[], Iterable[tuple[str, int, str]]],
+    ) -> list[str]:
+        """
+        Suggest earlier task texts starting with `prefix`.
+
+        Args:
+            user_id: Owner of the tasks
+            prefix: Text typed so far, unescaped; matching ignores case
+            limit: Maximum number of suggestions
+            loader: Returns (text, count, last_date) rows for the user when their index isn't loaded
+
+        Returns:
+            list[str]: Unescaped suggestions, most used first.
+        """
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is not None:
+                self._users.move_to_end(user_id)
+                self.hits += 1
+                return index.suggest(prefix, limit, self.scan_limit)
+
+        # Load without holding the lock; a concurrent load for the same user is harmless
+        index = _UserIndex(self.max_entries_per_user)
+        for text, count, last_date in loader():
+            index.add(text, last_date, count)
+
+        with self._lock:
+            self.loads += 1
+            index = self._users.setdefault(user_id, index)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+            return index.suggest(prefix, limit, self.scan_limit)
+
+    def record(self, user_id: str, text: str, task_date: str) -> None:
+        """Count a newly created task, if the user's index is loaded."""
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is not None:
+                index.add(text, task_date)
+
+    def discard(self, user_ids: Iterable[str]) -> None:
+        """Drop the indexes of users whose history changed; they are reloaded on the next lookup."""
+        with self._lock:
+            for user_id in user_ids:
+                self._users.pop(user_id, None)
+
+    def stats(self) -> dict:
+        """Loaded users and how many lookups were served from memory."""
+        with self._lock:
+            return {"users": len(self._users), "hits": self.hits, "loads": self.loads}
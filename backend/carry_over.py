@@ -0,0 +1,139 @@
+"""
+Bulk carry-over of unfinished tasks from one day to another.
+
+Moving a day's incomplete tasks is a single `UPDATE` (copying a single
+`INSERT ... SELECT`) instead of deleting and re-creating each task. Tasks whose text
+is already on the target day are skipped, so carrying over twice, or onto a day with
+the same recurring task, doesn't create duplicates.
+
+The nightly job moves every user's tasks with the same statement keyed on the date
+alone, in bounded chunks that each commit on their own, and leaves the target day's
+recurring tasks to be created on its first view, which skips texts already there.
+"""
+
+from collections import Counter
+from collections.abc import Callable
+from datetime import date, timedelta
+
+from sqlalchemy import and_, exists, insert, literal, select, update
+from sqlalchemy.orm import Session, aliased
+
+from .database import DailyTask
+from .recurring import materialize_day
+from .stats import adjust_many_daily_stats
+
+CARRY_OVER_MODES = ("move", "copy")
+
+
+def _carried(from_date: str, to_date: str):
+    """Condition on `DailyTask` rows of `from_date` that are carried over to `to_date`."""
+    existing = aliased(DailyTask)
+    already_there = exists().where(
+        and_(
+            existing.user_id == DailyTask.user_id,
+            existing.created_date == to_date,
+            existing.task_text == DailyTask.task_text,
+        )
+    )
+    return and_(DailyTask.created_date == from_date, DailyTask.completed.is_not(True), ~already_there)
+
+
+def _adjust_moved_stats(db: Session, per_user: Counter, from_date: str, to_date: str, moved: bool) -> None:
+    deltas = {(user_id, to_date): (count, 0) for user_id, count in per_user.items()}
+    if moved:
+        deltas.update({(user_id, from_date): (-count, 0) for user_id, count in per_user.items()})
+    adjust_many_daily_stats(db, deltas)
+
+
+def carry_over_tasks(db: Session, user_ids: list[str], from_date: str, to_date: str, mode: str = "move") -> int:
+    """
+    Move or copy the incomplete tasks of one day to another for the given users.
+
+    Runs in the caller's transaction. Buffered completion toggles must be flushed
+    first, since only the stored state decides what is incomplete.
+
+    Args:
+        db: Database session; the caller commits.
+        user_ids: Owners of the tasks to carry over
+        from_date: Day to take incomplete tasks from (YYYY-MM-DD format)
+        to_date: Day to put them on (YYYY-MM-DD format)
+        mode: "move" re-dates the tasks, "copy" leaves the originals in place
+
+    Returns:
+        int: Number of tasks carried over.
+    """
+    if mode not in CARRY_OVER_MODES:
+        raise ValueError(f"Unsupported carry-over mode: {mode}")
+
+    # Create the target day's recurring tasks first so they aren't duplicated later
+    for user_id in user_ids:
+        materialize_day(db, user_id, to_date)
+
+    carried = and_(DailyTask.user_id.in_(user_ids), _carried(from_date, to_date))
+
+    if mode == "move":
+        statement = update(DailyTask).where(carried).values(created_date=to_date).returning(DailyTask.user_id)
+    else:
+        statement = (
+            insert(DailyTask)
+            .from_select(
+                ["task_text", "completed", "created_date", "user_id"],
+                select(DailyTask.task_text, literal(False), literal(to_date), DailyTask.user_id)
+                .where(carried)
+                .order_by(DailyTask.id),
+            )
+            .returning(DailyTask.user_id)
+        )
+    per_user = Counter(db.execute(statement).scalars().all())
+    _adjust_moved_stats(db, per_user, from_date, to_date, moved=mode == "move")
+
+    return sum(per_user.values())
+
+
+def carry_over_yesterday(
+    session_factory: Callable[[], Session], today: date | None = None, chunk_size: int = 500, max_chunks: int = 20
+) -> int:
+    """
+    Move every user's incomplete tasks from yesterday to today in bounded chunks.
+
+    Used by the optional nightly job. Moved tasks leave yesterday, so each chunk
+    picks the next ones without paging, and running it again the same day only
+    picks up tasks added to yesterday since.
+
+    Args:
+        session_factory: Callable returning a new database session.
+        today: Day to move tasks to; defaults to the current date.
+        chunk_size: Tasks moved per transaction.
+        max_chunks: Upper bound on transactions per call; the rest waits for the next run.
+
+    Returns:
+        int: Number of tasks moved.
+    """
+    today = today or date.today()
+    from_date, to_date = (today - timedelta(days=1)).isoformat(), today.isoformat()
+    moved = 0
+
+    for _ in range(max_chunks):
+        with session_factory() as db:
+            chunk = (
+                select(DailyTask.id).where(_carried(from_date, to_date)).order_by(DailyTask.id).limit(chunk_size)
+            ).scalar_subquery()
+            user_ids = (
+                db.execute(
+                    update(DailyTask)
+                    .where(DailyTask.id.in_(chunk))
+                    .values(created_date=to_date)
+                    .returning(DailyTask.user_id)
+                    .execution_options(synchronize_session=False)
+                )
+                .scalars()
+                .all()
+            )
+            _adjust_moved_stats(db, Counter(user_ids), from_date, to_date, moved=True)
+            db.commit()
+
+        moved += len(user_ids)
+        if len(user_ids) < chunk_size:
+            break
+
+    return moved
@@ -4,6 +4,7 @@ Configuration management for the Daily Wellness Tracker application.
 
 import json
 import os
+import tempfile
 from functools import lru_cache
 
 from dotenv import load_dotenv
@@ -11,18 +12,22 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-def get_env_str(var_name: str, description: str = "") -> str:
-    """Get a required string environment variable."""
+def get_env_str(var_name: str, description: str = "", default: str | None = None) -> str:
+    """Get a string environment variable, required unless a default is given."""
     value = os.getenv(var_name)
+    if not value and default is not None:
+        return default
     if not value:
         desc_text = f" ({description})" if description else ""
         raise ValueError(f"{var_name} environment variable is required{desc_text}")
     return value
 
 
-def get_env_int(var_name: str, description: str = "") -> int:
-    """Get a required integer environment variable."""
+def get_env_int(var_name: str, description: str = "", default: int | None = None) -> int:
+    """Get an integer environment variable, required unless a default is given."""
     value = os.getenv(var_name)
+    if not value and default is not None:
+        return default
     if not value:
         desc_text = f" ({description})" if description else ""
         raise ValueError(f"{var_name} environment variable is required{desc_text}")
@@ -33,9 +38,11 @@ def get_env_int(var_name: str, description: str = "") -> int:
         raise ValueError(f"{var_name} must be a valid integer") from err
 
 
-def get_env_bool(var_name: str, description: str = "") -> bool:
-    """Get a required boolean environment variable."""
+def get_env_bool(var_name: str, description: str = "", default: bool | None = None) -> bool:
+    """Get a boolean environment variable, required unless a default is given."""
     value = os.getenv(var_name)
+    if not value and default is not None:
+        return default
     if not value:
         desc_text = f" ({description})" if description else ""
         raise ValueError(f"{var_name} environment variable is required{desc_text}")
@@ -64,6 +71,92 @@ class Settings:
         self.default_user_id = get_env_str("DEFAULT_USER_ID", "default user identifier")
         self.gemini_api_key = get_env_str("GEMINI_API_KEY", "Google Gemini API key")
 
+        # Optional deployment settings
+        self.workers = get_env_int("WORKERS", "number of worker processes", default=1)
+        self.scheduler_lock_file = get_env_str(
+            "SCHEDULER_LOCK_FILE",
+            "lock file used to elect the background job leader",
+            default=os.path.join(tempfile.gettempdir(), "wellness-scheduler.lock"),
+        )
+
+        # Structured logging; LOG_SAMPLE_PERCENT keeps that share of high-volume events like access logs
+        self.log_level = get_env_str("LOG_LEVEL", "minimum level of application logs", default="INFO")
+        self.log_format = get_env_str("LOG_FORMAT", "json or text", default="json")
+        self.log_sample_percent = get_env_int(
+            "LOG_SAMPLE_PERCENT", "percent of requests whose access log is kept", default=100
+        )
+
+        # Opt-in request profiling: a random share of requests, or those sending X-Profile: <token>
+        self.profile_sample_percent = get_env_int("PROFILE_SAMPLE_PERCENT", "percent of requests to profile", default=0)
+        self.profile_token = get_env_str("PROFILE_TOKEN", "secret that enables profiling per request", default="")
+        self.profile_dir = get_env_str(
+            "PROFILE_DIR",
+            "directory for request profiles",
+            default=os.path.join(tempfile.gettempdir(), "wellness-profiles"),
+        )
+
+        # Span tracing of requests, SQL, Gemini calls and jobs, written as OTLP/JSON ("console", "file" or off)
+        self.trace_exporter = get_env_str("TRACE_EXPORTER", "console, file or empty to disable", default="")
+        self.trace_file = get_env_str(
+            "TRACE_FILE",
+            "file spans are appended to",
+            default=os.path.join(tempfile.gettempdir(), "wellness-traces.jsonl"),
+        )
+        self.trace_sample_percent = get_env_int("TRACE_SAMPLE_PERCENT", "percent of traces recorded", default=100)
+
+        # Longest wait for the database in readiness checks
+        self.health_db_timeout_ms = get_env_int(
+            "HEALTH_DB_TIMEOUT_MS", "database timeout for readiness checks in ms", default=1000
+        )
+
+        # Per-user limits for AI celebrations, enforced in-process
+        self.celebrate_rate_per_minute = get_env_int(
+            "CELEBRATE_RATE_PER_MINUTE", "AI celebrations allowed per user per minute", default=10
+        )
+        self.celebrate_burst = get_env_int("CELEBRATE_BURST", "AI celebrations allowed in a burst", default=5)
+
+        # Gemini endpoint, request timeout and the circuit breaker that skips Gemini while it is failing
+        self.gemini_base_url = get_env_str(
+            "GEMINI_BASE_URL", "alternative Gemini API endpoint, e.g. a local fake", default=""
+        )
+        self.gemini_timeout_ms = get_env_int("GEMINI_TIMEOUT_MS", "Gemini request timeout in ms", default=5000)
+        self.gemini_slow_call_ms = get_env_int(
+            "GEMINI_SLOW_CALL_MS", "Gemini calls slower than this count as failures", default=2000
+        )
+        self.gemini_breaker_open_seconds = get_env_int(
+            "GEMINI_BREAKER_OPEN_SECONDS", "seconds Gemini is skipped after repeated failures", default=30
+        )
+
+        # Write-behind buffering of task completion toggles (only used with a single worker)
+        self.write_behind_enabled = get_env_bool(
+            "WRITE_BEHIND_ENABLED", "buffer task completion updates in memory", default=False
+        )
+        self.write_behind_flush_ms = get_env_int(
+            "WRITE_BEHIND_FLUSH_MS", "milliseconds between write-behind flushes", default=1000
+        )
+
+        # Cache of serialized daily task lists (0 KB disables it; only used with a single worker)
+        self.daily_cache_max_kb = get_env_int("DAILY_CACHE_MAX_KB", "memory for cached daily task lists", default=8192)
+        self.daily_cache_ttl_seconds = get_env_int(
+            "DAILY_CACHE_TTL_SECONDS", "seconds a cached daily task list is served", default=300
+        )
+
+        # Archival of old tasks into the cold table (0 days disables it)
+        self.archive_after_days = get_env_int("ARCHIVE_AFTER_DAYS", "days before tasks are archived", default=0)
+        self.archive_chunk_size = get_env_int("ARCHIVE_CHUNK_SIZE", "tasks archived per transaction", default=500)
+
+        # Pruning of users without recent tasks (0 days disables it)
+        self.prune_users_after_days = get_env_int(
+            "PRUNE_USERS_AFTER_DAYS", "days without tasks before a user is deleted", default=0
+        )
+        self.prune_chunk_size = get_env_int("PRUNE_CHUNK_SIZE", "users deleted per transaction", default=100)
+        self.prune_pause_ms = get_env_int("PRUNE_PAUSE_MS", "milliseconds between pruning transactions", default=200)
+
+        # Nightly move of unfinished tasks from yesterday to today
+        self.carry_over_nightly = get_env_bool(
+            "CARRY_OVER_NIGHTLY", "move incomplete tasks to the next day", default=False
+        )
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
@@ -0,0 +1,132 @@
+"""
+In-memory cache of serialized daily task lists.
+
+`/api/daily-data` is read far more often than a day's tasks change, so the JSON of
+a day's task list is kept per (user, date) and spliced into the response as is. A hit
+skips both the task query and serialization; only the affirmation is drawn fresh.
+
+Entries are dropped by the endpoints that change a day's tasks, so they never go
+stale within the process. Writers outside it (other workers, the CLI) aren't seen,
+which is why entries also expire after a while and the cache is meant for a single
+worker. Memory is bounded by the total size of the cached payloads, evicting the
+least recently used entries first.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+
+
+class DailyDataCache:
+    """
+    Least recently used cache of serialized task lists keyed by (user_id, date).
+
+    Fills race with writes: a request that read the database before a write may store
+    its result after the write invalidated the key. Every invalidation bumps `version`,
+    and `put` drops a payload read before the current version.
+
+    Attributes:
+        max_bytes: Total payload size kept; 0 disables the cache
+        ttl: Seconds an entry is served before it is read from the database again
+        version: Number of invalidations so far
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024, ttl: float = 300):
+        """Initialize an empty cache."""
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version = 0
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], tuple[bytes, float]] = OrderedDict()
+        self._dates_by_user: dict[str, set[str]] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, user_id: str, task_date: str) -> bytes | None:
+        """The cached payload for a user's day, or None."""
+        if not self.enabled:
+            return None
+
+        key = (user_id, task_date)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[1] > self.ttl:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, user_id: str, task_date: str, payload: bytes, version: int) -> None:
+        """Store a payload read from the database while `version` was current."""
+        # A single entry may take at most a quarter of the budget
+        if not self.enabled or len(payload) > self.max_bytes // 4:
+            return
+
+        key = (user_id, task_date)
+        with self._lock:
+            if version != self.version:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (payload, time.monotonic())
+            self._dates_by_user.setdefault(user_id, set()).add(task_date)
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, user_id: str, task_dates: Iterable[str]) -> None:
+        """Drop a user's entries for the given days after their tasks changed."""
+        with self._lock:
+            self.version += 1
+            for task_date in task_dates:
+                if (user_id, task_date) in self._entries:
+                    self._remove((user_id, task_date))
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop all of a user's entries, e.g. after a change that affects many days."""
+        with self._lock:
+            self.version += 1
+            for task_date in list(self._dates_by_user.get(user_id, ())):
+                self._remove((user_id, task_date))
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after a job changed tasks of many users."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._dates_by_user.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Size and hit rate, for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        payload, _ = self._entries.pop(key)
+        self._bytes -= len(payload)
+        dates = self._dates_by_user[key[0]]
+        dates.discard(key[1])
+        if not dates:
+            del self._dates_by_user[key[0]]
@@ -7,8 +7,23 @@ along with database session management and connection setup.
 
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    DateTime,
+    Engine,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    create_engine,
+    event,
+    inspect,
+)
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from .config import get_settings
 
@@ -20,6 +35,17 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {},
 )
 
+if database_url.startswith("sqlite"):
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL and a busy timeout so several worker processes can share the database file."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -55,6 +81,7 @@ class Affirmation(Base):
         id: Primary key, auto-incrementing integer identifier
         category: Optional category for grouping affirmations (e.g., 'motivation', 'self-care')
         text: The actual affirmation text content displayed to users
+        weight: Relative chance of being picked; 0 keeps the affirmation from being shown
     """
 
     __tablename__ = "affirmations"
@@ -62,6 +89,7 @@ class Affirmation(Base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     category = Column(String, index=True)
     text = Column(Text, index=True)
+    weight = Column(Float, nullable=False, default=1.0, server_default="1.0")
 
 
 class DailyTask(Base):
@@ -80,6 +108,8 @@ class DailyTask(Base):
     """
 
     __tablename__ = "daily_tasks"
+    # Ids are never reused, so archived tasks keep unique ids after leaving this table
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     task_text = Column(Text, nullable=False)
@@ -88,6 +118,137 @@ class DailyTask(Base):
     user_id = Column(String, default="default_user", index=True)
 
 
+class ArchivedTask(Base):
+    """
+    Model for daily tasks moved out of the hot table by the archival job.
+
+    Old tasks are rarely viewed, so they live here to keep `daily_tasks` and its
+    indexes small. Rows keep the id they had in `daily_tasks`, and reads for old
+    dates consult both tables.
+
+    Attributes:
+        id: Primary key, the task's original identifier
+        task_text: The description of the task
+        completed: Boolean flag indicating if the task was completed
+        created_date: Date the task belongs to (YYYY-MM-DD format)
+        user_id: Identifier for the user who owns this task
+        archived_at: Timestamp when the task was archived
+    """
+
+    __tablename__ = "daily_tasks_archive"
+    __table_args__ = (Index("ix_daily_tasks_archive_user_date", "user_id", "created_date"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    task_text = Column(Text, nullable=False)
+    completed = Column(Boolean, default=False)
+    created_date = Column(String, nullable=False)
+    user_id = Column(String, nullable=False)
+    archived_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+
+class DailyStat(Base):
+    """
+    Model for per-user, per-day task rollups.
+
+    Maintained incrementally whenever tasks are created, toggled or deleted so
+    statistics never need to scan a user's task history.
+
+    Attributes:
+        user_id: Identifier for the user the rollup belongs to
+        date: Day of the rollup (YYYY-MM-DD format)
+        total_tasks: Number of tasks on that day
+        completed_tasks: Number of completed tasks on that day
+    """
+
+    __tablename__ = "daily_stats"
+
+    user_id = Column(String, primary_key=True)
+    date = Column(String, primary_key=True)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+
+
+class TaskTemplate(Base):
+    """
+    Model for recurring tasks that are added to matching days automatically.
+
+    Instances are created in bulk the first time a matching day is viewed, so a
+    habit costs one write batch per day instead of one request per task.
+
+    Attributes:
+        id: Primary key, auto-incrementing integer identifier
+        user_id: Identifier for the user who owns this template
+        task_text: Text of the tasks created from the template
+        recurrence: One of 'daily', 'weekdays' or 'weekly'
+        weekday: Day of the week for weekly templates (0 = Monday)
+        start_date: First day the template applies to (YYYY-MM-DD format)
+        created_at: Timestamp when the template was created
+    """
+
+    __tablename__ = "task_templates"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String, nullable=False, index=True)
+    task_text = Column(Text, nullable=False)
+    recurrence = Column(String, nullable=False)
+    weekday = Column(Integer)
+    start_date = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+
+class MaterializedDay(Base):
+    """
+    Model recording the days whose template instances have been created.
+
+    Makes materialization happen once per user and day, so deleting an instance
+    doesn't bring it back on the next view.
+
+    Attributes:
+        user_id: Identifier for the user
+        date: Day that was materialized (YYYY-MM-DD format)
+    """
+
+    __tablename__ = "materialized_days"
+
+    user_id = Column(String, primary_key=True)
+    date = Column(String, primary_key=True)
+
+
+# Full-text index over hot and archived task text. Rows are keyed by task id and kept in
+# sync by triggers; moving a task to the archive re-indexes it under the same id. The
+# owner is indexed too, so a search only visits the rows of the user it filters on.
+TASK_SEARCH_TABLE = "task_search"
+TASK_SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TASK_SEARCH_TABLE}
+        USING fts5(task_text, user_id, created_date UNINDEXED)""",
+    f"""CREATE TRIGGER IF NOT EXISTS daily_tasks_search_insert AFTER INSERT ON daily_tasks BEGIN
+        INSERT INTO {TASK_SEARCH_TABLE}(rowid, task_text, user_id, created_date)
+        VALUES (new.id, new.task_text, new.user_id, new.created_date);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS daily_tasks_search_update
+        AFTER UPDATE OF task_text, user_id, created_date ON daily_tasks BEGIN
+        UPDATE {TASK_SEARCH_TABLE} SET task_text = new.task_text, user_id = new.user_id,
+            created_date = new.created_date WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS daily_tasks_search_delete AFTER DELETE ON daily_tasks
+        WHEN NOT EXISTS (SELECT 1 FROM daily_tasks_archive WHERE id = old.id) BEGIN
+        DELETE FROM {TASK_SEARCH_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS daily_tasks_archive_search_insert AFTER INSERT ON daily_tasks_archive BEGIN
+        DELETE FROM {TASK_SEARCH_TABLE} WHERE rowid = new.id;
+        INSERT INTO {TASK_SEARCH_TABLE}(rowid, task_text, user_id, created_date)
+        VALUES (new.id, new.task_text, new.user_id, new.created_date);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS daily_tasks_archive_search_delete AFTER DELETE ON daily_tasks_archive BEGIN
+        DELETE FROM {TASK_SEARCH_TABLE} WHERE rowid = old.id;
+    END""",
+]
+
+for _statement in TASK_SEARCH_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Base.metadata, "after_drop", DDL(f"DROP TABLE IF EXISTS {TASK_SEARCH_TABLE}").execute_if(dialect="sqlite"))
+
+
 class OTP(Base):
     __tablename__ = "otps"
 
@@ -104,7 +265,87 @@ class OTP(Base):
         self.created_at = datetime.now(UTC)
 
 
-Base.metadata.create_all(bind=engine)
+def _upgrade_sqlite_schema(bind: Engine):
+    """Rebuild tables created by older versions whose definition has changed (SQLite only)."""
+    with bind.connect() as connection:
+        table_sql = connection.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'daily_tasks'"
+        ).scalar()
+        if not table_sql or "AUTOINCREMENT" in table_sql.upper():
+            return
+
+        # daily_tasks needs AUTOINCREMENT so ids of archived tasks are never handed out again.
+        # SQLite can't alter that in place: copy into a new table inside a single transaction.
+        index_names = (
+            connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'daily_tasks' AND sql IS NOT NULL"
+            )
+            .scalars()
+            .all()
+        )
+        table = DailyTask.__table__
+        columns = ", ".join(column.name for column in table.columns)
+        statements = [
+            *(f"DROP INDEX {name}" for name in index_names),
+            "ALTER TABLE daily_tasks RENAME TO daily_tasks_old",
+            str(CreateTable(table).compile(dialect=connection.dialect)).strip(),
+            f"INSERT INTO daily_tasks ({columns}) SELECT {columns} FROM daily_tasks_old",
+            "DROP TABLE daily_tasks_old",
+            *(str(CreateIndex(index).compile(dialect=connection.dialect)) for index in table.indexes),
+        ]
+        connection.connection.dbapi_connection.executescript("BEGIN;\n" + ";\n".join(statements) + ";\nCOMMIT;")
+
+
+def _upgrade_search_table(bind: Engine):
+    """Drop a search index created before the owner was indexed; init_db rebuilds it (SQLite only)."""
+    with bind.connect() as connection:
+        table_sql = connection.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (TASK_SEARCH_TABLE,)
+        ).scalar()
+        if table_sql and "user_id UNINDEXED" in table_sql:
+            connection.exec_driver_sql(f"DROP TABLE {TASK_SEARCH_TABLE}")
+            connection.commit()
+
+
+def _add_sqlite_columns(bind: Engine):
+    """Add columns introduced after a table was first created (SQLite only)."""
+    with bind.connect() as connection:
+        affirmation_columns = {row[1] for row in connection.exec_driver_sql("PRAGMA table_info(affirmations)")}
+        if affirmation_columns and "weight" not in affirmation_columns:
+            connection.exec_driver_sql("ALTER TABLE affirmations ADD COLUMN weight FLOAT NOT NULL DEFAULT 1.0")
+            connection.commit()
+
+
+def init_db(bind: Engine = engine):
+    """
+    Create any missing tables and upgrade ones created by older versions.
+
+    Called once from the application lifespan rather than at import time, so
+    importing the models (e.g. during test collection) never touches the database.
+    """
+    if bind.dialect.name == "sqlite":
+        _upgrade_sqlite_schema(bind)
+        _upgrade_search_table(bind)
+        _add_sqlite_columns(bind)
+
+    stats_missing = not inspect(bind).has_table(DailyStat.__tablename__)
+    search_missing = bind.dialect.name == "sqlite" and not inspect(bind).has_table(TASK_SEARCH_TABLE)
+
+    Base.metadata.create_all(bind=bind)
+
+    if stats_missing:
+        # First start with rollups: build them from the existing task history
+        from .stats import backfill_daily_stats
+
+        with Session(bind=bind) as db:
+            backfill_daily_stats(db)
+
+    if search_missing:
+        # First start with search: index tasks created before the triggers existed
+        from .search import rebuild_search_index
+
+        with Session(bind=bind) as db:
+            rebuild_search_index(db)
 
 
 def get_db():
@@ -0,0 +1,78 @@
+"""
+Streaming export of a user's task history.
+
+Rows are fetched from the database in fixed-size batches through a server-side
+cursor and serialized batch by batch, so memory use stays constant no matter how
+long a user's history is.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterator
+
+from sqlalchemy import Engine, select, union_all
+from sqlalchemy.orm import Session
+
+from .database import ArchivedTask, DailyTask
+from .write_behind import CompletionBuffer
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_FIELDS = ["id", "date", "description", "completed"]
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def stream_tasks(
+    bind: Engine, user_id: str, export_format: str, completion_buffer: CompletionBuffer | None = None
+) -> Iterator[str]:
+    """
+    Stream all of a user's tasks, oldest first, as NDJSON lines or CSV rows.
+
+    The generator owns its database session, because the request's session is
+    closed before a streaming response finishes.
+
+    Args:
+        bind: Engine to read from, normally the one behind the request's session.
+        user_id: Owner of the exported tasks.
+        export_format: Either "ndjson" or "csv".
+        completion_buffer: Optional write-behind buffer whose unflushed states take precedence.
+
+    Yields:
+        str: One serialized chunk per database batch.
+    """
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(EXPORT_FIELDS)
+        yield buffer.getvalue()
+
+    history = union_all(
+        *(
+            select(table.id, table.created_date, table.task_text, table.completed).where(table.user_id == user_id)
+            for table in (DailyTask, ArchivedTask)
+        )
+    ).subquery()
+
+    with Session(bind=bind) as db:
+        result = db.execute(
+            select(history)
+            .order_by(history.c.created_date, history.c.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        for rows in result.partitions():
+            buffered = completion_buffer.overlay(rows) if completion_buffer is not None else {}
+            records = [
+                (row.id, row.created_date, row.task_text, bool(buffered.get(row.id, row.completed))) for row in rows
+            ]
+
+            if export_format == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(records)
+                yield buffer.getvalue()
+            else:
+                yield "".join(json.dumps(dict(zip(EXPORT_FIELDS, record, strict=True))) + "\n" for record in records)
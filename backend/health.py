@@ -0,0 +1,103 @@
+"""
+Liveness and readiness checks.
+
+Readiness answers "should the load balancer send this worker traffic?". A worker is
+not ready when the database doesn't answer within a bounded time, when its
+connection pool or request threadpool is exhausted (new requests would queue until
+they time out), or when its event loop is so stalled that scheduled jobs run far
+behind. Gemini's circuit breaker is reported but never fails readiness, since
+celebrations fall back to canned messages while it is open.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+import anyio.to_thread
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+# Scheduled jobs this far past their deadline, while not running, mean a stalled event loop
+MAX_JOB_LAG_SECONDS = 60
+
+
+class DatabaseProbe:
+    """
+    Pings the database with a bounded wait.
+
+    A ping that outlives the timeout keeps running in its thread; later checks wait on
+    it instead of starting another, so a hung database can't pile up probe threads.
+
+    Attributes:
+        session_factory: Creates the sessions used to ping the database
+        timeout: Seconds to wait for the ping before reporting a timeout
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], timeout: float = 1.0):
+        """Initialize the probe without touching the database."""
+        self.session_factory = session_factory
+        self.timeout = timeout
+        self._pending: asyncio.Future | None = None
+
+    async def check(self) -> dict:
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.ensure_future(asyncio.to_thread(self._ping))
+
+        try:
+            latency = await asyncio.wait_for(asyncio.shield(self._pending), self.timeout)
+        except TimeoutError:
+            return {"status": "timeout", "timeout_ms": round(self.timeout * 1000)}
+        except Exception as e:
+            return {"status": "error", "error": type(e).__name__}
+        return {"status": "ok", "latency_ms": round(latency * 1000, 2)}
+
+    def _ping(self) -> float:
+        started = time.perf_counter()
+        with self.session_factory() as db:
+            db.execute(text("SELECT 1"))
+        return time.perf_counter() - started
+
+
+def pool_status(engine: Engine) -> dict:
+    """Connection pool usage; saturated once every connection the pool may open is checked out."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"status": "ok", "pool": type(pool).__name__}
+
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    return {
+        "status": "saturated" if capacity and checked_out >= capacity else "ok",
+        "pool": type(pool).__name__,
+        "checked_out": checked_out,
+        "idle": pool.checkedin(),
+        "capacity": capacity,
+    }
+
+
+def threadpool_status() -> dict:
+    """Usage of the threadpool sync endpoints run in; must be called from the event loop."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    busy, limit = limiter.borrowed_tokens, limiter.total_tokens
+    return {
+        "status": "saturated" if busy >= limit else "ok",
+        "busy": busy,
+        "limit": limit,
+        "waiting": limiter.statistics().tasks_waiting,
+    }
+
+
+def job_status(stats: dict | None, max_lag: float = MAX_JOB_LAG_SECONDS) -> dict:
+    """Last run and lag of a scheduled job, lagging once it is overdue without running."""
+    if stats is None:
+        return {"status": "not_scheduled"}
+
+    lagging = not stats["running"] and stats["lag_s"] > max_lag
+    return {
+        "status": "lagging" if lagging else "ok",
+        "last_run_at": stats["last_run_at"],
+        "lag_s": stats["lag_s"],
+        "next_run_in_s": stats["next_run_in_s"],
+        "runs": stats["runs"],
+        "failures": stats["failures"],
+    }
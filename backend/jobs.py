@@ -0,0 +1,215 @@
+"""
+Lightweight asyncio job runner for periodic background work.
+
+Jobs are scheduled on the application's event loop instead of a dedicated scheduler
+thread. Each run executes the (synchronous) job function in the default executor and
+records how long it took. Job functions return how much work they found; after an
+idle run the job backs off exponentially so quiet periods don't keep scanning the
+database, and the interval snaps back as soon as work shows up again.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from .leader import LeaderLock
+from .tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """
+    A periodic job with jitter, adaptive backoff and run-duration metrics.
+
+    Attributes:
+        name: Unique job identifier
+        func: Synchronous callable returning the amount of work done (0 when idle)
+        interval: Base interval between runs in seconds
+        max_interval: Upper bound for the backed-off interval in seconds
+        backoff: Factor applied to the interval after each idle run
+        jitter: Fraction of the interval randomly added or removed on each run
+        leader_only: Whether only the elected leader process runs this job
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], int | None],
+        interval: float,
+        max_interval: float | None = None,
+        backoff: float = 2.0,
+        jitter: float = 0.1,
+        leader_only: bool = True,
+    ):
+        """Initialize the job; the first run is due one interval from now."""
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.max_interval = max_interval if max_interval is not None else interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.leader_only = leader_only
+
+        self.current_interval = interval
+        self.next_run_at = 0.0
+        self.runs = 0
+        self.idle_runs = 0
+        self.failures = 0
+        self.last_run_at: datetime | None = None
+        self.last_duration = 0.0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+
+        self._wake = asyncio.Event()
+        self._in_flight: asyncio.Future | None = None
+        self.schedule_next()
+
+    def schedule_next(self) -> None:
+        """Set the next deadline from the current interval, with jitter applied."""
+        spread = self.current_interval * self.jitter
+        self.next_run_at = time.monotonic() + max(0.0, self.current_interval + random.uniform(-spread, spread))
+
+    def record_run(self, duration: float, work_done: int | None) -> None:
+        """Update metrics after a run and adapt the interval to the amount of work found."""
+        self.runs += 1
+        self.last_run_at = datetime.now(UTC)
+        self.last_duration = duration
+        self.total_duration += duration
+        self.max_duration = max(self.max_duration, duration)
+
+        if work_done == 0:
+            self.idle_runs += 1
+            self.current_interval = min(self.current_interval * self.backoff, self.max_interval)
+        else:
+            self.current_interval = self.interval
+
+    def reset_backoff(self) -> None:
+        """Return to the base interval without postponing an already closer deadline."""
+        self.current_interval = self.interval
+        self.next_run_at = min(self.next_run_at, time.monotonic() + self.interval)
+        self._wake.set()
+
+    def stats(self) -> dict:
+        """Snapshot of the job's scheduling state and run metrics."""
+        now = time.monotonic()
+        return {
+            "runs": self.runs,
+            "idle_runs": self.idle_runs,
+            "failures": self.failures,
+            "running": self._in_flight is not None,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_duration_ms": round(self.last_duration * 1000, 3),
+            "avg_duration_ms": round(self.total_duration / self.runs * 1000, 3) if self.runs else 0.0,
+            "max_duration_ms": round(self.max_duration * 1000, 3),
+            "current_interval_s": self.current_interval,
+            "next_run_in_s": round(max(0.0, self.next_run_at - now), 3),
+            "lag_s": round(max(0.0, now - self.next_run_at), 3),
+        }
+
+
+class JobRunner:
+    """
+    Runs periodic jobs as asyncio tasks on the application event loop.
+
+    When a leader lock is given, leader-only jobs execute only in the process holding
+    it, so several worker processes never duplicate shared background work. Jobs
+    that handle per-process state (such as in-memory buffers) run everywhere.
+
+    Attributes:
+        jobs: Registered jobs keyed by name
+        leader: Optional lock deciding which worker process runs the jobs
+    """
+
+    def __init__(self, leader: LeaderLock | None = None):
+        """Initialize an empty runner."""
+        self.jobs: dict[str, Job] = {}
+        self.leader = leader
+
+        self._tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopping = False
+
+    def add_job(self, name: str, func: Callable[[], int | None], interval: float, **options) -> Job:
+        """Register a job, replacing any existing job with the same name."""
+        job = Job(name, func, interval, **options)
+        self.jobs[name] = job
+        return job
+
+    def start(self) -> None:
+        """Start one task per registered job on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = False
+
+        for job in self.jobs.values():
+            job._wake = asyncio.Event()  # Bind to the loop we are starting on
+        self._tasks = [asyncio.create_task(self._run_job(job), name=f"job:{job.name}") for job in self.jobs.values()]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Let in-flight runs finish (up to `timeout` seconds), then cancel all job tasks."""
+        self._stopping = True
+
+        in_flight = [job._in_flight for job in self.jobs.values() if job._in_flight is not None]
+        if in_flight:
+            await asyncio.wait(in_flight, timeout=timeout)
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def reset_backoff(self, name: str) -> None:
+        """
+        Tell a job that new work may exist. Safe to call from any thread.
+
+        Request handlers call this after creating work for a job that may have
+        backed off, so it runs again within its base interval. Only this process's
+        copy of the job is reset: with several workers, a leader-only job that backs
+        off won't hear about work created on the other workers.
+        """
+        job = self.jobs.get(name)
+        if job is None or self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(job.reset_backoff)
+
+    def stats(self) -> dict:
+        """Metrics for every registered job, keyed by job name."""
+        return {name: job.stats() for name, job in self.jobs.items()}
+
+    async def _run_job(self, job: Job) -> None:
+        while not self._stopping:
+            delay = job.next_run_at - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(job._wake.wait(), timeout=delay)
+                    job._wake.clear()
+                    continue  # Deadline may have moved, recompute it
+                except TimeoutError:
+                    pass
+
+            if job.leader_only and self.leader is not None and not self.leader.try_acquire():
+                job.schedule_next()
+                continue
+
+            started = time.perf_counter()
+            work_done = None
+            # Each run is its own trace; the worker thread inherits the span, so its SQL is traced under it
+            with tracer.span(f"job {job.name}", attributes={"job.name": job.name}) as span:
+                job._in_flight = asyncio.ensure_future(asyncio.to_thread(job.func))
+                try:
+                    work_done = await asyncio.shield(job._in_flight)
+                except Exception as e:
+                    job.failures += 1
+                    logger.exception("Job failed", extra={"job": job.name, "error": type(e).__name__})
+                    if span is not None:
+                        span.record_exception(e)
+                finally:
+                    job._in_flight = None
+                if span is not None and work_done is not None:
+                    span.set_attribute("job.work_done", work_done)
+
+            job.record_run(time.perf_counter() - started, work_done)
+            job.schedule_next()
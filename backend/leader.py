@@ -0,0 +1,83 @@
+"""
+Leader election for background jobs when the API runs as several worker processes.
+
+Every worker runs the same scheduler, but scheduled jobs only execute in the worker
+that holds an exclusive lock on a shared lock file. The operating system releases the
+lock when its holder exits, so another worker takes over on its next scheduled run.
+"""
+
+import os
+from typing import IO
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(handle: IO[str]) -> None:
+        msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock_file(handle: IO[str]) -> None:
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(handle: IO[str]) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock_file(handle: IO[str]) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class LeaderLock:
+    """
+    Non-blocking, process-wide file lock identifying the background job leader.
+
+    Attributes:
+        path: Location of the lock file shared by all workers
+    """
+
+    def __init__(self, path: str):
+        """Initialize the lock without acquiring it."""
+        self.path = path
+        self._handle: IO[str] | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process currently holds the lock."""
+        return self._handle is not None
+
+    def try_acquire(self) -> bool:
+        """
+        Try to become the leader without blocking.
+
+        Returns:
+            bool: True if this process holds the lock (already or newly), False otherwise.
+        """
+        if self._handle is not None:
+            return True
+
+        handle = open(self.path, "a+")
+        handle.seek(0)
+        try:
+            _lock_file(handle)
+        except OSError:
+            handle.close()
+            return False
+
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+
+        self._handle = handle
+        return True
+
+    def release(self) -> None:
+        """Give up leadership so another worker can take over."""
+        if self._handle is None:
+            return
+
+        try:
+            _unlock_file(self._handle)
+        finally:
+            self._handle.close()
+            self._handle = None
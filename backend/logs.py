@@ -0,0 +1,154 @@
+"""
+Structured logging that stays off the request path.
+
+Application loggers (everything under `backend`) hand their records to a
+`QueueHandler`; a `QueueListener` thread formats them as JSON lines and writes them
+to stderr. Request handlers, scheduler threads and Gemini calls therefore only pay
+for putting a record on an in-memory queue, never for a blocking write.
+
+Each request gets a correlation id, taken from a well-formed `X-Request-ID` header or
+generated, that is stamped on every record logged while handling it. High-volume
+events such as the per-request access log are logged with `extra={"sample": True}`
+and kept for only a share of requests, chosen per request id so that a request is
+either logged completely or not at all.
+"""
+
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import uuid
+import zlib
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+
+# Correlation id of the request being handled, None outside requests
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Incoming request ids are echoed into logs, so only accept short, plain tokens
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+LOG_FORMATS = ("json", "text")
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "sample"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects, including their `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps `percent` percent of the records marked with `sample`.
+
+    Warnings and errors are always kept. Records logged during a request are sampled by
+    their request id, so every sampled event of one request is kept or dropped together.
+    """
+
+    def __init__(self, percent: int = 100):
+        super().__init__()
+        self.percent = percent
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sample", False) or record.levelno >= logging.WARNING or self.percent >= 100:
+            return True
+
+        request_id = request_id_var.get()
+        bucket = zlib.crc32(request_id.encode()) % 100 if request_id else random.randrange(100)
+        if bucket < self.percent:
+            return True
+
+        self.dropped += 1
+        return False
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Queue handler that stamps the request id and defers formatting to the listener.
+
+    The standard `QueueHandler.prepare` formats the record in the logging thread;
+    this one only captures the request context, which has to be read before the
+    record leaves the thread that logged it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = request_id_var.get()
+        return record
+
+
+def get_request_id(header: str | None) -> str:
+    """The caller's request id when it is well formed, otherwise a new one."""
+    if header and REQUEST_ID_PATTERN.match(header):
+        return header
+    return uuid.uuid4().hex
+
+
+_listener: QueueListener | None = None
+
+
+def setup_logging(level: str = "INFO", log_format: str = "json", sample_percent: int = 100) -> None:
+    """
+    Route the `backend` loggers through a queue to a background writer thread.
+
+    Safe to call again, e.g. from each worker's lifespan; the previous listener is
+    stopped first so its queued records are written.
+    """
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unsupported log format: {log_format}")
+
+    stop_logging()
+
+    output = logging.StreamHandler(sys.stderr)
+    if log_format == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = ContextQueueHandler(records)
+    handler.addFilter(SamplingFilter(sample_percent))
+
+    logger = logging.getLogger("backend")
+    logger.addHandler(handler)
+    logger.setLevel(level.upper())
+    logger.propagate = False
+
+    global _listener
+    _listener = QueueListener(records, output)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Write any queued records, stop the writer thread and detach the queue handler."""
+    global _listener
+    if _listener is None:
+        return
+
+    logger = logging.getLogger("backend")
+    for handler in [h for h in logger.handlers if isinstance(h, ContextQueueHandler)]:
+        logger.removeHandler(handler)
+    logger.propagate = True
+
+    _listener.stop()
+    _listener = None
@@ -1,27 +1,70 @@
+import asyncio
+import json
+import logging
+import time
 import uuid
 from contextlib import asynccontextmanager
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from html import escape
-from typing import cast
+from typing import Literal, cast
 
 import uvicorn
-from apscheduler.schedulers.background import BackgroundScheduler
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, field_validator
-from sqlalchemy import func
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, field_validator, model_validator
+from sqlalchemy import delete, update
 from sqlalchemy.orm import Session
 
+from backend import IMPORT_STARTED_AT
+from backend.affirmations import AffirmationSampler, affirmations_version, load_affirmations
+from backend.archive import archive_old_tasks, find_task, get_tasks_for_date, may_be_archived
+from backend.autocomplete import PrefixIndex, load_task_history
+from backend.carry_over import carry_over_tasks, carry_over_yesterday
 from backend.config import get_settings
-from backend.database import OTP, Affirmation, DailyTask, SessionLocal, User, get_db
+from backend.daily_cache import DailyDataCache
+from backend.database import (
+    OTP,
+    Affirmation,
+    ArchivedTask,
+    DailyTask,
+    SessionLocal,
+    TaskTemplate,
+    User,
+    engine,
+    get_db,
+    init_db,
+)
+from backend.export import EXPORT_MEDIA_TYPES, stream_tasks
+from backend.health import DatabaseProbe, job_status, pool_status, threadpool_status
+from backend.jobs import JobRunner
+from backend.leader import LeaderLock
+from backend.logs import get_request_id, request_id_var, setup_logging, stop_logging
+from backend.merge import merge_user_tasks
 from backend.otp_handler import generate_and_store_otp, validate_otp
-from backend.task_ai import TaskAI
+from backend.profiling import RequestProfiler
+from backend.prune import prune_inactive_users
+from backend.rate_limit import TokenBucketLimiter
+from backend.recurring import add_template_to_materialized_days, materialize_day
+from backend.search import search_tasks
+from backend.stats import adjust_daily_stats, get_user_stats
+from backend.task_ai import CircuitBreaker, TaskAI
+from backend.tracing import SERVER, TracedRoute, create_exporter, instrument_engine, tracer
+from backend.write_behind import CompletionBuffer
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
 
+def cleanup_expired_otps() -> int | None:
+    """
+    Clean up expired OTPs and ensure users only have one active sync code.
 
-def cleanup_expired_otps():
-    """Clean up expired OTPs and ensure users only have one active sync code."""
+    Returns:
+        int | None: Number of OTPs found, so the job runner can back off while there
+        are none, or None if the cleanup failed.
+    """
     try:
         with SessionLocal() as db:
             current_time = datetime.now(UTC)
@@ -34,8 +77,6 @@ def cleanup_expired_otps():
             duplicate_count = 0
             active_users = 0
 
-            print(f"[{current_time.strftime('%H:%M:%S')}] OTP Cleanup: Found {total_otps} total OTPs in database")
-
             # Group OTPs by UUID to handle duplicates
             uuid_otps = {}
             for otp_entry in all_otps:
@@ -45,7 +86,6 @@ def cleanup_expired_otps():
                 uuid_otps[uuid].append(otp_entry)
 
             active_users = len(uuid_otps)
-            print(f"[{current_time.strftime('%H:%M:%S')}] OTP Cleanup: {active_users} users with sync codes")
 
             # Process each user's OTPs
             for _uuid, otps in uuid_otps.items():
@@ -81,36 +121,129 @@ def cleanup_expired_otps():
 
             db.commit()
 
-            remaining_otps = total_otps - expired_count - duplicate_count
-            print(f"[{current_time.strftime('%H:%M:%S')}] OTP Cleanup Complete:")
-            print(f"  - Removed {expired_count} expired OTPs")
-            print(f"  - Removed {duplicate_count} duplicate OTPs")
-            print(f"  - {remaining_otps} active OTPs remaining")
+            logger.log(
+                logging.INFO if expired_count or duplicate_count else logging.DEBUG,
+                "OTP cleanup complete",
+                extra={
+                    "otps": total_otps,
+                    "users": active_users,
+                    "expired_removed": expired_count,
+                    "duplicates_removed": duplicate_count,
+                    "remaining": total_otps - expired_count - duplicate_count,
+                },
+            )
 
-            if expired_count == 0 and duplicate_count == 0:
-                print("  - No cleanup needed - all OTPs are valid and unique")
+            return total_otps
 
-    except Exception as e:
-        print(f"[{datetime.now(UTC).strftime('%H:%M:%S')}] Error during OTP cleanup: {e}")
+    except Exception:
+        logger.exception("OTP cleanup failed")
+        return None
+
+
+# Background jobs run on the event loop; with several workers only the leader runs them
+leader_lock = LeaderLock(settings.scheduler_lock_file)
+job_runner = JobRunner(leader=leader_lock)
+
+# Optional write-behind buffer for completion toggles; None writes every toggle through.
+# Other workers can't see a worker's buffered toggles and would serve stale task states,
+# so buffering is only used with a single worker
+completion_buffer = CompletionBuffer() if settings.write_behind_enabled and settings.workers == 1 else None
+
+
+def flush_completion_buffer() -> int:
+    """Write buffered completion toggles to the database."""
+    return completion_buffer.flush(SessionLocal) if completion_buffer is not None else 0
+
+
+def archive_tasks() -> int:
+    """Move tasks past the archive horizon out of the hot table."""
+    return archive_old_tasks(SessionLocal, settings.archive_after_days, chunk_size=settings.archive_chunk_size)
+
+
+def prune_users() -> int:
+    """Delete users without recent tasks, along with their history."""
+    return prune_inactive_users(
+        SessionLocal,
+        settings.prune_users_after_days,
+        chunk_size=settings.prune_chunk_size,
+        pause=settings.prune_pause_ms / 1000,
+        protected_user_ids=[settings.default_user_id],
+    )
 
 
-# Initialize background scheduler
-scheduler = BackgroundScheduler()
+def carry_over_unfinished_tasks() -> int:
+    """Move yesterday's incomplete tasks to today for every user."""
+    flush_completion_buffer()
+    moved = carry_over_yesterday(SessionLocal)
+    if moved:
+        daily_data_cache.clear()
+    return moved
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    scheduler.add_job(
-        func=cleanup_expired_otps, trigger="interval", minutes=1, id="cleanup_expired_otps", replace_existing=True
+    startup_started = time.perf_counter()
+    setup_logging(settings.log_level, settings.log_format, settings.log_sample_percent)
+    if settings.trace_exporter:
+        tracer.configure(
+            create_exporter(settings.trace_exporter, settings.trace_file), sample_percent=settings.trace_sample_percent
+        )
+
+    init_db()
+    add_sample_affirmations()
+
+    # Check every minute while sync codes exist, backing off up to their 15 minute lifetime otherwise.
+    # A new code resets the backoff only in the worker that created it, which may not be the leader,
+    # so with several workers the job keeps checking every minute
+    job_runner.add_job(
+        "cleanup_expired_otps",
+        cleanup_expired_otps,
+        interval=60,
+        max_interval=15 * 60 if settings.workers == 1 else 60,
     )
 
-    scheduler.start()
-    print("Background OTP cleanup scheduler started")
+    if settings.archive_after_days > 0:
+        # Hourly while there is a backlog, daily once the hot table is caught up
+        job_runner.add_job("archive_tasks", archive_tasks, interval=60 * 60, max_interval=24 * 60 * 60)
+
+    if settings.prune_users_after_days > 0:
+        # Hourly while inactive users pile up, daily once they are gone
+        job_runner.add_job("prune_users", prune_users, interval=60 * 60, max_interval=24 * 60 * 60)
+
+    if settings.carry_over_nightly:
+        # Hourly, so the move happens within an hour of midnight; later runs find nothing to move
+        job_runner.add_job("carry_over_unfinished_tasks", carry_over_unfinished_tasks, interval=60 * 60)
+
+    if completion_buffer is not None:
+        # Each worker flushes its own buffer, so this job is not leader-only
+        job_runner.add_job(
+            "flush_completion_buffer",
+            flush_completion_buffer,
+            interval=settings.write_behind_flush_ms / 1000,
+            jitter=0,
+            leader_only=False,
+        )
+
+    job_runner.start()
+
+    startup_ms = (time.perf_counter() - startup_started) * 1000
+    logger.info(
+        "Startup complete",
+        extra={
+            "import_ms": round(IMPORT_DURATION_MS, 1),
+            "init_ms": round(startup_ms, 1),
+            "jobs": list(job_runner.jobs),
+        },
+    )
 
     yield
 
-    scheduler.shutdown()
-    print("Background OTP cleanup scheduler stopped")
+    await job_runner.stop()
+    flush_completion_buffer()
+    leader_lock.release()
+    logger.info("Shutdown complete")
+    tracer.shutdown()
+    stop_logging()
 
 
 app = FastAPI(
@@ -121,16 +254,149 @@ app = FastAPI(
     debug=settings.debug,
 )
 
+# With TRACE_EXPORTER unset, neither routes nor SQL statements are instrumented
+if settings.trace_exporter:
+    app.router.route_class = TracedRoute
+    instrument_engine(engine)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["Content-Type", "Authorization"],
+    allow_headers=["Content-Type", "Authorization", "X-Request-ID"],
+    expose_headers=["X-Request-ID"],
 )
 
+
+# Samples stacks while chosen requests run; see backend/profiling.py
+request_profiler = RequestProfiler(
+    settings.profile_dir, sample_percent=settings.profile_sample_percent, token=settings.profile_token
+)
+
+
+async def profile_request(request: Request, call_next):
+    """Profile the request if it was sampled or carries the profiling token."""
+    sampler = request_profiler.start() if request_profiler.should_profile(request.headers.get("x-profile")) else None
+    if sampler is None:
+        return await call_next(request)
+
+    try:
+        response = await call_next(request)
+    finally:
+        name = f"{request.method}-{request.url.path}-{request_id_var.get()}"
+        # A profile that can't be written must not fail the request or hide its own error
+        try:
+            path = await asyncio.to_thread(request_profiler.finish, sampler, name)
+            logger.info("Request profiled", extra={"profile": str(path), "samples": sampler.samples})
+        except Exception:
+            logger.exception("Request profile could not be written")
+    return response
+
+
+# Only installed when enabled, so requests pay nothing for profiling otherwise. Registered
+# before the correlation middleware so it runs inside it and sees the request id.
+if request_profiler.enabled:
+    app.middleware("http")(profile_request)
+
+
+async def trace_request(request: Request, call_next):
+    """Record a server span for the request, continuing the caller's trace if it sent one."""
+    with tracer.span(
+        request.method,
+        kind=SERVER,
+        attributes={"http.request.method": request.method, "url.path": request.url.path},
+        traceparent=request.headers.get("traceparent"),
+    ) as span:
+        response = await call_next(request)
+
+        # No span while the tracer is shut down, and unsampled spans are never exported
+        if span is None or not span.sampled:
+            return response
+
+        route = request.scope.get("route")
+        if route is not None:
+            span.name = f"{request.method} {route.path}"
+            span.set_attribute("http.route", route.path)
+        span.set_attribute("http.response.status_code", response.status_code)
+        span.set_attribute("request.id", request_id_var.get())
+        if response.status_code >= 500:
+            span.error = f"HTTP {response.status_code}"
+    return response
+
+
+# Registered, like profiling, inside the correlation middleware
+if settings.trace_exporter:
+    app.middleware("http")(trace_request)
+
+
+@app.middleware("http")
+async def correlate_request(request: Request, call_next):
+    """Tag the request's logs with a correlation id, return it to the caller and log the request."""
+    request_id = get_request_id(request.headers.get("x-request-id"))
+    token = request_id_var.set(request_id)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        logger.log(
+            logging.WARNING if response.status_code >= 500 else logging.INFO,
+            "Request handled",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status": response.status_code,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "sample": True,
+            },
+        )
+        return response
+    finally:
+        request_id_var.reset(token)
+
+
 DB_DEPENDENCY = Depends(get_db)
-task_ai = TaskAI(settings.gemini_api_key)
+
+# Longest date range a single stats request may cover
+MAX_STATS_DAYS = 366
+
+# Largest page of search results a client may request
+MAX_SEARCH_PAGE_SIZE = 50
+
+# Most suggestions returned per autocomplete request
+MAX_SUGGESTIONS = 10
+
+# Weighted affirmation tables, rebuilt within seconds of rows being added or removed elsewhere
+# (other workers, the import command) and every few minutes to pick up other edits
+affirmation_sampler = AffirmationSampler(ttl=300)
+
+# Earlier task texts per user, loaded on a user's first autocomplete request
+task_suggestions = PrefixIndex(max_users=1000, max_entries_per_user=500)
+
+# Serialized task lists per user and day; workers can't see each other's writes, so only one worker caches
+daily_data_cache = DailyDataCache(
+    max_bytes=settings.daily_cache_max_kb * 1024 if settings.workers == 1 else 0,
+    ttl=settings.daily_cache_ttl_seconds,
+)
+
+
+celebrate_limiter = TokenBucketLimiter(
+    rate=settings.celebrate_rate_per_minute / 60, capacity=settings.celebrate_burst, max_keys_per_shard=4096
+)
+
+
+@lru_cache(maxsize=1)
+def get_task_ai() -> TaskAI:
+    """Get the shared TaskAI instance, created on the first celebration request."""
+    breaker = CircuitBreaker(
+        slow_call_seconds=settings.gemini_slow_call_ms / 1000, open_seconds=settings.gemini_breaker_open_seconds
+    )
+    return TaskAI(
+        settings.gemini_api_key,
+        breaker=breaker,
+        timeout_seconds=settings.gemini_timeout_ms / 1000,
+        base_url=settings.gemini_base_url or None,
+    )
 
 
 class TaskCreate(BaseModel):
@@ -155,11 +421,32 @@ class TaskCreate(BaseModel):
         return v
 
 
+class TemplateCreate(TaskCreate):
+    recurrence: Literal["daily", "weekdays", "weekly"]
+    weekday: int | None = None
+
+    @model_validator(mode="after")
+    def validate_weekday(self):
+        """Weekly templates need a weekday (0 = Monday ... 6 = Sunday); others ignore it."""
+        if self.recurrence != "weekly":
+            self.weekday = None
+        elif self.weekday is None or not 0 <= self.weekday <= 6:
+            raise ValueError("weekday must be between 0 (Monday) and 6 (Sunday) for weekly templates")
+        return self
+
+
 class TaskUpdate(BaseModel):
     completed: bool
     user_id: str
 
 
+class CarryOverRequest(BaseModel):
+    user_id: str
+    from_date: str
+    to_date: str = ""
+    mode: Literal["move", "copy"] = "move"
+
+
 class SyncCodeGenerate(BaseModel):
     uuid: str
 
@@ -169,6 +456,11 @@ class SyncCodeValidate(BaseModel):
     current_uuid: str
 
 
+class SyncMergeRequest(BaseModel):
+    sync_code: str
+    current_uuid: str
+
+
 def add_sample_affirmations():
     """Populates the database with sample affirmations if none exist."""
     with SessionLocal() as db:
@@ -192,9 +484,6 @@ def add_sample_affirmations():
             db.commit()
 
 
-add_sample_affirmations()
-
-
 def validate_user_id(user_id: str, db: Session) -> bool:
     """Validate that a user_id exists in the database."""
     user = db.query(User).filter(User.user_id == user_id).first()
@@ -219,18 +508,72 @@ def read_root():
     return {"message": "Daily Wellness Tracker API"}
 
 
+# Database ping for readiness checks, bounded so a hung database fails the check quickly
+database_probe = DatabaseProbe(SessionLocal, timeout=settings.health_db_timeout_ms / 1000)
+
+
+@app.get("/health/live")
+async def health_live():
+    """Liveness check: the process is up and its event loop answers."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """
+    Readiness check for load balancers.
+
+    Responds 503 while the database is unreachable, the connection pool or request
+    threadpool is exhausted, or the OTP cleanup job runs far behind schedule. Async
+    so it is answered even when every threadpool worker is busy.
+    """
+    checks = {
+        "database": await database_probe.check(),
+        "db_pool": pool_status(engine),
+        "threadpool": threadpool_status(),
+        "scheduler": job_status(job_runner.stats().get("cleanup_expired_otps")),
+    }
+    ready = all(check["status"] in ("ok", "not_scheduled") for check in checks.values())
+    checks["gemini"] = get_task_ai().breaker.snapshot()
+    checks["daily_data_cache"] = daily_data_cache.stats()
+
+    body = {"status": "ready" if ready else "not_ready", "checks": checks}
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
+FALLBACK_AFFIRMATION = "You are amazing just as you are."
+
+
+def pick_affirmation(db: Session, category: str = "") -> tuple[int, str] | None:
+    """Draw a weighted random affirmation, optionally from one category."""
+    return affirmation_sampler.sample(
+        lambda: load_affirmations(db), category or None, version=lambda: affirmations_version(db)
+    )
+
+
 @app.get("/api/affirmations")
-def get_random_affirmation(db: Session = DB_DEPENDENCY):
-    """Retrieves a random affirmation from the database."""
-    affirmation = db.query(Affirmation).order_by(func.random()).first()
+def get_random_affirmation(category: str = "", db: Session = DB_DEPENDENCY):
+    """Retrieves a random affirmation, weighted and optionally limited to a category."""
+    affirmation = pick_affirmation(db, category)
     if affirmation:
-        return {"id": affirmation.id, "text": affirmation.text}
+        affirmation_id, text = affirmation
+        return {"id": affirmation_id, "text": text}
     else:
-        return {"id": 0, "text": "You are amazing just as you are."}
+        return {"id": 0, "text": FALLBACK_AFFIRMATION}
+
+
+@app.get("/api/affirmations/categories")
+def get_affirmation_categories(db: Session = DB_DEPENDENCY):
+    """Lists the affirmation categories that can be passed as `category`."""
+    return {
+        "categories": affirmation_sampler.categories(
+            lambda: load_affirmations(db), version=lambda: affirmations_version(db)
+        )
+    }
 
 
 @app.get("/api/daily-data")
-def get_daily_data(date: str = "", user_id: str = "", db: Session = DB_DEPENDENCY):
+def get_daily_data(date: str = "", user_id: str = "", category: str = "", db: Session = DB_DEPENDENCY):
     """Fetches daily data including an affirmation and tasks for a specific date and user."""
     if not user_id:
         raise HTTPException(status_code=400, detail="user_id is required")
@@ -241,14 +584,40 @@ def get_daily_data(date: str = "", user_id: str = "", db: Session = DB_DEPENDENC
     if not date:
         date = datetime.now().strftime("%Y-%m-%d")
 
-    affirmation = db.query(Affirmation).order_by(func.random()).first()
-    tasks = db.query(DailyTask).filter(DailyTask.created_date == date, DailyTask.user_id == user_id).all()
+    # A cached day was already materialized, and writes to it drop the entry
+    tasks_json = daily_data_cache.get(user_id, date)
+    if tasks_json is None:
+        version = daily_data_cache.version
 
-    return {
-        "date": date,
-        "affirmation": affirmation.text if affirmation else "You are amazing just as you are.",
-        "tasks": [{"id": task.id, "description": task.task_text, "completed": task.completed} for task in tasks],
-    }
+        # The first view of a day creates its recurring tasks in one batch
+        materialized = materialize_day(db, user_id, date)
+        if materialized:
+            db.commit()
+            for template in materialized:
+                task_suggestions.record(user_id, str(template.task_text), date)
+
+        tasks = get_tasks_for_date(db, user_id, date)
+
+        # Read through the write-behind buffer so unflushed toggles are visible
+        buffered = completion_buffer.overlay(tasks) if completion_buffer is not None else {}
+
+        tasks_json = json.dumps(
+            [
+                {"id": task.id, "description": task.task_text, "completed": buffered.get(task.id, task.completed)}
+                for task in tasks
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+        daily_data_cache.put(user_id, date, tasks_json, version)
+
+    affirmation = pick_affirmation(db, category)
+    head = json.dumps(
+        {"date": date, "affirmation": affirmation[1] if affirmation else FALLBACK_AFFIRMATION},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return Response(head[:-1].encode() + b',"tasks":' + tasks_json + b"}", media_type="application/json")
 
 
 @app.post("/api/tasks")
@@ -263,8 +632,12 @@ def create_task(task_data: TaskCreate, date: str = "", db: Session = DB_DEPENDEN
     new_task = DailyTask(task_text=task_data.task_text, created_date=date, user_id=task_data.user_id, completed=False)
 
     db.add(new_task)
+    adjust_daily_stats(db, task_data.user_id, date, total_delta=1)
     db.commit()
     db.refresh(new_task)
+    daily_data_cache.invalidate(task_data.user_id, [date])
+
+    task_suggestions.record(task_data.user_id, task_data.task_text, date)
 
     return {"id": new_task.id, "description": new_task.task_text, "completed": new_task.completed}
 
@@ -275,16 +648,38 @@ def update_task(task_id: int, task_update: TaskUpdate, db: Session = DB_DEPENDEN
     if not validate_user_id(task_update.user_id, db):
         raise HTTPException(status_code=401, detail="Invalid user_id")
 
-    task = db.query(DailyTask).filter(DailyTask.id == task_id, DailyTask.user_id == task_update.user_id).first()
+    task = find_task(db, task_id, task_update.user_id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found or access denied")
 
-    # Maintain consistency with dynamic attribute updates
-    setattr(task, "completed", task_update.completed)
+    if completion_buffer is not None:
+        # Acknowledge now; the write is coalesced with other toggles and flushed shortly
+        completion_buffer.record(task_id, task_update.completed)
+        daily_data_cache.invalidate(task_update.user_id, [str(task.created_date)])
+        return {"id": task.id, "description": task.task_text, "completed": task_update.completed}
+
+    # Only the write that actually flips the stored state moves the rollup, so concurrent toggles can't double count
+    task_date = str(task.created_date)
+    changed = 0
+    for table in (DailyTask, ArchivedTask):
+        changed += db.execute(
+            update(table)
+            .where(
+                table.id == task_id,
+                table.user_id == task_update.user_id,
+                table.completed.is_distinct_from(task_update.completed),
+            )
+            .values(completed=task_update.completed)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    if changed == 1:
+        completed_delta = 1 if task_update.completed else -1
+        adjust_daily_stats(db, task_update.user_id, task_date, completed_delta=completed_delta)
     db.commit()
+    daily_data_cache.invalidate(task_update.user_id, [task_date])
 
-    return {"id": task.id, "description": task.task_text, "completed": task.completed}
+    return {"id": task_id, "description": task.task_text, "completed": task_update.completed}
 
 
 @app.delete("/api/tasks/{task_id}")
@@ -296,29 +691,295 @@ def delete_task(task_id: int, user_id: str = "", db: Session = DB_DEPENDENCY):
     if not validate_user_id(user_id, db):
         raise HTTPException(status_code=401, detail="Invalid user_id")
 
-    task = db.query(DailyTask).filter(DailyTask.id == task_id, DailyTask.user_id == user_id).first()
-
-    if not task:
+    # The deleted row says what the rollup counted, even if a toggle committed meanwhile
+    deleted = None
+    for table in (DailyTask, ArchivedTask):
+        deleted = db.execute(
+            delete(table)
+            .where(table.id == task_id, table.user_id == user_id)
+            .returning(table.created_date, table.completed)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if deleted is not None:
+            break
+
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Task not found or access denied")
 
-    db.delete(task)
+    # Unflushed toggles are discarded below, so the stored state is what the rollup counted
+    task_date = str(deleted.created_date)
+    adjust_daily_stats(db, user_id, task_date, total_delta=-1, completed_delta=-int(bool(deleted.completed)))
     db.commit()
+    daily_data_cache.invalidate(user_id, [task_date])
+
+    if completion_buffer is not None:
+        completion_buffer.discard([task_id])
 
     return {"message": "Task deleted successfully"}
 
 
+def template_to_dict(template: TaskTemplate) -> dict:
+    return {
+        "id": template.id,
+        "description": template.task_text,
+        "recurrence": template.recurrence,
+        "weekday": template.weekday,
+        "start_date": template.start_date,
+    }
+
+
+@app.get("/api/templates")
+def get_templates(user_id: str = "", db: Session = DB_DEPENDENCY):
+    """Lists a user's recurring task templates."""
+    if not user_id:
+        raise HTTPException(status_code=400, detail="user_id is required")
+
+    if not validate_user_id(user_id, db):
+        raise HTTPException(status_code=401, detail="Invalid user_id")
+
+    templates = db.query(TaskTemplate).filter(TaskTemplate.user_id == user_id).order_by(TaskTemplate.id).all()
+    return {"templates": [template_to_dict(template) for template in templates]}
+
+
+@app.post("/api/templates")
+def create_template(template_data: TemplateCreate, date: str = "", db: Session = DB_DEPENDENCY):
+    """Creates a recurring task template that applies from the given date (today by default)."""
+    if not validate_user_id(template_data.user_id, db):
+        raise HTTPException(status_code=401, detail="Invalid user_id")
+
+    if not date:
+        date = datetime.now().strftime("%Y-%m-%d")
+
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="date must use the YYYY-MM-DD format") from e
+
+    template = TaskTemplate(
+        user_id=template_data.user_id,
+        task_text=template_data.task_text,
+        recurrence=template_data.recurrence,
+        weekday=template_data.weekday,
+        start_date=date,
+    )
+    db.add(template)
+    db.flush()
+
+    # Days already materialized won't be again, so they get the new task now
+    add_template_to_materialized_days(db, template)
+    materialize_day(db, template_data.user_id, date)
+    db.commit()
+    db.refresh(template)
+
+    # Cached days that weren't materialized yet may now get the template's task too
+    daily_data_cache.invalidate_user(template_data.user_id)
+
+    return template_to_dict(template)
+
+
+@app.delete("/api/templates/{template_id}")
+def delete_template(template_id: int, user_id: str = "", db: Session = DB_DEPENDENCY):
+    """Deletes a recurring task template; tasks it already created are kept."""
+    if not user_id:
+        raise HTTPException(status_code=400, detail="user_id is required")
+
+    if not validate_user_id(user_id, db):
+        raise HTTPException(status_code=401, detail="Invalid user_id")
+
+    template = db.query(TaskTemplate).filter(TaskTemplate.id == template_id, TaskTemplate.user_id == user_id).first()
+
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found or access denied")
+
+    db.delete(template)
+    db.commit()
+
+    return {"message": "Template deleted successfully"}
+
+
+@app.get("/api/tasks/suggestions")
+def suggest_tasks(user_id: str = "", q: str = "", limit: int = 5, db: Session = DB_DEPENDENCY):
+    """
+    Suggests earlier task texts starting with the typed prefix, most used first.
+
+    Served from memory once a user's history is loaded, so typing does not query the database.
+    """
+    if not user_id:
+        raise HTTPException(status_code=400, detail="user_id is required")
+
+    if not 1 <= limit <= MAX_SUGGESTIONS:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_SUGGESTIONS}")
+
+    # Users with a loaded index were validated when it was loaded
+    if user_id not in task_suggestions and not validate_user_id(user_id, db):
+        raise HTTPException(status_code=401, detail="Invalid user_id")
+
+    # The index holds unescaped text, so the prefix is matched as typed
+    prefix = q.strip()
+    if not prefix:
+        return {"suggestions": []}
+
+    suggestions = task_suggestions.suggest(
+        user_id,
+        prefix,
+        limit,
+        loader=lambda: load_task_history(db, user_id, task_suggestions.max_entries_per_user),
+    )
+    return {"suggestions": suggestions}
+
+
+@app.get("/api/tasks/search")
+def search_task_history(
+    user_id: str = "", q: str = "", page: int = 1, page_size: int = 20, db: Session = DB_DEPENDENCY
+):
+    """Searches a user's whole task history, best matches first, one page at a time."""
+    if not user_id:
+        raise HTTPException(status_code=400, detail="user_id is required")
+
+    if not validate_user_id(user_id, db):
+        raise HTTPException(status_code=401, detail="Invalid user_id")
+
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q is required")
+
+    if page < 1 or not 1 <= page_size <= MAX_SEARCH_PAGE_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"page must be at least 1 and page_size between 1 and {MAX_SEARCH_PAGE_SIZE}"
+        )
+
+    results, has_more = search_tasks(db, user_id, q, limit=page_size, offset=(page - 1) * page_size)
+
+    # Read through the write-behind buffer so unflushed toggles are visible
+    if completion_buffer is not None:
+        for result in results:
+            buffered = completion_buffer.get(result["id"])
+            if buffered is not None:
+                result["completed"] = buffered
+
+    return {"query": q, "page": page, "page_size": page_size, "has_more": has_more, "results": results}
+
+
+@app.post("/api/tasks/carry-over")
+def carry_over(request: CarryOverRequest, db: Session = DB_DEPENDENCY):
+    """
+    Moves (or copies) all incomplete tasks of one day to another, today by default.
+
+    Tasks whose text is already on the target day are left where they are.
+    Returns the target day's tasks.
+    """
+    if not validate_user_id(request.user_id, db):
+        raise HTTPException(status_code=401, detail="Invalid user_id")
+
+    to_date = request.to_date or datetime.now().strftime("%Y-%m-%d")
+    try:
+        for value in (request.from_date, to_date):
+            datetime.strptime(value, "%Y-%m-%d")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Dates must use the YYYY-MM-DD format") from e
+
+    if request.from_date == to_date:
+        raise HTTPException(status_code=400, detail="from_date and to_date must differ")
+
+    if may_be_archived(db, request.user_id, request.from_date):
+        raise HTTPException(status_code=400, detail="Tasks from archived days cannot be carried over")
+
+    # Carry-over decides on stored completion states, so buffered toggles go first
+    flush_completion_buffer()
+
+    carried = carry_over_tasks(db, [request.user_id], request.from_date, to_date, mode=request.mode)
+    db.commit()
+    daily_data_cache.invalidate(request.user_id, [request.from_date, to_date])
+
+    tasks = get_tasks_for_date(db, request.user_id, to_date)
+    return {
+        "date": to_date,
+        "carried": carried,
+        "tasks": [{"id": task.id, "description": task.task_text, "completed": task.completed} for task in tasks],
+    }
+
+
+@app.get("/api/export")
+def export_tasks(user_id: str = "", format: str = "ndjson", db: Session = DB_DEPENDENCY):
+    """Streams a user's full task history as NDJSON (default) or CSV."""
+    if not user_id:
+        raise HTTPException(status_code=400, detail="user_id is required")
+
+    if not validate_user_id(user_id, db):
+        raise HTTPException(status_code=401, detail="Invalid user_id")
+
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+
+    filename = f"wellness-tasks-{datetime.now().strftime('%Y-%m-%d')}.{format}"
+    return StreamingResponse(
+        stream_tasks(db.get_bind(), user_id, format, completion_buffer),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.get("/api/stats")
+def get_stats(user_id: str = "", start_date: str = "", end_date: str = "", db: Session = DB_DEPENDENCY):
+    """
+    Returns a user's task statistics for a date range (the last 30 days by default).
+
+    Served entirely from the daily rollup table, so the cost grows with the number
+    of days requested rather than the number of tasks ever created.
+    """
+    if not user_id:
+        raise HTTPException(status_code=400, detail="user_id is required")
+
+    if not validate_user_id(user_id, db):
+        raise HTTPException(status_code=401, detail="Invalid user_id")
+
+    today = datetime.now().date()
+    try:
+        end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else today
+        start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else end - timedelta(days=29)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Dates must use the YYYY-MM-DD format") from e
+
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+
+    if (end - start).days >= MAX_STATS_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_STATS_DAYS} days")
+
+    return get_user_stats(db, user_id, start, end, today)
+
+
 @app.post("/api/celebrate-task")
-def celebrate_task(task: dict):
-    """Endpoint to celebrate task completion using AI-generated messages."""
+def celebrate_task(task: dict, request: Request, db: Session = DB_DEPENDENCY):
+    """
+    Endpoint to celebrate task completion using AI-generated messages.
+
+    Callers are rate limited per user (per client address for unknown users); once
+    the limit is hit they get the fallback message without a Gemini call.
+    """
     completed_task = task.get("completed_task")
 
     if not completed_task:
         raise HTTPException(status_code=400, detail="completed_task is required")
 
-    celebration_message = task_ai.celebrate_task_completion(completed_task)
+    user_id = task.get("user_id")
+    if user_id and validate_user_id(user_id, db):
+        limiter_key = f"user:{user_id}"
+    else:
+        limiter_key = f"addr:{request.client.host if request.client else 'unknown'}"
+
+    if not celebrate_limiter.allow(limiter_key):
+        return {"message": get_task_ai().get_fallback_message(completed_task)}
+
+    celebration_message = get_task_ai().celebrate_task_completion(completed_task)
     return {"message": celebration_message}
 
 
+@app.get("/api/ai/status")
+def get_ai_status():
+    """Reports the Gemini circuit breaker's state and counters for monitoring."""
+    return {"circuit_breaker": get_task_ai().breaker.snapshot(), "celebrate_rate_limit": celebrate_limiter.stats()}
+
+
 @app.post("/api/sync/generate-code")
 def generate_sync_code(request: SyncCodeGenerate, db: Session = DB_DEPENDENCY):
     """Generate a sync code (OTP) for the given UUID."""
@@ -336,36 +997,40 @@ def generate_sync_code(request: SyncCodeGenerate, db: Session = DB_DEPENDENCY):
 
         # Generate a new OTP if no valid one exists
         sync_code = generate_and_store_otp(request.uuid, db)
+        job_runner.reset_backoff("cleanup_expired_otps")
         return {"sync_code": sync_code}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate sync code: {str(e)}") from e
 
 
-@app.post("/api/sync/validate-code")
-def validate_sync_code(request: SyncCodeValidate, db: Session = DB_DEPENDENCY):
-    """Validate a sync code and return the associated UUID."""
-    if not request.sync_code:
+def resolve_sync_code(sync_code: str, current_uuid: str, db: Session) -> str:
+    """Return the UUID a valid sync code belongs to, or raise an HTTP 400."""
+    if not sync_code:
         raise HTTPException(status_code=400, detail="sync_code is required")
 
-    try:
-        otp_entry = db.query(OTP).filter_by(otp=request.sync_code).first()
+    otp_entry = db.query(OTP).filter_by(otp=sync_code).first()
 
-        if not otp_entry:
-            raise HTTPException(status_code=400, detail="Invalid sync code")
+    if not otp_entry:
+        raise HTTPException(status_code=400, detail="Invalid sync code")
 
-        # Prevent self-sync: check if the sync code belongs to the current user
-        if request.current_uuid and str(otp_entry.uuid) == request.current_uuid:
-            raise HTTPException(status_code=400, detail="Cannot sync with your own device")
+    # Prevent self-sync: check if the sync code belongs to the current user
+    if current_uuid and str(otp_entry.uuid) == current_uuid:
+        raise HTTPException(status_code=400, detail="Cannot sync with your own device")
 
-        # Validate the OTP
-        is_valid = validate_otp(cast(str, otp_entry.uuid), request.sync_code, db)
+    # Validate the OTP
+    if not validate_otp(cast(str, otp_entry.uuid), sync_code, db):
+        raise HTTPException(status_code=400, detail="Sync code has expired")
 
-        if not is_valid:
-            raise HTTPException(status_code=400, detail="Sync code has expired")
+    return str(otp_entry.uuid)
 
+
+@app.post("/api/sync/validate-code")
+def validate_sync_code(request: SyncCodeValidate, db: Session = DB_DEPENDENCY):
+    """Validate a sync code and return the associated UUID."""
+    try:
         # Return the UUID associated with this sync code
-        return {"uuid": otp_entry.uuid}
+        return {"uuid": resolve_sync_code(request.sync_code, request.current_uuid, db)}
 
     except HTTPException:
         raise
@@ -373,5 +1038,47 @@ def validate_sync_code(request: SyncCodeValidate, db: Session = DB_DEPENDENCY):
         raise HTTPException(status_code=500, detail=f"Failed to validate sync code: {str(e)}") from e
 
 
+@app.post("/api/sync/merge")
+def merge_sync_code(request: SyncMergeRequest, db: Session = DB_DEPENDENCY):
+    """Validate a sync code and move the current device's tasks to the UUID it belongs to."""
+    if not request.current_uuid:
+        raise HTTPException(status_code=400, detail="current_uuid is required")
+
+    try:
+        target_uuid = resolve_sync_code(request.sync_code, request.current_uuid, db)
+
+        # Duplicates are combined on stored completion states, so buffered toggles go first
+        flush_completion_buffer()
+
+        merged = merge_user_tasks(db, request.current_uuid, target_uuid)
+        db.commit()
+        task_suggestions.discard([request.current_uuid, target_uuid])
+        daily_data_cache.invalidate_user(request.current_uuid)
+        daily_data_cache.invalidate_user(target_uuid)
+        return {"uuid": target_uuid, **merged}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to merge tasks: {str(e)}") from e
+
+
+# Time spent importing the backend package and building the app, reported at startup
+IMPORT_DURATION_MS = (time.perf_counter() - IMPORT_STARTED_AT) * 1000
+
+
 if __name__ == "__main__":
-    uvicorn.run("backend.main:app", host=settings.host, port=settings.port, reload=settings.debug, server_header=False)
+    # Prepare the database once in the parent process so several workers
+    # starting at the same time don't race to create tables or seed data
+    init_db()
+    add_sample_affirmations()
+
+    uvicorn.run(
+        "backend.main:app",
+        host=settings.host,
+        port=settings.port,
+        reload=settings.debug,
+        workers=settings.workers,
+        server_header=False,
+    )
@@ -0,0 +1,68 @@
+"""
+Maintenance commands for the wellness backend.
+
+Usage:
+    uv run python -m backend.manage backfill-stats
+    uv run python -m backend.manage rebuild-search
+    uv run python -m backend.manage import-affirmations affirmations.csv
+"""
+
+import argparse
+import os
+import time
+
+from .affirmations import IMPORT_FORMATS, import_affirmations, read_affirmation_rows
+from .database import SessionLocal, init_db
+from .search import rebuild_search_index
+from .stats import backfill_daily_stats
+
+
+def backfill_stats(_args: argparse.Namespace) -> None:
+    """Rebuild the daily stats rollups from the full task history."""
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        written = backfill_daily_stats(db)
+    print(f"Rebuilt {written} daily stats rows in {time.perf_counter() - started:.2f}s")
+
+
+def rebuild_search(_args: argparse.Namespace) -> None:
+    """Re-index the text of every task for full-text search."""
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        indexed = rebuild_search_index(db)
+    print(f"Indexed {indexed} tasks in {time.perf_counter() - started:.2f}s")
+
+
+def import_affirmations_file(args: argparse.Namespace) -> None:
+    """Import affirmations from a CSV or NDJSON file, skipping duplicates."""
+    import_format = args.format or ("csv" if os.path.splitext(args.path)[1].lower() == ".csv" else "ndjson")
+    with open(args.path, encoding="utf-8", newline="") as stream, SessionLocal() as db:
+        report = import_affirmations(db, read_affirmation_rows(stream, import_format), batch_size=args.batch_size)
+
+    print(
+        f"Read {report['read']} rows in {report['seconds']:.2f}s ({report['rows_per_second']} rows/s): "
+        f"{report['inserted']} imported, {report['duplicates']} duplicates, {report['invalid']} invalid"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse the command line and run the selected command."""
+    parser = argparse.ArgumentParser(prog="python -m backend.manage", description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("backfill-stats", help=backfill_stats.__doc__).set_defaults(handler=backfill_stats)
+    commands.add_parser("rebuild-search", help=rebuild_search.__doc__).set_defaults(handler=rebuild_search)
+
+    import_parser = commands.add_parser("import-affirmations", help=import_affirmations_file.__doc__)
+    import_parser.add_argument("path", help="CSV (text,category,weight columns) or NDJSON file")
+    import_parser.add_argument("--format", choices=IMPORT_FORMATS, help="defaults to the file extension")
+    import_parser.add_argument("--batch-size", type=int, default=1000, help="rows per insert batch")
+    import_parser.set_defaults(handler=import_affirmations_file)
+
+    args = parser.parse_args(argv)
+    init_db()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
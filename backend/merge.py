@@ -0,0 +1,154 @@
+"""
+Merging one user's task history into another's when devices are synced.
+
+A device that joins a sync code adopts the other device's uuid; the tasks it already
+created under its own uuid are moved over with a handful of set-based statements in
+the caller's transaction, however long the history. Where both users have a task
+with the same text on the same day the target's copy is kept, marked completed if
+either copy was, and the source's copy is dropped.
+"""
+
+from datetime import date
+
+from sqlalchemy import and_, delete, exists, or_, select, text, update
+from sqlalchemy.orm import Session, aliased
+
+from .database import TASK_SEARCH_TABLE, ArchivedTask, DailyTask, MaterializedDay, TaskTemplate
+from .recurring import _insert_instances, occurs_on
+from .stats import rebuild_daily_stats
+
+TASK_TABLES = (DailyTask, ArchivedTask)
+
+
+def _same_task(table, user_id: str, completed_only: bool = False):
+    """Whether `user_id` has a task, hot or archived, with the same day and text as a row of `table`."""
+    clauses = []
+    for other_table in TASK_TABLES:
+        other = aliased(other_table)
+        conditions = [
+            other.user_id == user_id,
+            other.created_date == table.created_date,
+            other.task_text == table.task_text,
+        ]
+        if completed_only:
+            conditions.append(other.completed.is_(True))
+        clauses.append(exists().where(and_(*conditions)))
+    return or_(*clauses)
+
+
+def merge_user_tasks(db: Session, source_user_id: str, target_user_id: str) -> dict:
+    """
+    Move a user's tasks, archived tasks and templates to another user.
+
+    Runs in the caller's transaction. Buffered completion toggles must be flushed
+    first, since completion states of duplicates are combined in the database.
+
+    Args:
+        db: Database session; the caller commits.
+        source_user_id: User whose history is moved; left without tasks
+        target_user_id: User receiving the history
+
+    Returns:
+        dict: Counts of tasks moved, duplicate tasks dropped and templates moved.
+    """
+    if source_user_id == target_user_id:
+        raise ValueError("Cannot merge a user into itself")
+
+    # Keep completions of duplicates before the source's copies are dropped
+    for table in TASK_TABLES:
+        db.execute(
+            update(table)
+            .where(
+                table.user_id == target_user_id,
+                table.completed.is_not(True),
+                _same_task(table, source_user_id, completed_only=True),
+            )
+            .values(completed=True)
+        )
+
+    duplicates = 0
+    for table in TASK_TABLES:
+        result = db.execute(
+            delete(table)
+            .where(table.user_id == source_user_id, _same_task(table, target_user_id))
+            .execution_options(synchronize_session=False)
+        )
+        duplicates += result.rowcount
+
+    moved = 0
+    for table in TASK_TABLES:
+        result = db.execute(
+            update(table)
+            .where(table.user_id == source_user_id)
+            .values(user_id=target_user_id)
+            .execution_options(synchronize_session=False)
+        )
+        moved += result.rowcount
+
+    # Only hot tasks re-index on update; point the archived ones' search rows at the new owner
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(
+            text(f"UPDATE {TASK_SEARCH_TABLE} SET user_id = :target WHERE user_id = :source"),
+            {"target": target_user_id, "source": source_user_id},
+        )
+
+    templates_moved = _merge_templates(db, source_user_id, target_user_id)
+
+    rebuild_daily_stats(db, [source_user_id, target_user_id])
+    return {"tasks_moved": moved, "duplicates_merged": duplicates, "templates_moved": templates_moved}
+
+
+def _merge_templates(db: Session, source_user_id: str, target_user_id: str) -> int:
+    """Move templates the target doesn't have yet, along with the days they were materialized on."""
+    target_templates = db.query(TaskTemplate).filter(TaskTemplate.user_id == target_user_id).all()
+
+    existing = aliased(TaskTemplate)
+    moved = db.execute(
+        update(TaskTemplate)
+        .where(
+            TaskTemplate.user_id == source_user_id,
+            ~exists().where(
+                existing.user_id == target_user_id,
+                existing.task_text == TaskTemplate.task_text,
+                existing.recurrence == TaskTemplate.recurrence,
+                existing.weekday.is_not_distinct_from(TaskTemplate.weekday),
+            ),
+        )
+        .values(user_id=target_user_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.execute(delete(TaskTemplate).where(TaskTemplate.user_id == source_user_id))
+
+    # Days the source already materialized hold its template tasks, now the target's
+    target_day = aliased(MaterializedDay)
+    claimed = (
+        db.execute(
+            update(MaterializedDay)
+            .where(
+                MaterializedDay.user_id == source_user_id,
+                ~exists().where(target_day.user_id == target_user_id, target_day.date == MaterializedDay.date),
+            )
+            .values(user_id=target_user_id)
+            .returning(MaterializedDay.date)
+            .execution_options(synchronize_session=False)
+        )
+        .scalars()
+        .all()
+    )
+    db.execute(delete(MaterializedDay).where(MaterializedDay.user_id == source_user_id))
+
+    # Those days won't be materialized for the target again, so add its own templates' tasks now
+    for task_date in claimed if target_templates else []:
+        present = set(
+            db.execute(
+                select(DailyTask.task_text).where(
+                    DailyTask.user_id == target_user_id, DailyTask.created_date == task_date
+                )
+            ).scalars()
+        )
+        day = date.fromisoformat(task_date)
+        missing = [t for t in target_templates if occurs_on(t, day) and t.task_text not in present]
+        if missing:
+            _insert_instances(db, target_user_id, task_date, missing)
+
+    return moved
@@ -0,0 +1,153 @@
+"""
+Opt-in statistical profiling of live requests.
+
+Sync endpoints run in the threadpool, out of reach of a cProfile started in the
+middleware, so profiling samples instead: while a profiled request is in flight, a
+background thread snapshots every thread's stack every few milliseconds. Threads that
+are idle (waiting on a lock, queue or socket) are skipped. The samples are saved as
+collapsed stacks, one `frame;frame;frame count` line per distinct stack, which
+flamegraph.pl, speedscope and most flamegraph viewers read directly.
+
+Only one request is profiled at a time, which bounds the overhead; while it runs,
+stacks from concurrent requests show up in the same profile. With profiling
+disabled the middleware isn't installed at all.
+"""
+
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# Leaf frames of threads that are waiting rather than working
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("base_events.py", "_run_once"),
+    ("runners.py", "run"),
+    ("handlers.py", "dequeue"),
+}
+
+
+def _label(code) -> str:
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler:
+    """
+    Samples the stacks of all other threads at a fixed interval.
+
+    Attributes:
+        interval: Seconds between samples
+        stacks: Number of times each collapsed stack was seen
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """Initialize a stopped sampler."""
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        """Stop sampling and return the collected stacks."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                leaf = frame.f_code
+                if (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_FRAMES:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    stack.append(_label(frame.f_code))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and stores their profiles.
+
+    Attributes:
+        directory: Where collapsed-stack files are written
+        sample_percent: Percent of requests profiled at random
+        token: Secret that profiles a request when sent in the `X-Profile` header; empty disables it
+        interval: Seconds between stack samples
+        max_files: Profiles kept on disk; older ones are deleted
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sample_percent: float = 0,
+        token: str = "",
+        interval: float = 0.005,
+        max_files: int = 200,
+    ):
+        """Initialize the profiler; the directory is created on the first profile."""
+        self.directory = Path(directory)
+        self.sample_percent = sample_percent
+        self.token = token
+        self.interval = interval
+        self.max_files = max_files
+        self._busy = threading.Lock()
+        self.profiled = 0
+        self.skipped_busy = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_percent > 0 or bool(self.token)
+
+    def should_profile(self, header: str | None) -> bool:
+        """Whether a request with this `X-Profile` header value should be profiled."""
+        if header and self.token and hmac.compare_digest(header.encode(), self.token.encode()):
+            return True
+        return self.sample_percent > 0 and random.random() * 100 < self.sample_percent
+
+    def start(self) -> StackSampler | None:
+        """Start sampling, or return None if another request is already being profiled."""
+        if not self._busy.acquire(blocking=False):
+            self.skipped_busy += 1
+            return None
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        return sampler
+
+    def finish(self, sampler: StackSampler, name: str) -> Path:
+        """Stop sampling and write the collapsed stacks; blocks on disk I/O, so call it off the event loop."""
+        try:
+            stacks = sampler.stop()
+        finally:
+            self._busy.release()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_")[:120]
+        path = self.directory / f"{time.strftime('%Y%m%dT%H%M%S')}-{safe_name}.collapsed"
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+        self.profiled += 1
+
+        profiles = sorted(self.directory.glob("*.collapsed"), key=lambda p: p.stat().st_mtime)
+        for old in profiles[: max(len(profiles) - self.max_files, 0)]:
+            old.unlink(missing_ok=True)
+        return path
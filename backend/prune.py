@@ -0,0 +1,99 @@
+"""
+Pruning of inactive users and their task history.
+
+Every new browser registers a user, so many users never create a task or are left
+empty after their device syncs with another. A scheduled job deletes users that were
+created before a cutoff and have no tasks dated on or after it, no recurring
+templates and no pending sync code, together with everything they own.
+
+The job pages through inactive users by primary key in small chunks (keyset
+pagination, so each page starts with an index seek however far it got) and deletes
+each chunk in its own short transaction, pausing in between so live requests can
+take SQLite's write lock. Activity is checked again by the delete itself, so a user
+who comes back between the scan and the delete is kept.
+"""
+
+import time
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, delete, exists, select
+from sqlalchemy.orm import Session
+
+from .database import OTP, ArchivedTask, DailyStat, DailyTask, MaterializedDay, TaskTemplate, User
+
+OWNED_TABLES = (DailyTask, ArchivedTask, DailyStat, MaterializedDay)
+
+
+def _inactive(cutoff: datetime, protected_user_ids: Iterable[str]):
+    """Condition on `User` rows matching users that may be pruned."""
+    cutoff_date = cutoff.date().isoformat()
+    return and_(
+        User.created_at < cutoff,
+        User.user_id.not_in(list(protected_user_ids)),
+        *(
+            ~exists().where(table.user_id == User.user_id, table.created_date >= cutoff_date)
+            for table in (DailyTask, ArchivedTask)
+        ),
+        ~exists().where(TaskTemplate.user_id == User.user_id),
+        ~exists().where(OTP.uuid == User.user_id),
+    )
+
+
+def prune_inactive_users(
+    session_factory: Callable[[], Session],
+    inactive_days: int,
+    chunk_size: int = 100,
+    pause: float = 0.2,
+    max_chunks: int = 50,
+    protected_user_ids: Iterable[str] = (),
+    now: datetime | None = None,
+) -> int:
+    """
+    Delete users without recent activity, and their tasks, in bounded chunks.
+
+    Args:
+        session_factory: Callable returning a new database session.
+        inactive_days: Users created and without tasks in this many days are deleted.
+        chunk_size: Users deleted per transaction.
+        pause: Seconds to sleep between chunks, leaving the write lock to requests.
+        max_chunks: Upper bound on transactions per call; the rest waits for the next run.
+        protected_user_ids: Users that are never deleted, e.g. the default user.
+        now: Current time, for tests.
+
+    Returns:
+        int: Number of users deleted.
+    """
+    cutoff = (now or datetime.now(UTC)) - timedelta(days=inactive_days)
+    inactive = _inactive(cutoff, protected_user_ids)
+    last_id = 0
+    pruned = 0
+
+    for chunk in range(max_chunks):
+        if chunk:
+            time.sleep(pause)
+
+        with session_factory() as db:
+            ids = (
+                db.execute(select(User.id).where(User.id > last_id, inactive).order_by(User.id).limit(chunk_size))
+                .scalars()
+                .all()
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+
+            # Deleting the users first takes the write lock, so the activity check can't go stale
+            user_ids = (
+                db.execute(delete(User).where(User.id.in_(ids), inactive).returning(User.user_id)).scalars().all()
+            )
+            for table in OWNED_TABLES:
+                if user_ids:
+                    db.execute(delete(table).where(table.user_id.in_(user_ids)))
+            db.commit()
+
+        pruned += len(user_ids)
+        if len(ids) < chunk_size:
+            break
+
+    return pruned
@@ -0,0 +1,105 @@
+"""
+In-process rate limiting for expensive endpoints.
+
+Provides a per-key token bucket limiter that works without a reverse proxy in front
+of the API. Buckets are spread over independently locked shards so concurrent
+requests for different users rarely contend, and each shard holds a bounded number
+of buckets so memory stays flat no matter how many distinct keys are seen.
+"""
+
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+
+class _Shard:
+    """A lock-protected, LRU-ordered slice of the limiter's buckets."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> [tokens, last_refill]; kept in least-recently-used order
+        self.buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket rate limiter keyed by an arbitrary string such as a user id.
+
+    Each key gets `capacity` tokens that refill continuously at `rate` tokens per
+    second; a request is allowed when a whole token is available. A bucket that has
+    been idle for `capacity / rate` seconds is full again, so evicting it loses no
+    information. Idle buckets are evicted first when a shard is full, then the least
+    recently used one.
+
+    Attributes:
+        rate: Tokens added per second
+        capacity: Maximum tokens a bucket holds (the allowed burst)
+        max_keys_per_shard: Bucket limit per shard, bounding total memory
+    """
+
+    def __init__(self, rate: float, capacity: float, shards: int = 16, max_keys_per_shard: int = 1024):
+        """Initialize the limiter with empty shards."""
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys_per_shard = max_keys_per_shard
+        self.idle_ttl = capacity / rate
+
+        self._shards = [_Shard() for _ in range(shards)]
+
+    def allow(self, key: str) -> bool:
+        """
+        Consume a token for `key` if one is available.
+
+        Args:
+            key (str): Identifier of the caller, e.g. a user id.
+
+        Returns:
+            bool: True if the request may proceed, False if it is rate limited.
+        """
+        shard = self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+        now = time.monotonic()
+
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                if len(shard.buckets) >= self.max_keys_per_shard:
+                    self._evict(shard, now)
+                bucket = [self.capacity, now]
+                shard.buckets[key] = bucket
+            else:
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                shard.buckets.move_to_end(key)
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                shard.allowed += 1
+                return True
+
+            shard.limited += 1
+            return False
+
+    def stats(self) -> dict:
+        """Current number of tracked keys and allow/limit counters."""
+        return {
+            "keys": sum(len(shard.buckets) for shard in self._shards),
+            "allowed": sum(shard.allowed for shard in self._shards),
+            "limited": sum(shard.limited for shard in self._shards),
+        }
+
+    def _evict(self, shard: _Shard, now: float) -> None:
+        """Drop idle buckets from the LRU end, or the least recently used one if none are idle."""
+        while shard.buckets:
+            _key, (_tokens, last_refill) = next(iter(shard.buckets.items()))
+            if now - last_refill < self.idle_ttl:
+                break
+            shard.buckets.popitem(last=False)
+
+        if len(shard.buckets) >= self.max_keys_per_shard:
+            shard.buckets.popitem(last=False)
@@ -0,0 +1,147 @@
+"""
+Recurring task templates.
+
+A template describes a habit ("every weekday: stretch"). Instead of writing tasks
+ahead of time, a day's instances are created in one bulk insert the first time the
+day is viewed, and the day is recorded in `materialized_days` so this happens once.
+A template whose text is already on the day, e.g. carried over from the day before,
+isn't created again.
+"""
+
+from datetime import date
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .database import DailyTask, MaterializedDay, TaskTemplate
+from .stats import UPSERT_INSERTS, adjust_daily_stats
+
+RECURRENCES = ("daily", "weekdays", "weekly")
+
+
+def occurs_on(template: TaskTemplate, day: date) -> bool:
+    """Whether a template produces a task on `day`."""
+    if day.isoformat() < str(template.start_date):
+        return False
+    if template.recurrence == "weekdays":
+        return day.weekday() < 5
+    if template.recurrence == "weekly":
+        return day.weekday() == template.weekday
+    return template.recurrence == "daily"
+
+
+def _insert_instances(db: Session, user_id: str, task_date: str, templates: list[TaskTemplate]) -> None:
+    """Create one task per template for a day with a single multi-row insert."""
+    db.execute(
+        insert(DailyTask),
+        [
+            {"task_text": template.task_text, "completed": False, "created_date": task_date, "user_id": user_id}
+            for template in templates
+        ],
+    )
+    adjust_daily_stats(db, user_id, task_date, total_delta=len(templates))
+
+
+def _claim_day(db: Session, user_id: str, task_date: str) -> bool:
+    """Record a day as materialized; False if a concurrent request already did."""
+    upsert_insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if upsert_insert is None:
+        # Without ON CONFLICT, let the primary key reject the second claim
+        try:
+            with db.begin_nested():
+                db.execute(insert(MaterializedDay).values(user_id=user_id, date=task_date))
+        except IntegrityError:
+            return False
+        return True
+
+    claimed = db.execute(
+        upsert_insert(MaterializedDay).values(user_id=user_id, date=task_date).on_conflict_do_nothing()
+    )
+    return claimed.rowcount == 1
+
+
+def materialize_day(db: Session, user_id: str, task_date: str) -> list[TaskTemplate]:
+    """
+    Create the tasks a user's templates produce on a day, unless that already happened.
+
+    Runs in the caller's transaction. Days without matching templates aren't
+    recorded, so they cost no write.
+
+    Args:
+        db: Database session; the caller commits.
+        user_id: Owner of the templates
+        task_date: Day being viewed (YYYY-MM-DD format)
+
+    Returns:
+        list[TaskTemplate]: Templates that produced a task, empty if nothing was created.
+    """
+    if db.get(MaterializedDay, (user_id, task_date)) is not None:
+        return []
+
+    try:
+        day = date.fromisoformat(task_date)
+    except ValueError:
+        return []
+
+    templates = (
+        db.query(TaskTemplate)
+        .filter(TaskTemplate.user_id == user_id, TaskTemplate.start_date <= task_date)
+        .order_by(TaskTemplate.id)
+        .all()
+    )
+    matching = [template for template in templates if occurs_on(template, day)]
+    if not matching:
+        return []
+
+    # A concurrent request may have materialized the day since the check above
+    if not _claim_day(db, user_id, task_date):
+        return []
+
+    existing = set(
+        db.execute(select(DailyTask.task_text).where(DailyTask.user_id == user_id, DailyTask.created_date == task_date))
+        .scalars()
+        .all()
+    )
+    created = [template for template in matching if template.task_text not in existing]
+    if created:
+        _insert_instances(db, user_id, task_date, created)
+    return created
+
+
+def add_template_to_materialized_days(db: Session, template: TaskTemplate) -> list[str]:
+    """
+    Create a new template's tasks on days that were already materialized.
+
+    Other days pick the template up when they are first viewed. Runs in the
+    caller's transaction.
+
+    Returns:
+        list[str]: Days that received a task.
+    """
+    materialized = (
+        db.execute(
+            select(MaterializedDay.date).where(
+                MaterializedDay.user_id == template.user_id, MaterializedDay.date >= template.start_date
+            )
+        )
+        .scalars()
+        .all()
+    )
+    matching = [task_date for task_date in materialized if occurs_on(template, date.fromisoformat(task_date))]
+    # Like materialize_day, skip days that already have a task with the template's text
+    taken = set(
+        db.execute(
+            select(DailyTask.created_date).where(
+                DailyTask.user_id == template.user_id,
+                DailyTask.task_text == template.task_text,
+                DailyTask.created_date.in_(matching),
+            )
+        )
+        .scalars()
+        .all()
+    )
+    task_dates = [task_date for task_date in matching if task_date not in taken]
+    for task_date in task_dates:
+        _insert_instances(db, str(template.user_id), task_date, [template])
+    return task_dates
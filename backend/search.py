@@ -0,0 +1,115 @@
+"""
+Full-text search over a user's task history.
+
+Task text is indexed in an SQLite FTS5 table that triggers keep in sync with both
+the hot and archive task tables, so a search is an index lookup ranked by bm25
+instead of a `LIKE '%term%'` scan over every task. The owner is an indexed column
+too and is part of the MATCH, so a search only reads the user's own rows instead of
+every user's matches.
+"""
+
+import re
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .database import TASK_SEARCH_TABLE
+
+# Words in the user's query; everything else is dropped so it can't be read as FTS5 syntax
+QUERY_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def build_match_query(query: str) -> str | None:
+    """
+    Turn free text into an FTS5 query matching tasks that contain every word.
+
+    The last word is matched as a prefix so results appear while the user types.
+
+    Returns:
+        str | None: The MATCH expression, or None if the query has no words.
+    """
+    tokens = QUERY_TOKEN_PATTERN.findall(query.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"' for token in tokens) + "*"
+
+
+def build_user_match_query(user_id: str, match: str) -> str:
+    """Restrict an FTS5 query built by `build_match_query` to a user's task text."""
+    # A quoted string is a phrase of the id's tokens; quotes inside it are doubled
+    quoted_user_id = '"' + user_id.replace('"', '""') + '"'
+    return f"user_id : {quoted_user_id} AND task_text : ({match})"
+
+
+def search_tasks(db: Session, user_id: str, query: str, limit: int = 20, offset: int = 0) -> tuple[list[dict], bool]:
+    """
+    Find a user's tasks matching a query, best matches first.
+
+    Args:
+        db: Database session
+        user_id: Owner of the searched tasks
+        query: Free text typed by the user
+        limit: Maximum number of results to return
+        offset: Number of results to skip, for pagination
+
+    Returns:
+        tuple[list[dict], bool]: The page of matches and whether more matches follow.
+    """
+    match = build_match_query(query)
+    if match is None:
+        return [], False
+
+    # The MATCH narrows the scan to the user's rows; the equality check drops ids that merely share
+    # their tokens. Fetch one extra row to know whether another page exists without counting every match
+    rows = db.execute(
+        text(
+            f"""
+            SELECT hits.rowid AS id, hits.created_date AS date, hits.task_text AS description,
+                   COALESCE(hot.completed, cold.completed) AS completed
+            FROM (
+                SELECT rowid, created_date, task_text, bm25({TASK_SEARCH_TABLE}, 1.0, 0.0) AS score
+                FROM {TASK_SEARCH_TABLE}
+                WHERE {TASK_SEARCH_TABLE} MATCH :match AND user_id = :user_id
+                ORDER BY score, created_date DESC
+                LIMIT :limit OFFSET :offset
+            ) AS hits
+            LEFT JOIN daily_tasks AS hot ON hot.id = hits.rowid
+            LEFT JOIN daily_tasks_archive AS cold ON cold.id = hits.rowid
+            ORDER BY hits.score, hits.created_date DESC
+            """
+        ),
+        {"match": build_user_match_query(user_id, match), "user_id": user_id, "limit": limit + 1, "offset": offset},
+    ).all()
+
+    results = [
+        {"id": row.id, "date": row.date, "description": row.description, "completed": bool(row.completed)}
+        for row in rows[:limit]
+    ]
+    return results, len(rows) > limit
+
+
+def rebuild_search_index(db: Session) -> int:
+    """
+    Re-index every hot and archived task and commit.
+
+    Used on first start after upgrading and by `python -m backend.manage rebuild-search`.
+
+    Returns:
+        int: Number of tasks indexed.
+    """
+    db.execute(text(f"DELETE FROM {TASK_SEARCH_TABLE}"))
+    indexed = 0
+    for table in ("daily_tasks", "daily_tasks_archive"):
+        # Archived copies replace any hot row with the same id, like the archive trigger does
+        result = db.execute(
+            text(
+                f"""
+                INSERT OR REPLACE INTO {TASK_SEARCH_TABLE}(rowid, task_text, user_id, created_date)
+                SELECT id, task_text, user_id, created_date FROM {table}
+                """
+            )
+        )
+        indexed += result.rowcount
+    db.execute(text(f"INSERT INTO {TASK_SEARCH_TABLE}({TASK_SEARCH_TABLE}) VALUES ('optimize')"))
+    db.commit()
+    return indexed
@@ -0,0 +1,197 @@
+"""
+Per-user daily completion rollups and streak statistics.
+
+Every change to a task adjusts a single `daily_stats` row for its user and day, so
+statistics are served from the rollup alone and cost O(days requested), plus a
+bounded window for streaks, instead of O(tasks ever created). A one-shot backfill
+rebuilds the rollup from task history.
+"""
+
+from collections.abc import Mapping
+from datetime import date, timedelta
+
+from sqlalchemy import delete, func, insert, literal_column, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .database import ArchivedTask, DailyStat, DailyTask
+
+# Days before today searched for streaks, so stats reads stay bounded for long-lived users
+STREAK_WINDOW_DAYS = 366
+
+# INSERT constructs with ON CONFLICT support, by dialect
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def adjust_daily_stats(db: Session, user_id: str, day: str, total_delta: int = 0, completed_delta: int = 0) -> None:
+    """
+    Apply a change to a user's rollup for one day, creating the row if needed.
+
+    Runs inside the caller's transaction, so the rollup commits together with the
+    task change it describes.
+    """
+    adjust_many_daily_stats(db, {(user_id, day): (total_delta, completed_delta)})
+
+
+def adjust_many_daily_stats(db: Session, deltas: Mapping[tuple[str, str], tuple[int, int]]) -> None:
+    """
+    Apply (total, completed) changes keyed by (user_id, day) with a single batched upsert.
+
+    Runs inside the caller's transaction, like `adjust_daily_stats`.
+    """
+    rows = [
+        {"user_id": user_id, "date": day, "total_tasks": total_delta, "completed_tasks": completed_delta}
+        for (user_id, day), (total_delta, completed_delta) in deltas.items()
+        if total_delta or completed_delta
+    ]
+    if not rows:
+        return
+
+    upsert_insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if upsert_insert is None:
+        # Without ON CONFLICT, update each row and create it if there was none
+        for row in rows:
+            updated = db.execute(
+                update(DailyStat)
+                .where(DailyStat.user_id == row["user_id"], DailyStat.date == row["date"])
+                .values(
+                    total_tasks=DailyStat.total_tasks + row["total_tasks"],
+                    completed_tasks=DailyStat.completed_tasks + row["completed_tasks"],
+                )
+            )
+            if updated.rowcount == 0:
+                db.execute(insert(DailyStat).values(**row))
+        return
+
+    statement = upsert_insert(DailyStat)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[DailyStat.user_id, DailyStat.date],
+            set_={
+                "total_tasks": DailyStat.total_tasks + statement.excluded.total_tasks,
+                "completed_tasks": DailyStat.completed_tasks + statement.excluded.completed_tasks,
+            },
+        ),
+        rows,
+    )
+
+
+def rebuild_daily_stats(db: Session, user_ids: list[str] | None = None) -> int:
+    """
+    Recompute rollups from task history (hot and archived) with set-based statements.
+
+    Args:
+        db: Database session; the caller commits.
+        user_ids: Only rebuild these users, or everyone when None.
+
+    Returns:
+        int: Number of rollup rows written.
+    """
+    history = union_all(
+        *(
+            select(table.user_id, table.created_date, table.completed).where(
+                table.user_id.in_(user_ids) if user_ids is not None else literal_column("1") == 1
+            )
+            for table in (DailyTask, ArchivedTask)
+        )
+    ).subquery()
+
+    clear = delete(DailyStat)
+    if user_ids is not None:
+        clear = clear.where(DailyStat.user_id.in_(user_ids))
+    db.execute(clear)
+
+    result = db.execute(
+        insert(DailyStat).from_select(
+            ["user_id", "date", "total_tasks", "completed_tasks"],
+            select(
+                history.c.user_id,
+                history.c.created_date,
+                func.count(),
+                func.coalesce(func.sum(history.c.completed), 0),
+            )
+            .where(history.c.created_date.is_not(None))
+            .group_by(history.c.user_id, history.c.created_date),
+        )
+    )
+    return result.rowcount
+
+
+def backfill_daily_stats(db: Session) -> int:
+    """Rebuild every user's rollups from scratch and commit. Returns the rows written."""
+    written = rebuild_daily_stats(db)
+    db.commit()
+    return written
+
+
+def _streaks(active_days: list[str], today: date) -> tuple[int, int]:
+    """Current and longest runs of consecutive days in a sorted list of active days."""
+    longest = 0
+    run = 0
+    previous: date | None = None
+
+    for day in map(date.fromisoformat, active_days):
+        run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+
+    # A streak is still current if its last day is today, or yesterday while today is in progress
+    current = run if previous is not None and today - previous <= timedelta(days=1) else 0
+    return current, longest
+
+
+def get_user_stats(db: Session, user_id: str, start: date, end: date, today: date) -> dict:
+    """
+    Build a user's statistics for a date range from the rollup table.
+
+    A day counts towards a streak when at least one of its tasks was completed.
+    Streaks are found within the last STREAK_WINDOW_DAYS days, so the cost of a
+    read doesn't grow with the length of the user's history.
+
+    Returns:
+        dict: Per-day counts for the range, the range's completion rate and the
+        user's current and longest streaks.
+    """
+    rows = db.execute(
+        select(DailyStat.date, DailyStat.total_tasks, DailyStat.completed_tasks).where(
+            DailyStat.user_id == user_id, DailyStat.date >= start.isoformat(), DailyStat.date <= end.isoformat()
+        )
+    ).all()
+    by_day = {row.date: (row.total_tasks, row.completed_tasks) for row in rows}
+
+    days = []
+    for offset in range((end - start).days + 1):
+        day = (start + timedelta(days=offset)).isoformat()
+        total, completed = by_day.get(day, (0, 0))
+        days.append({"date": day, "total_tasks": total, "completed_tasks": completed})
+
+    total_tasks = sum(total for total, _ in by_day.values())
+    completed_tasks = sum(completed for _, completed in by_day.values())
+
+    active_days = (
+        db.execute(
+            select(DailyStat.date)
+            .where(
+                DailyStat.user_id == user_id,
+                DailyStat.completed_tasks > 0,
+                DailyStat.date > (today - timedelta(days=STREAK_WINDOW_DAYS)).isoformat(),
+                DailyStat.date <= today.isoformat(),
+            )
+            .order_by(DailyStat.date)
+        )
+        .scalars()
+        .all()
+    )
+    current_streak, longest_streak = _streaks(active_days, today)
+
+    return {
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "total_tasks": total_tasks,
+        "completed_tasks": completed_tasks,
+        "completion_rate": round(completed_tasks / total_tasks, 4) if total_tasks else 0.0,
+        "current_streak": current_streak,
+        "longest_streak": longest_streak,
+        "streak_window_days": STREAK_WINDOW_DAYS,
+        "days": days,
+    }
@@ -3,13 +3,174 @@ AI-powered task celebration and motivation system.
 
 This module provides AI-generated motivational responses for task completion
 using Google's Gemini API. It focuses specifically on task-related celebrations
-with a warm, autumn-themed personality.
+with a warm, autumn-themed personality. Calls go through a circuit breaker so a
+degraded Gemini API makes celebrations fall back instantly instead of piling up
+slow failing requests.
 """
 
+import logging
+import threading
+import time
+from collections import deque
 from html import escape
+from typing import TYPE_CHECKING
 
-from google import genai
-from google.genai import types
+from .tracing import CLIENT, tracer
+
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Sent as written, continuation-line indentation included, so replies keep the same voice
+SYSTEM_INSTRUCTION = """You are a warm, encouraging wellness companion with a cozy autumn vibe.
+            When a user completes a task, respond with genuine celebration and motivation. Keep responses:
+            - Sweet and supportive (like a caring friend by a fireplace)
+            - Motivational but not overwhelming
+            - Cozy and comforting in tone with autumn warmth
+            - 1 sentence max
+            - Focus on their progress and self-care
+            - Use warm, gentle language but also casual and friendly
+            - Be genuinely excited about their accomplishment
+            - Make it feel personal and heartfelt
+            - Use autumn-themed emojis: 🍂 🧡 🌟 🍯 ✨ 🌙 🕯️ 🌻 ☕ 🥧
+            - Channel the feeling of golden hour, cozy sweaters, and warm drinks"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker tracking the outcome of recent upstream calls.
+
+    While closed, calls pass through and their outcomes fill a rolling window. A
+    call fails if it raises or takes longer than `slow_call_seconds`. Once the
+    window holds at least `min_calls` outcomes and the failure rate reaches
+    `failure_rate_threshold`, the breaker opens and rejects calls for
+    `open_seconds`. It then goes half-open and lets `half_open_probes` trial calls
+    through: if they all succeed it closes again, any failure re-opens it.
+
+    Attributes:
+        window_size: Number of recent outcomes the failure rate and latency percentiles are computed over
+        min_calls: Outcomes needed before the breaker may open
+        failure_rate_threshold: Failure rate (0-1) that opens the breaker
+        slow_call_seconds: Calls slower than this count as failures
+        open_seconds: Time calls are rejected before probing the upstream again
+        half_open_probes: Trial calls allowed while half-open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 2.0,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+    ):
+        """Initialize a closed breaker with an empty window."""
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._durations: deque[float] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go to the upstream now; rejected calls should fall back."""
+        with self._lock:
+            self._advance(time.monotonic())
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._probes_started < self.half_open_probes:
+                self._probes_started += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, success: bool, duration: float) -> None:
+        """Record the outcome of a call that `allow` let through."""
+        slow = duration > self.slow_call_seconds
+        failed = not success or slow
+
+        with self._lock:
+            self.calls += 1
+            self.failures += 1 if not success else 0
+            self.slow_calls += 1 if slow else 0
+            self._durations.append(duration)
+
+            if self._state == self.HALF_OPEN:
+                if failed:
+                    self._open()
+                else:
+                    self._probes_succeeded += 1
+                    if self._probes_succeeded >= self.half_open_probes:
+                        self._state = self.CLOSED
+                        self._outcomes.clear()
+                return
+
+            if self._state == self.CLOSED:
+                self._outcomes.append(failed)
+                if len(self._outcomes) >= self.min_calls and self._failure_rate() >= self.failure_rate_threshold:
+                    self._open()
+
+    def snapshot(self) -> dict:
+        """Current state and counters, for monitoring."""
+        with self._lock:
+            now = time.monotonic()
+            self._advance(now)
+            retry_in = self._opened_at + self.open_seconds - now if self._state == self.OPEN else 0.0
+            durations = sorted(self._durations)
+            return {
+                "state": self._state,
+                "failure_rate": round(self._failure_rate(), 3),
+                "window_calls": len(self._outcomes),
+                "retry_in_s": round(max(retry_in, 0.0), 1),
+                "calls": self.calls,
+                "failures": self.failures,
+                "slow_calls": self.slow_calls,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+                "latency_p50_ms": round(durations[len(durations) // 2] * 1000, 1) if durations else None,
+                "latency_p95_ms": round(durations[int(len(durations) * 0.95)] * 1000, 1) if durations else None,
+            }
+
+    def _failure_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def _advance(self, now: float) -> None:
+        """Move from open to half-open once the open period is over."""
+        if self._state == self.OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._probes_started = 0
+            self._probes_succeeded = 0
 
 
 class TaskAI:
@@ -21,40 +182,71 @@ class TaskAI:
     Gemini API to generate personalized responses while ensuring input sanitization
     for security.
 
+    The Gemini SDK is heavy to import, so both the client and its generation
+    config are built on first use instead of in the constructor.
+
     Attributes:
-        client: Google Gemini AI client instance
-        config: AI generation configuration with autumn-themed personality
+        client: Google Gemini AI client instance (created lazily)
+        config: AI generation configuration with autumn-themed personality (created lazily)
         model: Gemini model identifier for text generation
+        breaker: Circuit breaker guarding calls to Gemini
+        timeout_seconds: Upper bound on a single Gemini request
+        base_url: Alternative Gemini API endpoint, e.g. a local fake for benchmarks
     """
 
-    def __init__(self, api_key: str):
-        """Initialize the TaskAI client with Gemini API configuration."""
-        self.client = genai.Client(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        breaker: CircuitBreaker | None = None,
+        timeout_seconds: float = 5.0,
+        base_url: str | None = None,
+    ):
+        """Initialize the TaskAI client without importing the Gemini SDK yet."""
+        self.api_key = api_key
+        self.model = "gemini-2.0-flash-001"
+        self.breaker = breaker or CircuitBreaker()
+        self.timeout_seconds = timeout_seconds
+        self.base_url = base_url
 
-        self.config = types.GenerateContentConfig(
-            system_instruction="""You are a warm, encouraging wellness companion with a cozy autumn vibe.
-            When a user completes a task, respond with genuine celebration and motivation. Keep responses:
-            - Sweet and supportive (like a caring friend by a fireplace)
-            - Motivational but not overwhelming
-            - Cozy and comforting in tone with autumn warmth
-            - 1 sentence max
-            - Focus on their progress and self-care
-            - Use warm, gentle language but also casual and friendly
-            - Be genuinely excited about their accomplishment
-            - Make it feel personal and heartfelt
-            - Use autumn-themed emojis: 🍂 🧡 🌟 🍯 ✨ 🌙 🕯️ 🌻 ☕ 🥧
-            - Channel the feeling of golden hour, cozy sweaters, and warm drinks""",
-            temperature=0.8,
-            max_output_tokens=40,
-            candidate_count=1,
-            top_p=0.8,
-            top_k=20,
-            response_mime_type="text/plain",
-            presence_penalty=0.1,
-            frequency_penalty=0.1,
-        )
+        self._client: genai.Client | None = None
+        self._config: types.GenerateContentConfig | None = None
+        self._init_lock = threading.Lock()
 
-        self.model = "gemini-2.0-flash-001"
+    @property
+    def client(self) -> "genai.Client":
+        """Gemini client, importing the SDK and connecting on first access."""
+        if self._client is None:
+            with self._init_lock:
+                if self._client is None:
+                    from google import genai
+                    from google.genai import types
+
+                    self._client = genai.Client(
+                        api_key=self.api_key,
+                        http_options=types.HttpOptions(
+                            base_url=self.base_url, timeout=int(self.timeout_seconds * 1000)
+                        ),
+                    )
+        return self._client
+
+    @property
+    def config(self) -> "types.GenerateContentConfig":
+        """Generation config with the autumn-themed personality, built on first access."""
+        if self._config is None:
+            from google.genai import types
+
+            self._config = types.GenerateContentConfig(
+                system_instruction=SYSTEM_INSTRUCTION,
+                temperature=0.8,
+                max_output_tokens=40,
+                candidate_count=1,
+                top_p=0.8,
+                top_k=20,
+                response_mime_type="text/plain",
+                presence_penalty=0.1,
+                frequency_penalty=0.1,
+            )
+        return self._config
 
     def celebrate_task_completion(self, completed_task: str) -> str:
         """Generate a celebratory message for completing a task."""
@@ -63,15 +255,36 @@ class TaskAI:
         if not safe_task:
             return "Great job completing your task! You're taking wonderful care of yourself. 🌟"
 
+        # While Gemini is failing, answer right away instead of waiting for another failure
+        if not self.breaker.allow():
+            return self._get_fallback_message(safe_task)
+
         prompt = f"Completed task: {safe_task}\n\nCelebrate this accomplishment:"
+        started = time.monotonic()
 
         try:
-            response = self.client.models.generate_content(model=self.model, contents=prompt, config=self.config)
-            return response.text.strip() if response.text else self._get_fallback_message(safe_task)
-
+            with tracer.span(
+                "gemini generate_content",
+                kind=CLIENT,
+                attributes={"gen_ai.system": "gemini", "gen_ai.request.model": self.model},
+            ):
+                response = self.client.models.generate_content(model=self.model, contents=prompt, config=self.config)
         except Exception as e:
-            print(f"TaskAI service error: {type(e).__name__}")
+            self.breaker.record(success=False, duration=time.monotonic() - started)
+            logger.warning("Gemini call failed", extra={"error": type(e).__name__, "breaker": self.breaker.state})
             return self._get_fallback_message(safe_task)
 
+        self.breaker.record(success=True, duration=time.monotonic() - started)
+        return response.text.strip() if response.text else self._get_fallback_message(safe_task)
+
+    def get_fallback_message(self, completed_task: str) -> str:
+        """Celebration message built without calling Gemini, e.g. when the caller is rate limited."""
+        safe_task = escape(completed_task.strip()) if completed_task else ""
+
+        if not safe_task:
+            return "Great job completing your task! You're taking wonderful care of yourself. 🌟"
+
+        return self._get_fallback_message(safe_task)
+
     def _get_fallback_message(self, task: str) -> str:
         return f"Beautiful work completing '{task}'! You're taking such good care of yourself. 🌟"
@@ -0,0 +1,384 @@
+"""
+Lightweight in-process tracing with OpenTelemetry-compatible output.
+
+Spans follow the OpenTelemetry data model: 128-bit trace ids, 64-bit span ids,
+parent links, kinds, attributes and an error status. They are propagated through a
+context variable, so they follow requests into the threadpool and jobs into their
+worker threads, and an incoming W3C `traceparent` header continues the caller's
+trace. Finished spans are queued and written by a background thread as OTLP/JSON
+lines (the format of the OpenTelemetry Collector's file exporter) to a file or to
+stderr.
+
+The module-level `tracer` does nothing until `configure` gives it an exporter, and
+callers keep instrumentation off entirely while tracing is disabled, so the cost is a
+single attribute check per traced call.
+"""
+
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TextIO
+
+from fastapi.routing import APIRoute
+from sqlalchemy import Engine, event
+
+TRACE_EXPORTERS = ("", "console", "file")
+
+# Span kinds, as named in OTLP
+INTERNAL = "SPAN_KIND_INTERNAL"
+SERVER = "SPAN_KIND_SERVER"
+CLIENT = "SPAN_KIND_CLIENT"
+
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# Longest SQL statement kept in a span attribute
+MAX_STATEMENT_LENGTH = 1000
+
+
+class Span:
+    """
+    A timed operation within a trace.
+
+    Unsampled spans are still created so their ids propagate to children, but they
+    record nothing and are never exported.
+    """
+
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "sampled",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "error",
+    )
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_span_id: str | None, sampled: bool):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = random.getrandbits(64).to_bytes(8, "big").hex()
+        self.parent_span_id = parent_span_id
+        self.sampled = sampled
+        self.attributes: dict = {}
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context header value identifying this span."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_otlp(self) -> dict:
+        """This span in OTLP/JSON form."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": "STATUS_CODE_ERROR", "message": self.error} if self.error else {},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """The (trace id, parent span id, sampled) of a valid W3C `traceparent` header."""
+    match = TRACEPARENT_PATTERN.match(header.strip().lower()) if header else None
+    if match is None or match[1] == "0" * 32 or match[2] == "0" * 16:
+        return None
+    return match[1], match[2], bool(int(match[3], 16) & 1)
+
+
+# Span of the operation running in the current context
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class InMemoryExporter:
+    """Keeps finished spans in a list, for tests."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def submit(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def shutdown(self) -> None:
+        pass
+
+
+class BatchExporter:
+    """
+    Writes finished spans as OTLP/JSON lines from a background thread.
+
+    Spans are queued without blocking; if the writer falls behind and the queue
+    fills up, new spans are dropped and counted rather than slowing requests down.
+    """
+
+    def __init__(self, stream: TextIO, service_name: str, max_queue: int = 10_000, max_batch: int = 512):
+        self.stream = stream
+        self.service_name = service_name
+        self.max_batch = max_batch
+        self.dropped = 0
+        self._queue: queue.Queue[Span | None] = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self) -> None:
+        """Write the queued spans and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        if self.stream not in (sys.stdout, sys.stderr):
+            self.stream.close()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            stopping = item is None
+            batch = [] if stopping else [item]
+            while not stopping and len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch: list[Span]) -> None:
+        line = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                    "scopeSpans": [{"scope": {"name": "backend"}, "spans": [span.to_otlp() for span in batch]}],
+                }
+            ]
+        }
+        try:
+            self.stream.write(json.dumps(line) + "\n")
+            self.stream.flush()
+        except (OSError, ValueError):
+            self.dropped += len(batch)
+
+
+class Tracer:
+    """
+    Creates spans and hands finished, sampled ones to the exporter.
+
+    Attributes:
+        exporter: Receives finished spans; None disables tracing
+        sample_percent: Percent of new traces recorded; continued traces keep the caller's decision
+    """
+
+    def __init__(self):
+        """Initialize a disabled tracer."""
+        self.exporter: InMemoryExporter | BatchExporter | None = None
+        self.sample_percent = 100.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def configure(self, exporter, sample_percent: float = 100) -> None:
+        """Start exporting spans, shutting down any previous exporter first."""
+        self.shutdown()
+        self.exporter = exporter
+        self.sample_percent = sample_percent
+
+    def shutdown(self) -> None:
+        """Flush and stop the exporter; the tracer is disabled afterwards."""
+        exporter, self.exporter = self.exporter, None
+        if exporter is not None:
+            exporter.shutdown()
+
+    def start_span(
+        self, name: str, kind: str = INTERNAL, attributes: dict | None = None, traceparent: str | None = None
+    ) -> Span:
+        """
+        Start a span as a child of the current span, of a remote parent, or as a new trace.
+
+        The span is not made current; `span()` does that for code running inside it.
+        """
+        parent = current_span.get()
+        remote = parse_traceparent(traceparent) if parent is None else None
+        if parent is not None:
+            span = Span(name, kind, parent.trace_id, parent.span_id, parent.sampled)
+        elif remote is not None:
+            span = Span(name, kind, remote[0], remote[1], remote[2])
+        else:
+            trace_id = random.getrandbits(128).to_bytes(16, "big").hex()
+            span = Span(name, kind, trace_id, None, random.random() * 100 < self.sample_percent)
+
+        if attributes and span.sampled:
+            span.attributes.update(attributes)
+        return span
+
+    def end_span(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        exporter = self.exporter
+        if span.sampled and exporter is not None:
+            exporter.submit(span)
+
+    @contextmanager
+    def span(
+        self, name: str, kind: str = INTERNAL, attributes: dict | None = None, traceparent: str | None = None
+    ) -> Iterator[Span | None]:
+        """
+        Run the block inside a new current span, recording any exception it raises.
+
+        Yields None while tracing is disabled.
+        """
+        if self.exporter is None:
+            yield None
+            return
+
+        span = self.start_span(name, kind, attributes, traceparent)
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            current_span.reset(token)
+            self.end_span(span)
+
+
+# Shared tracer for the application; configured from the lifespan settings
+tracer = Tracer()
+
+
+def create_exporter(kind: str, path: str, service_name: str = "wellness-backend") -> BatchExporter | None:
+    """Exporter for the TRACE_EXPORTER setting; None when tracing is off."""
+    if kind not in TRACE_EXPORTERS:
+        raise ValueError(f"Unsupported trace exporter: {kind}")
+    if kind == "console":
+        return BatchExporter(sys.stderr, service_name)
+    if kind == "file":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return BatchExporter(open(path, "a", encoding="utf-8"), service_name)
+    return None
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Record a client span for every SQL statement executed within a trace.
+
+    Statements outside a trace (e.g. schema setup at startup) are not recorded.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_statement(conn, cursor, statement, parameters, context, executemany):
+        parent = current_span.get()
+        if parent is None or not parent.sampled or not tracer.enabled:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        span = tracer.start_span(
+            f"db {operation}",
+            kind=CLIENT,
+            attributes={
+                "db.system": engine.dialect.name,
+                "db.operation.name": operation,
+                "db.query.text": statement[:MAX_STATEMENT_LENGTH],
+            },
+        )
+        if executemany:
+            span.set_attribute("db.operation.batch.size", len(parameters))
+        conn.info.setdefault("trace_spans", []).append(span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end_statement(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            span = spans.pop()
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.response.returned_rows", cursor.rowcount)
+            tracer.end_span(span)
+
+    @event.listens_for(engine, "handle_error")
+    def _fail_statement(exception_context):
+        connection = exception_context.connection
+        spans = connection.info.get("trace_spans") if connection is not None else None
+        if spans:
+            span = spans.pop()
+            span.record_exception(exception_context.original_exception)
+            tracer.end_span(span)
+
+
+def _traced_endpoint(endpoint: Callable) -> Callable:
+    name = f"handler {endpoint.__name__}"
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def traced_async(*args, **kwargs):
+            with tracer.span(name):
+                return await endpoint(*args, **kwargs)
+
+        return traced_async
+
+    @functools.wraps(endpoint)
+    def traced(*args, **kwargs):
+        with tracer.span(name):
+            return endpoint(*args, **kwargs)
+
+    return traced
+
+
+class TracedRoute(APIRoute):
+    """
+    Route whose endpoint body runs in its own span.
+
+    The request span minus the handler span is the time FastAPI spent validating the
+    request, resolving dependencies and serializing the response.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _traced_endpoint(endpoint), **kwargs)
@@ -0,0 +1,148 @@
+"""
+Write-behind buffering for task completion toggles.
+
+Users often tap a task's checkbox several times in a row. Instead of one UPDATE
+transaction per tap, the latest completion state of each task is kept in memory,
+acknowledged immediately and written to the database in one batched transaction
+on a short interval (and on shutdown). Readers consult the buffer first, so they
+always see the newest state held by this process.
+"""
+
+import threading
+from collections.abc import Callable, Iterable
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .database import ArchivedTask, DailyTask
+from .stats import adjust_daily_stats
+
+# Task ids per UPDATE, well below SQLite's bound parameter limit
+UPDATE_CHUNK_SIZE = 500
+
+
+class CompletionBuffer:
+    """
+    Coalesces completion updates per task until the next flush.
+
+    Entries move to an in-flight map while a flush is running so reads never fall
+    into the gap between taking them out of the buffer and committing them.
+    """
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: dict[int, bool] = {}
+        self._flushing: dict[int, bool] = {}
+        self.recorded = 0
+        self.flushed = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def record(self, task_id: int, completed: bool) -> None:
+        """Remember the latest completion state for a task, replacing any earlier one."""
+        with self._lock:
+            self._pending[task_id] = completed
+            self.recorded += 1
+
+    def get(self, task_id: int) -> bool | None:
+        """Buffered completion state for a task, or None if nothing is buffered."""
+        with self._lock:
+            if task_id in self._pending:
+                return self._pending[task_id]
+            return self._flushing.get(task_id)
+
+    def overlay(self, tasks: Iterable[DailyTask]) -> dict[int, bool]:
+        """Buffered completion states for the given tasks, keyed by task id."""
+        with self._lock:
+            if not self._pending and not self._flushing:
+                return {}
+            states = {}
+            for task in tasks:
+                task_id = int(task.id)
+                if task_id in self._pending:
+                    states[task_id] = self._pending[task_id]
+                elif task_id in self._flushing:
+                    states[task_id] = self._flushing[task_id]
+            return states
+
+    def discard(self, task_ids: Iterable[int]) -> None:
+        """Forget buffered states, e.g. for tasks that were deleted."""
+        with self._lock:
+            for task_id in task_ids:
+                self._pending.pop(task_id, None)
+
+    def flush(self, session_factory: Callable[[], Session]) -> int:
+        """
+        Write all buffered states to the database in a single transaction.
+
+        Args:
+            session_factory: Callable returning a new database session.
+
+        Returns:
+            int: Number of task rows written.
+        """
+        with self._flush_lock:
+            return self._flush(session_factory)
+
+    def _flush(self, session_factory: Callable[[], Session]) -> int:
+        with self._lock:
+            if not self._pending:
+                return 0
+            self._flushing, self._pending = self._pending, {}
+            batch = dict(self._flushing)
+
+        try:
+            with session_factory() as db:
+                self._write(db, batch)
+                db.commit()
+        except Exception:
+            # Keep the states for the next flush unless a newer toggle replaced them
+            with self._lock:
+                for task_id, completed in batch.items():
+                    self._pending.setdefault(task_id, completed)
+            raise
+        finally:
+            with self._lock:
+                self._flushing = {}
+
+        with self._lock:
+            self.flushed += len(batch)
+        return len(batch)
+
+    @staticmethod
+    def _write(db: Session, batch: dict[int, bool]) -> None:
+        """
+        Store the states with one conditional UPDATE per state, table and chunk.
+
+        Only rows whose stored state actually flips are returned, so the rollups move
+        exactly once per change even if another writer toggled the same task meanwhile.
+        """
+        deltas: dict[tuple[str, str], int] = {}
+        for completed in (True, False):
+            task_ids = [task_id for task_id, state in batch.items() if state is completed]
+            for start in range(0, len(task_ids), UPDATE_CHUNK_SIZE):
+                chunk = task_ids[start : start + UPDATE_CHUNK_SIZE]
+                # A toggled task may have been archived meanwhile, so both tables are updated
+                for table in (DailyTask, ArchivedTask):
+                    flipped = db.execute(
+                        update(table)
+                        .where(table.id.in_(chunk), table.completed.is_distinct_from(completed))
+                        .values(completed=completed)
+                        .returning(table.user_id, table.created_date)
+                        .execution_options(synchronize_session=False)
+                    ).all()
+                    for row in flipped:
+                        key = (row.user_id, row.created_date)
+                        deltas[key] = deltas.get(key, 0) + (1 if completed else -1)
+
+        for (user_id, day), completed_delta in deltas.items():
+            adjust_daily_stats(db, user_id, day, completed_delta=completed_delta)
+
+    def stats(self) -> dict:
+        """Buffer size and how many toggles were coalesced into writes."""
+        with self._lock:
+            return {"pending": len(self._pending), "recorded": self.recorded, "flushed": self.flushed}
@@ -0,0 +1,201 @@
+"""
+Benchmark `/api/celebrate-task` against the local fake Gemini API.
+
+Starts the fake (see benchmarks/fake_gemini.py) in a background thread and the backend
+as a uvicorn subprocess pointed at it through GEMINI_BASE_URL, with a throwaway SQLite
+database and rate limits high enough not to interfere. Each scenario reconfigures the
+fake, drives concurrent celebrations through the API and reports latency percentiles,
+throughput, how many answers were fallbacks and what the circuit breaker did.
+
+Scenarios run in order against the same backend, so the breaker carries its state from
+one to the next just as it would in production; they are separated by a pause of
+GEMINI_BREAKER_OPEN_SECONDS so each starts with the breaker ready to probe again.
+
+Usage:
+    uv run python -m benchmarks.celebrate
+    uv run python -m benchmarks.celebrate --requests 400 --concurrency 32 healthy flaky outage
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import uvicorn
+
+from benchmarks.fake_gemini import FakeConfig, FakeGemini, create_app
+
+SCENARIOS = {
+    "healthy": FakeConfig(latency="lognormal", latency_ms=150, latency_sigma=0.4),
+    "slow": FakeConfig(latency="lognormal", latency_ms=1500, latency_sigma=0.6),
+    "flaky": FakeConfig(latency="uniform", latency_ms=200, error_rate=0.3, error_status=500),
+    "rate_limited": FakeConfig(latency="fixed", latency_ms=50, error_rate=0.8, error_status=429),
+    "outage": FakeConfig(latency="fixed", latency_ms=20, error_rate=1.0, error_status=503),
+    "hang": FakeConfig(latency="fixed", latency_ms=60_000),
+}
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _wait_until_up(url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def start_fake(port: int) -> uvicorn.Server:
+    """Serve the fake Gemini API from a daemon thread."""
+    server = uvicorn.Server(uvicorn.Config(create_app(FakeGemini()), host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    _wait_until_up(f"http://127.0.0.1:{port}/_fake/stats")
+    return server
+
+
+def start_backend(port: int, fake_port: int, database_path: Path, args: argparse.Namespace) -> subprocess.Popen:
+    """Run the API in its own process, configured to call the fake."""
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database_path}",
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "DEBUG": "false",
+        "CORS_ORIGINS": '["http://localhost:5173"]',
+        "SECRET_KEY": "benchmark",
+        "DEFAULT_USER_ID": "benchmark",
+        "GEMINI_API_KEY": "benchmark",
+        "GEMINI_BASE_URL": f"http://127.0.0.1:{fake_port}",
+        "GEMINI_TIMEOUT_MS": str(args.timeout_ms),
+        "GEMINI_SLOW_CALL_MS": str(args.slow_call_ms),
+        "GEMINI_BREAKER_OPEN_SECONDS": str(args.open_seconds),
+        "CELEBRATE_RATE_PER_MINUTE": "1000000",
+        "CELEBRATE_BURST": "1000000",
+    }
+    command = [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"]
+    process = subprocess.Popen(command, cwd=ROOT, env=env)
+    _wait_until_up(f"http://127.0.0.1:{port}/api/ai/status")
+    return process
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+async def run_scenario(api: str, fake: str, name: str, args: argparse.Namespace) -> dict:
+    """Configure the fake, send the celebrations and summarize what came back."""
+    config = SCENARIOS[name]
+    async with httpx.AsyncClient(timeout=120.0) as client:
+        await client.put(f"{fake}/_fake/config", json=config.model_dump())
+        breaker_before = (await client.get(f"{api}/api/ai/status")).json()["circuit_breaker"]
+        fake_before = (await client.get(f"{fake}/_fake/stats")).json()
+
+        latencies: list[float] = []
+        answers = {"model": 0, "fallback": 0, "error": 0}
+        queue = iter(range(args.requests))
+
+        async def worker():
+            for index in queue:
+                started = time.perf_counter()
+                response = await client.post(
+                    f"{api}/api/celebrate-task", json={"completed_task": f"Benchmark task {index}"}
+                )
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    answers["error"] += 1
+                elif response.json()["message"] == config.text:
+                    answers["model"] += 1
+                else:
+                    answers["fallback"] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+        breaker = (await client.get(f"{api}/api/ai/status")).json()["circuit_breaker"]
+        fake_after = (await client.get(f"{fake}/_fake/stats")).json()
+
+    return {
+        "scenario": name,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "rps": len(latencies) / elapsed,
+        "fallback_pct": 100 * answers["fallback"] / len(latencies),
+        "errors": answers["error"],
+        "upstream_calls": fake_after.get("requests", 0) - fake_before.get("requests", 0),
+        "opened": breaker["times_opened"] - breaker_before["times_opened"],
+        "rejected": breaker["rejected"] - breaker_before["rejected"],
+        "breaker": breaker["state"],
+    }
+
+
+def print_report(results: list[dict]) -> None:
+    header = (
+        f"{'scenario':<13}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'mean ms':>9}{'req/s':>9}"
+        f"{'fallback':>10}{'errors':>8}{'upstream':>10}{'opened':>8}{'rejected':>10}  breaker"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<13}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['mean_ms']:>9.1f}"
+            f"{r['rps']:>9.1f}{r['fallback_pct']:>9.1f}%{r['errors']:>8}{r['upstream_calls']:>10}"
+            f"{r['opened']:>8}{r['rejected']:>10}  {r['breaker']}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the selected scenarios and print a summary table."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.celebrate", description=__doc__.splitlines()[1])
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--requests", type=int, default=200, help="celebrations per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--port", type=int, default=8765, help="port for the backend under test")
+    parser.add_argument("--fake-port", type=int, default=8766, help="port for the fake Gemini API")
+    parser.add_argument("--timeout-ms", type=int, default=5000, help="GEMINI_TIMEOUT_MS for the backend")
+    parser.add_argument("--slow-call-ms", type=int, default=2000, help="GEMINI_SLOW_CALL_MS for the backend")
+    parser.add_argument("--open-seconds", type=int, default=5, help="GEMINI_BREAKER_OPEN_SECONDS for the backend")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    args.scenarios = args.scenarios or list(SCENARIOS)
+
+    api = f"http://127.0.0.1:{args.port}"
+    fake = f"http://127.0.0.1:{args.fake_port}"
+    fake_server = start_fake(args.fake_port)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = start_backend(args.port, args.fake_port, Path(tmp) / "benchmark.db", args)
+        try:
+            # The Gemini SDK is imported on the first celebration; keep that out of the numbers
+            httpx.post(f"{api}/api/celebrate-task", json={"completed_task": "Warm up"}, timeout=30.0)
+            results = []
+            for index, name in enumerate(args.scenarios):
+                if index:
+                    time.sleep(args.open_seconds)
+                results.append(asyncio.run(run_scenario(api, fake, name, args)))
+                print(f"✓ {name}", file=sys.stderr)
+        finally:
+            backend.terminate()
+            backend.wait(timeout=10)
+            fake_server.should_exit = True
+
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Local stand-in for the Gemini `generateContent` API with fault injection.
+
+Point the backend at it with `GEMINI_BASE_URL=http://127.0.0.1:8090` to see how
+celebrations behave when the model is slow, flaky or rate limited, without network
+access or an API key. The active scenario can be changed at runtime through
+`PUT /_fake/config`, so one server can serve several benchmark phases.
+
+Usage:
+    uv run python -m benchmarks.fake_gemini --port 8090 --latency lognormal --latency-ms 300 --error-rate 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+from collections import Counter
+from typing import Literal
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+# Google API error statuses for the HTTP codes the fake can return
+ERROR_STATUSES = {
+    400: "INVALID_ARGUMENT",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    503: "UNAVAILABLE",
+    504: "DEADLINE_EXCEEDED",
+}
+
+
+class FakeConfig(BaseModel):
+    """Fault injection settings for the fake Gemini API."""
+
+    # Response latency: "fixed" always waits latency_ms; "uniform" waits 0-2x latency_ms;
+    # "lognormal" has median latency_ms and a long tail controlled by latency_sigma
+    latency: Literal["fixed", "uniform", "lognormal"] = "fixed"
+    latency_ms: float = Field(default=100, ge=0)
+    latency_sigma: float = Field(default=0.8, ge=0)
+    # Share of requests answered with error_status instead of a completion
+    error_rate: float = Field(default=0, ge=0, le=1)
+    error_status: int = 503
+    # Streaming responses are split into this many chunks, chunk_delay_ms apart
+    stream_chunks: int = Field(default=4, ge=1)
+    chunk_delay_ms: float = Field(default=50, ge=0)
+    text: str = "What a cozy win! You're glowing like a golden autumn afternoon. 🍂✨"
+    seed: int | None = None
+
+
+class FakeGemini:
+    """Holds the active config, the random source and request counters."""
+
+    def __init__(self, config: FakeConfig | None = None):
+        self.lock = threading.Lock()
+        self.counts: Counter[str] = Counter()
+        self.configure(config or FakeConfig())
+
+    def configure(self, config: FakeConfig) -> None:
+        with self.lock:
+            self.config = config
+            self.rng = random.Random(config.seed)
+
+    def draw(self) -> tuple[float, bool]:
+        """Latency in seconds and whether the request should fail."""
+        with self.lock:
+            config = self.config
+            if config.latency == "uniform":
+                latency_ms = self.rng.uniform(0, 2 * config.latency_ms)
+            elif config.latency == "lognormal" and config.latency_ms > 0:
+                latency_ms = self.rng.lognormvariate(math.log(config.latency_ms), config.latency_sigma)
+            else:
+                latency_ms = config.latency_ms
+            return latency_ms / 1000, self.rng.random() < config.error_rate
+
+
+def _completion(text: str) -> dict:
+    return {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP", "index": 0}],
+        "usageMetadata": {"promptTokenCount": 12, "candidatesTokenCount": len(text.split()), "totalTokenCount": 40},
+        "modelVersion": "fake-gemini",
+    }
+
+
+def _error(status_code: int) -> JSONResponse:
+    status = ERROR_STATUSES.get(status_code, "UNKNOWN")
+    body = {"error": {"code": status_code, "message": f"Injected {status} error", "status": status}}
+    return JSONResponse(body, status_code=status_code)
+
+
+def create_app(fake: FakeGemini | None = None) -> FastAPI:
+    """Build the fake API around a FakeGemini state object."""
+    fake = fake or FakeGemini()
+    app = FastAPI(title="Fake Gemini API")
+    app.state.fake = fake
+
+    @app.post("/{api_version}/models/{model_action}")
+    async def generate(api_version: str, model_action: str, request: Request):
+        _model, _, action = model_action.partition(":")
+        await request.body()
+
+        latency, fail = fake.draw()
+        with fake.lock:
+            fake.counts["requests"] += 1
+            fake.counts["errors" if fail else "completions"] += 1
+            config = fake.config
+
+        await asyncio.sleep(latency)
+        if fail:
+            return _error(config.error_status)
+
+        if action == "streamGenerateContent":
+            words = config.text.split(" ")
+            size = math.ceil(len(words) / config.stream_chunks)
+            chunks = [" ".join(words[i : i + size]) + " " for i in range(0, len(words), size)]
+
+            async def stream():
+                for index, chunk in enumerate(chunks):
+                    if index:
+                        await asyncio.sleep(config.chunk_delay_ms / 1000)
+                    yield f"data: {json.dumps(_completion(chunk))}\r\n\r\n"
+
+            return StreamingResponse(stream(), media_type="text/event-stream")
+
+        return _completion(config.text)
+
+    @app.get("/_fake/config")
+    def get_config() -> FakeConfig:
+        return fake.config
+
+    @app.put("/_fake/config")
+    def put_config(config: FakeConfig) -> FakeConfig:
+        fake.configure(config)
+        return config
+
+    @app.get("/_fake/stats")
+    def get_stats():
+        with fake.lock:
+            return dict(fake.counts)
+
+    return app
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the fake Gemini API from the command line."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fake_gemini", description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    for name, field in FakeConfig.model_fields.items():
+        if name != "text":
+            kind = type(field.default) if field.default is not None else int
+            parser.add_argument(f"--{name.replace('_', '-')}", type=kind, default=field.default)
+    args = parser.parse_args(argv)
+
+    config = FakeConfig(**{name: getattr(args, name) for name in FakeConfig.model_fields if hasattr(args, name)})
+    uvicorn.run(create_app(FakeGemini(config)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -51,7 +51,7 @@ const SyncModal = ({ show, onClose, userId }) => {
     setError("");
 
     try {
-  const response = await fetch(config.API_ENDPOINTS.SYNC_VALIDATE_CODE, {
+  const response = await fetch(config.API_ENDPOINTS.SYNC_MERGE, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -68,7 +68,7 @@ const SyncModal = ({ show, onClose, userId }) => {
 
       const data = await response.json();
 
-      // Update localStorage with the new UUID
+      // Tasks created on this device now belong to the synced UUID; switch to it
       localStorage.setItem('validatedUserId', data.uuid);
 
       // Close modal and reload the page to use the new UUID
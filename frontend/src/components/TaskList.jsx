@@ -1,16 +1,54 @@
-import { useState } from "react";
+import { useEffect, useState } from "react";
 import TaskItem from "./TaskItem";
 import SyncModal from "./SyncModal";
+import config from "../config/config";
+
+const SUGGESTION_DELAY_MS = 150;
 
 const TaskList = ({ tasks, onToggleComplete, onDelete, onAddTask, userId }) => {
   const [showInput, setShowInput] = useState(false);
   const [newTaskText, setNewTaskText] = useState("");
   const [showSyncModal, setShowSyncModal] = useState(false);
+  const [suggestions, setSuggestions] = useState([]);
+  const [recurrence, setRecurrence] = useState("once");
+
+  // Suggest earlier tasks once the user pauses typing
+  useEffect(() => {
+    const prefix = newTaskText.trim();
+    if (!showInput || prefix.length < 2) {
+      setSuggestions([]);
+      return;
+    }
+
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const response = await fetch(
+          `${config.API_ENDPOINTS.TASK_SUGGESTIONS}?user_id=${userId}&q=${encodeURIComponent(prefix)}`,
+          { signal: controller.signal },
+        );
+        if (response.ok) {
+          const data = await response.json();
+          setSuggestions(data.suggestions || []);
+        }
+      } catch (err) {
+        if (err.name !== "AbortError") {
+          console.error("Error loading task suggestions:", err);
+        }
+      }
+    }, SUGGESTION_DELAY_MS);
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [newTaskText, showInput, userId]);
 
   const handleSaveTask = () => {
     if (newTaskText.trim()) {
-      onAddTask(newTaskText.trim());
+      onAddTask(newTaskText.trim(), recurrence);
       setNewTaskText("");
+      setRecurrence("once");
       setShowInput(false);
     }
   };
@@ -66,8 +104,25 @@ const TaskList = ({ tasks, onToggleComplete, onDelete, onAddTask, userId }) => {
             onChange={(e) => setNewTaskText(e.target.value)}
             onKeyDown={handleKeyPress}
             placeholder="What would you like to accomplish?"
+            list="task-suggestions"
             autoFocus
           />
+          <datalist id="task-suggestions">
+            {suggestions.map((suggestion) => (
+              <option key={suggestion} value={suggestion} />
+            ))}
+          </datalist>
+          <select
+            className="task-recurrence"
+            value={recurrence}
+            onChange={(e) => setRecurrence(e.target.value)}
+            title="Repeat this task"
+          >
+            <option value="once">Just this day</option>
+            <option value="daily">Every day</option>
+            <option value="weekdays">Every weekday</option>
+            <option value="weekly">Every week on this day</option>
+          </select>
           <div className="task-input-buttons">
             <button className="btn save-task-btn" onClick={handleSaveTask}>
               Save Task
@@ -4,9 +4,12 @@ const config = {
     AFFIRMATIONS: "/api/affirmations",
     DAILY_DATA: "/api/daily-data",
     TASKS: "/api/tasks",
+    TASK_SUGGESTIONS: "/api/tasks/suggestions",
+    TEMPLATES: "/api/templates",
     CELEBRATE_TASK: "/api/celebrate-task",
     SYNC_GENERATE_CODE: "/api/sync/generate-code",
     SYNC_VALIDATE_CODE: "/api/sync/validate-code",
+    SYNC_MERGE: "/api/sync/merge",
   },
 };
 
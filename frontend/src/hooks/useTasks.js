@@ -90,6 +90,44 @@ const useTasks = (userId) => {
     [userId],
   );
 
+  const addTemplate = useCallback(
+    async (taskText, recurrence, date) => {
+      setError(null);
+
+      try {
+        const dateStr = formatDate(date);
+        // Backend weekdays start on Monday (0), JavaScript's on Sunday
+        const weekday = (date.getDay() + 6) % 7;
+        const response = await fetch(
+          `${config.API_ENDPOINTS.TEMPLATES}?date=${dateStr}`,
+          {
+            method: "POST",
+            headers: {
+              "Content-Type": "application/json",
+            },
+            body: JSON.stringify({
+              task_text: taskText.trim(),
+              recurrence: recurrence,
+              weekday: recurrence === "weekly" ? weekday : null,
+              user_id: userId,
+            }),
+          },
+        );
+
+        if (!response.ok) {
+          throw new Error("Failed to create recurring task");
+        }
+
+        return await response.json();
+      } catch (err) {
+        setError(err.message);
+        console.error("Error creating recurring task:", err);
+        throw err;
+      }
+    },
+    [userId],
+  );
+
   const toggleTask = useCallback(async (taskId, completed) => {
     setError(null);
 
@@ -162,6 +200,7 @@ const useTasks = (userId) => {
     error,
     loadDailyData,
     addTask,
+    addTemplate,
     toggleTask,
     deleteTask,
   };
@@ -13,8 +13,15 @@ const DailyPlanner = ({ userId, onBackToLanding }) => {
   const [celebrationMessage, setCelebrationMessage] = useState("");
 
   const { affirmation, refreshAffirmation } = useAffirmations();
-  const { tasks, loading, loadDailyData, addTask, toggleTask, deleteTask } =
-    useTasks(userId);
+  const {
+    tasks,
+    loading,
+    loadDailyData,
+    addTask,
+    addTemplate,
+    toggleTask,
+    deleteTask,
+  } = useTasks(userId);
 
   useEffect(() => {
     if (userId) {
@@ -34,9 +41,15 @@ const DailyPlanner = ({ userId, onBackToLanding }) => {
     setCurrentDate(newDate);
   };
 
-  const handleAddTask = async (taskText) => {
+  const handleAddTask = async (taskText, recurrence = "once") => {
     try {
-      await addTask(taskText, currentDate);
+      if (recurrence === "once") {
+        await addTask(taskText, currentDate);
+      } else {
+        // The backend creates today's instance along with the template
+        await addTemplate(taskText, recurrence, currentDate);
+        await loadDailyData(currentDate);
+      }
     } catch (error) {
       console.error("Failed to add task:", error);
     }
@@ -68,6 +81,7 @@ const DailyPlanner = ({ userId, onBackToLanding }) => {
           body: JSON.stringify({
             completed_task:
               taskToToggle?.text || taskToToggle?.description || "Unknown task",
+            user_id: userId,
           }),
         });
 
@@ -6,16 +6,20 @@ Usage:
     python run_tests.py unit         # Run only unit tests
     python run_tests.py integration  # Run only integration tests
     python run_tests.py --coverage   # Run tests with coverage report
+    python run_tests.py --parallel   # Spread tests across all CPU cores
 """
 
 import subprocess
 import sys
 
 
-def run_tests(test_type=None, coverage=False):
-    """Run tests with optional filtering and coverage."""
+def run_tests(test_type=None, coverage=False, parallel=False):
+    """Run tests with optional filtering, coverage and parallelism."""
     cmd = ["uv", "run", "python", "-m", "pytest"]
 
+    if parallel:
+        cmd.extend(["-n", "auto"])
+
     if coverage:
         cmd.extend(["--cov=backend", "--cov-report=html", "--cov-report=term"])
 
@@ -33,6 +37,7 @@ def run_tests(test_type=None, coverage=False):
 if __name__ == "__main__":
     test_type = None
     coverage = False
+    parallel = "--parallel" in sys.argv
 
     if len(sys.argv) > 1:
         if sys.argv[1] in ["unit", "integration"]:
@@ -43,5 +48,5 @@ if __name__ == "__main__":
     if "--coverage" in sys.argv:
         coverage = True
 
-    result = run_tests(test_type, coverage)
+    result = run_tests(test_type, coverage, parallel)
     sys.exit(result.returncode)
@@ -0,0 +1,150 @@
+# /// script
+# requires-python = ">=3.12"
+# dependencies = ["pillow>=11.3", "brotli>=1.1"]
+# ///
+"""
+Optimize the built frontend for serving by nginx.
+
+Run after `npm run build`. Next to each file in `frontend/dist` it writes:
+
+- `<image>.webp` and `<image>.avif`: PNG and JPEG images re-encoded, and scaled down
+  when larger than needed; nginx picks one by the request's `Accept` header.
+- `<file>.gz` and `<file>.br`: gzip and brotli copies of text assets at maximum
+  compression, served as-is by `gzip_static`/`brotli_static` instead of compressing
+  every response again.
+
+A variant is only kept when it is smaller than what it replaces. Vite names bundle
+files by content hash, so they can be cached for good; see nginx.conf.
+
+Usage:
+    uv run scripts/build_assets.py
+    uv run scripts/build_assets.py --dist frontend/dist --max-size 512
+"""
+
+import argparse
+import gzip
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import brotli
+from PIL import Image, features
+
+ROOT = Path(__file__).resolve().parent.parent
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+TEXT_SUFFIXES = {".html", ".js", ".mjs", ".css", ".svg", ".json", ".txt", ".xml", ".webmanifest"}
+GENERATED_SUFFIXES = {".gz", ".br", ".webp", ".avif"}
+
+# Smaller files fit in a packet either way and aren't worth a second lookup
+MIN_COMPRESS_BYTES = 1024
+
+
+def _write_if_smaller(path: Path, data: bytes, original_size: int) -> int:
+    """Write a variant when it saves bytes, removing a stale one otherwise; returns the bytes served."""
+    if len(data) < original_size:
+        path.write_bytes(data)
+        return len(data)
+    path.unlink(missing_ok=True)
+    return original_size
+
+
+def encode_image(path: Path, max_size: int, quality: int, formats: list[str]) -> dict[str, int]:
+    """Write scaled-down WebP/AVIF variants of an image; returns the size of each."""
+    original_size = path.stat().st_size
+    with Image.open(path) as image:
+        image.load()
+        if max(image.size) > max_size:
+            image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        if image.mode not in ("RGB", "RGBA"):
+            transparent = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if transparent else "RGB")
+
+        sizes = {}
+        for fmt in formats:
+            variant = path.with_name(f"{path.name}.{fmt}")
+            sizes[fmt] = _write_if_smaller(variant, _encode(image, fmt, quality), original_size)
+        return sizes
+
+
+def _encode(image: Image.Image, fmt: str, quality: int) -> bytes:
+    buffer = BytesIO()
+    if fmt == "webp":
+        image.save(buffer, "WEBP", quality=quality, method=6)
+    else:
+        image.save(buffer, "AVIF", quality=quality, speed=4)
+    return buffer.getvalue()
+
+
+def compress_text(path: Path) -> dict[str, int]:
+    """Write gzip and brotli copies of a text asset; returns the size of each."""
+    data = path.read_bytes()
+    # mtime=0 keeps rebuilds of unchanged files byte-identical
+    compressed = {
+        "gz": gzip.compress(data, compresslevel=9, mtime=0),
+        "br": brotli.compress(data, quality=11, mode=brotli.MODE_TEXT),
+    }
+    return {
+        suffix: _write_if_smaller(path.with_name(f"{path.name}.{suffix}"), payload, len(data))
+        for suffix, payload in compressed.items()
+    }
+
+
+def _kilobytes(size: int) -> str:
+    return f"{size / 1024:.1f} KB"
+
+
+def build(dist: Path, max_size: int, quality: int) -> list[tuple[str, int, int]]:
+    """Process every asset under `dist`; returns (path, original bytes, best variant bytes) rows."""
+    formats = ["webp"] + (["avif"] if features.check("avif") else [])
+    if "avif" not in formats:
+        print("Pillow was built without AVIF support; writing WebP only", file=sys.stderr)
+
+    rows = []
+    for path in sorted(p for p in dist.rglob("*") if p.is_file()):
+        suffix = path.suffix.lower()
+        if suffix in GENERATED_SUFFIXES:
+            continue
+
+        size = path.stat().st_size
+        if suffix in IMAGE_SUFFIXES:
+            variants = encode_image(path, max_size, quality, formats)
+        elif suffix in TEXT_SUFFIXES and size >= MIN_COMPRESS_BYTES:
+            variants = compress_text(path)
+        else:
+            continue
+        rows.append((str(path.relative_to(dist)), size, min(variants.values(), default=size)))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Optimize the built assets and print how many bytes each one saves."""
+    parser = argparse.ArgumentParser(prog="scripts/build_assets.py", description=__doc__.splitlines()[1])
+    parser.add_argument("--dist", type=Path, default=ROOT / "frontend" / "dist", help="Vite build output")
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=256,
+        help="longest side of image variants in pixels; the app shows its images at icon size (default: 256)",
+    )
+    parser.add_argument("--quality", type=int, default=80, help="WebP/AVIF quality, 0-100 (default: 80)")
+    args = parser.parse_args(argv)
+
+    if not (args.dist / "index.html").is_file():
+        parser.error(f"{args.dist} has no index.html; run `npm run build` in frontend/ first")
+
+    rows = build(args.dist, args.max_size, args.quality)
+
+    width = max((len(name) for name, _, _ in rows), default=4)
+    print(f"{'file':<{width}}{'original':>12}{'served':>12}{'saved':>8}")
+    for name, original, served in rows:
+        print(
+            f"{name:<{width}}{_kilobytes(original):>12}{_kilobytes(served):>12}{100 - 100 * served / original:>7.0f}%"
+        )
+    total, best = sum(row[1] for row in rows), sum(row[2] for row in rows)
+    if total:
+        print(f"{'total':<{width}}{_kilobytes(total):>12}{_kilobytes(best):>12}{100 - 100 * best / total:>7.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,67 @@
 """
 Pytest configuration and shared fixtures for the test suite.
+
+Each test process (one per pytest-xdist worker) gets its own in-memory database,
+created once with `init_db`. Every test runs inside a transaction on a single
+connection that is rolled back afterwards; sessions opened by the test or the app
+join it through savepoints, so their commits are undone too. Tests therefore share
+no state and no files and can run in parallel: `pytest -n auto`.
 """
 
-import os
 import uuid
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from backend.database import Base, User, get_db
-from backend.main import app
+from backend.database import SessionLocal, User, init_db
+from backend.main import affirmation_sampler, app, daily_data_cache
 
 
 @pytest.fixture(scope="session")
-def test_env():
-    """Clean up test database after all tests."""
-
-    yield
-
-    # Clean up test database file with retry logic
-    for attempt in range(3):
-        try:
-            if os.path.exists("test.db"):
-                os.remove("test.db")
-                print("✓ Test database cleaned up successfully")
-                break
-        except PermissionError:
-            if attempt < 2:
-                import time
-
-                time.sleep(0.1)
-                continue
-            else:
-                print("Test database cleanup skipped (file locked)")
-        except Exception as e:
-            print(f"Test database cleanup failed: {e}")
-            break
+def test_engine():
+    """In-memory database for this test process, with the full schema."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
 
+    # pysqlite starts transactions lazily and can't nest them; let SQLAlchemy emit BEGIN so savepoints work
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
 
-@pytest.fixture(scope="function")
-def test_db():
-    """Create a test database session."""
-    engine = create_engine("sqlite:///./test.db", connect_args={"check_same_thread": False})
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
 
-    # Clean state for each test
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    init_db(engine)
+    yield engine
+    engine.dispose()
 
-    def override_get_db():
-        db = TestingSessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
 
-    app.dependency_overrides[get_db] = override_get_db
+@pytest.fixture(scope="function")
+def test_db(test_engine):
+    """Session factory whose work, like the app's, is rolled back after the test."""
+    connection = test_engine.connect()
+    transaction = connection.begin()
+
+    # The app's sessions (get_db, jobs, buffers) join the test transaction as well
+    app_session_options = dict(SessionLocal.kw)
+    SessionLocal.configure(bind=connection, join_transaction_mode="create_savepoint")
+    TestingSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=connection, join_transaction_mode="create_savepoint"
+    )
+
+    # Affirmations and task lists are cached in memory; start each test from its own database contents
+    affirmation_sampler.invalidate()
+    daily_data_cache.clear()
 
     yield TestingSessionLocal
 
-    # Close engine and clear overrides
-    app.dependency_overrides.clear()
-    Base.metadata.drop_all(bind=engine)
-    engine.dispose()
+    SessionLocal.kw.clear()
+    SessionLocal.configure(**app_session_options)
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture(scope="function")
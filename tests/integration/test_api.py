@@ -43,6 +43,24 @@ class TestAffirmationsAPI:
         assert data["id"] == 0
         assert data["text"] == expected_fallback
 
+    def test_get_affirmation_by_category(self, client, test_db):
+        """Test that the category filter applies to affirmations and daily data."""
+        # Arrange
+        db = test_db()
+        db.add(Affirmation(text="Rest is productive.", category="self-care"))
+        db.add(Affirmation(text="Keep going!", category="motivation"))
+        db.add(Affirmation(text="Never shown.", category="self-care", weight=0))
+        db.commit()
+        db.close()
+
+        # Act
+        responses = [client.get("/api/affirmations?category=self-care").json() for _ in range(10)]
+        categories = client.get("/api/affirmations/categories").json()
+
+        # Assert
+        assert {response["text"] for response in responses} == {"Rest is productive."}
+        assert categories["categories"] == ["motivation", "self-care"]
+
 
 @pytest.mark.integration
 class TestTasksAPI:
@@ -117,6 +135,42 @@ class TestTasksAPI:
         data = response.json()
         assert data["completed"] is True
 
+    def test_update_task_write_behind(self, client, test_db, test_user):
+        """Test that buffered toggles are visible immediately and written on flush."""
+        # Arrange
+        from unittest.mock import patch
+
+        from backend.write_behind import CompletionBuffer
+
+        user_id = test_user
+        db = test_db()
+        task = DailyTask(task_text="Test task", created_date="2024-01-01", user_id=user_id, completed=False)
+        db.add(task)
+        db.commit()
+        task_id = task.id
+        db.close()
+        buffer = CompletionBuffer()
+
+        # Act
+        with patch("backend.main.completion_buffer", buffer):
+            for completed in (True, False, True):
+                client.put(f"/api/tasks/{task_id}", json={"completed": completed, "user_id": user_id})
+            daily_data = client.get(f"/api/daily-data?date=2024-01-01&user_id={user_id}").json()
+
+            db = test_db()
+            stored_before_flush = db.get(DailyTask, task_id).completed
+            db.close()
+
+            buffer.flush(test_db)
+
+        # Assert
+        db = test_db()
+        stored_after_flush = db.get(DailyTask, task_id).completed
+        db.close()
+        assert daily_data["tasks"][0]["completed"] is True
+        assert stored_before_flush is False
+        assert stored_after_flush is True
+
     def test_update_task_not_found(self, client, test_user):
         """Test updating non-existent task."""
         # Arrange
@@ -193,6 +247,384 @@ class TestTasksAPI:
         assert any(task["description"] == "Task 1" for task in data["tasks"])
         assert any(task["description"] == "Task 2" for task in data["tasks"])
 
+    def test_daily_data_cache_follows_task_writes(self, client, test_user):
+        """Test that repeated reads are cached and creating, toggling or deleting a task refreshes them."""
+        # Arrange
+        from backend.main import daily_data_cache
+
+        url = f"/api/daily-data?date=2024-01-01&user_id={test_user}"
+        task_id = client.post("/api/tasks?date=2024-01-01", json={"task_text": "First", "user_id": test_user}).json()[
+            "id"
+        ]
+
+        # Act
+        first = client.get(url).json()["tasks"]
+        cached = client.get(url).json()["tasks"]
+        client.put(f"/api/tasks/{task_id}", json={"completed": True, "user_id": test_user})
+        toggled = client.get(url).json()["tasks"]
+        client.delete(f"/api/tasks/{task_id}?user_id={test_user}")
+        deleted = client.get(url).json()["tasks"]
+
+        # Assert
+        assert first == cached == [{"id": task_id, "description": "First", "completed": False}]
+        assert toggled == [{"id": task_id, "description": "First", "completed": True}]
+        assert deleted == []
+        assert daily_data_cache.stats()["hits"] == 1
+
+
+@pytest.mark.integration
+class TestTemplatesAPI:
+    """Test recurring task templates API."""
+
+    def test_template_tasks_appear_on_matching_days(self, client, test_user):
+        """Test that viewing a day creates its recurring tasks once, and deleted ones stay deleted."""
+        # Arrange: 2024-01-01 is a Monday
+        create_response = client.post(
+            "/api/templates?date=2024-01-01",
+            json={"task_text": "Morning stretch", "recurrence": "weekdays", "user_id": test_user},
+        )
+
+        # Act
+        monday = client.get(f"/api/daily-data?date=2024-01-01&user_id={test_user}").json()
+        tuesday = client.get(f"/api/daily-data?date=2024-01-02&user_id={test_user}").json()
+        saturday = client.get(f"/api/daily-data?date=2024-01-06&user_id={test_user}").json()
+        client.delete(f"/api/tasks/{tuesday['tasks'][0]['id']}?user_id={test_user}")
+        tuesday_again = client.get(f"/api/daily-data?date=2024-01-02&user_id={test_user}").json()
+
+        # Assert
+        assert create_response.status_code == 200
+        assert create_response.json()["recurrence"] == "weekdays"
+        assert [task["description"] for task in monday["tasks"]] == ["Morning stretch"]
+        assert len(tuesday["tasks"]) == 1
+        assert saturday["tasks"] == []
+        assert tuesday_again["tasks"] == []
+
+    def test_list_and_delete_templates(self, client, test_user):
+        """Test listing and deleting templates."""
+        # Arrange
+        template_id = client.post(
+            "/api/templates",
+            json={"task_text": "Call family", "recurrence": "weekly", "weekday": 6, "user_id": test_user},
+        ).json()["id"]
+
+        # Act
+        listed = client.get(f"/api/templates?user_id={test_user}").json()
+        delete_response = client.delete(f"/api/templates/{template_id}?user_id={test_user}")
+        listed_after = client.get(f"/api/templates?user_id={test_user}").json()
+
+        # Assert
+        assert [template["weekday"] for template in listed["templates"]] == [6]
+        assert delete_response.status_code == 200
+        assert listed_after["templates"] == []
+
+    def test_weekly_template_requires_weekday(self, client, test_user):
+        """Test that weekly templates without a weekday are rejected."""
+        # Act
+        response = client.post(
+            "/api/templates", json={"task_text": "Call family", "recurrence": "weekly", "user_id": test_user}
+        )
+
+        # Assert
+        assert response.status_code == 422
+
+
+@pytest.mark.integration
+class TestCarryOverAPI:
+    """Test carrying unfinished tasks over to another day."""
+
+    def test_carry_over_moves_incomplete_tasks(self, client, test_db, test_user):
+        """Test that incomplete tasks move to today and are returned."""
+        # Arrange
+        from datetime import date, timedelta
+
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        db = test_db()
+        db.add(DailyTask(task_text="Finished", created_date=yesterday, user_id=test_user, completed=True))
+        db.add(DailyTask(task_text="Unfinished", created_date=yesterday, user_id=test_user, completed=False))
+        db.commit()
+        db.close()
+
+        # Act
+        response = client.post("/api/tasks/carry-over", json={"user_id": test_user, "from_date": yesterday})
+        old_day = client.get(f"/api/daily-data?date={yesterday}&user_id={test_user}").json()
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["date"] == date.today().isoformat()
+        assert data["carried"] == 1
+        assert [task["description"] for task in data["tasks"]] == ["Unfinished"]
+        assert [task["description"] for task in old_day["tasks"]] == ["Finished"]
+
+    def test_carry_over_invalid_dates(self, client, test_user):
+        """Test that malformed or identical dates are rejected."""
+        # Act
+        malformed = client.post("/api/tasks/carry-over", json={"user_id": test_user, "from_date": "yesterday"})
+        same_day = client.post(
+            "/api/tasks/carry-over", json={"user_id": test_user, "from_date": "2024-01-01", "to_date": "2024-01-01"}
+        )
+
+        # Assert
+        assert malformed.status_code == 400
+        assert same_day.status_code == 400
+
+
+@pytest.mark.integration
+class TestArchivedTasksAPI:
+    """Test that archived tasks stay reachable through the task API."""
+
+    def test_archived_tasks_are_read_and_updated(self, client, test_db, test_user):
+        """Test daily data and updates for a date whose tasks were archived."""
+        # Arrange
+        from backend.archive import archive_old_tasks
+
+        old_date = "2000-01-01"
+        db = test_db()
+        task = DailyTask(task_text="Old task", created_date=old_date, user_id=test_user, completed=False)
+        db.add(task)
+        db.commit()
+        task_id = task.id
+        db.close()
+        archive_old_tasks(test_db, horizon_days=90)
+
+        # Act
+        update_response = client.put(f"/api/tasks/{task_id}", json={"completed": True, "user_id": test_user})
+        daily_data = client.get(f"/api/daily-data?date={old_date}&user_id={test_user}").json()
+
+        # Assert
+        assert update_response.status_code == 200
+        assert daily_data["tasks"] == [{"id": task_id, "description": "Old task", "completed": True}]
+        db = test_db()
+        assert db.query(DailyTask).count() == 0
+        db.close()
+
+    def test_carry_over_from_archived_day_is_rejected(self, client, test_db, test_user):
+        """Test that carry-over refuses days whose tasks were archived."""
+        # Arrange
+        from backend.archive import archive_old_tasks
+
+        db = test_db()
+        db.add(DailyTask(task_text="Old task", created_date="2000-01-01", user_id=test_user))
+        db.commit()
+        db.close()
+        archive_old_tasks(test_db, horizon_days=90)
+
+        # Act
+        archived_day = client.post("/api/tasks/carry-over", json={"user_id": test_user, "from_date": "2000-01-01"})
+        empty_old_day = client.post("/api/tasks/carry-over", json={"user_id": test_user, "from_date": "2000-01-02"})
+
+        # Assert
+        assert archived_day.status_code == 400
+        assert empty_old_day.status_code == 200
+
+
+@pytest.mark.integration
+class TestExportAPI:
+    """Test task history export API."""
+
+    def _add_history(self, test_db, user_id):
+        db = test_db()
+        db.add(DailyTask(task_text="Later task", created_date="2024-01-02", user_id=user_id, completed=True))
+        db.add(DailyTask(task_text="Earlier task", created_date="2024-01-01", user_id=user_id, completed=False))
+        db.add(DailyTask(task_text="Someone else", created_date="2024-01-01", user_id="other-user", completed=False))
+        db.commit()
+        db.close()
+
+    def test_export_ndjson(self, client, test_db, test_user):
+        """Test exporting a user's tasks as NDJSON, oldest first."""
+        # Arrange
+        import json
+
+        self._add_history(test_db, test_user)
+
+        # Act
+        response = client.get(f"/api/export?user_id={test_user}")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [record["description"] for record in records] == ["Earlier task", "Later task"]
+        assert records[1]["date"] == "2024-01-02"
+        assert records[1]["completed"] is True
+
+    def test_export_csv(self, client, test_db, test_user):
+        """Test exporting a user's tasks as CSV with a header row."""
+        # Arrange
+        self._add_history(test_db, test_user)
+
+        # Act
+        response = client.get(f"/api/export?user_id={test_user}&format=csv")
+
+        # Assert
+        assert response.status_code == 200
+        lines = response.text.splitlines()
+        assert lines[0] == "id,date,description,completed"
+        assert len(lines) == 3
+        assert "attachment" in response.headers["content-disposition"]
+
+    def test_export_invalid_format(self, client, test_user):
+        """Test that unknown export formats are rejected."""
+        # Act
+        response = client.get(f"/api/export?user_id={test_user}&format=xml")
+
+        # Assert
+        assert response.status_code == 400
+
+
+@pytest.mark.integration
+class TestSearchAPI:
+    """Test task history search API."""
+
+    def test_search_tasks(self, client, test_db, test_user):
+        """Test searching a user's tasks across dates."""
+        # Arrange
+        for day in ("2024-01-01", "2024-02-01"):
+            client.post(f"/api/tasks?date={day}", json={"task_text": "Yoga class", "user_id": test_user})
+        client.post("/api/tasks?date=2024-02-01", json={"task_text": "Buy groceries", "user_id": test_user})
+
+        # Act
+        response = client.get(f"/api/tasks/search?user_id={test_user}&q=yoga&page_size=1")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["has_more"] is True
+        assert data["results"][0]["description"] == "Yoga class"
+        assert data["results"][0]["date"] == "2024-02-01"
+
+    def test_search_requires_query(self, client, test_user):
+        """Test that empty queries and oversized pages are rejected."""
+        # Act
+        empty_response = client.get(f"/api/tasks/search?user_id={test_user}&q=%20")
+        large_page_response = client.get(f"/api/tasks/search?user_id={test_user}&q=yoga&page_size=500")
+
+        # Assert
+        assert empty_response.status_code == 400
+        assert large_page_response.status_code == 400
+
+
+@pytest.mark.integration
+class TestSuggestionsAPI:
+    """Test task text autocomplete API."""
+
+    def test_suggestions_include_earlier_and_new_tasks(self, client, test_db, test_user):
+        """Test that suggestions come from history and follow newly created tasks."""
+        # Arrange
+        db = test_db()
+        db.add(DailyTask(task_text="Drink water", created_date="2024-01-01", user_id=test_user))
+        db.commit()
+        db.close()
+
+        # Act
+        first = client.get(f"/api/tasks/suggestions?user_id={test_user}&q=dr").json()
+        client.post("/api/tasks?date=2024-01-02", json={"task_text": "Draw a sketch", "user_id": test_user})
+        second = client.get(f"/api/tasks/suggestions?user_id={test_user}&q=dr").json()
+
+        # Assert
+        assert first["suggestions"] == ["Drink water"]
+        assert second["suggestions"] == ["Draw a sketch", "Drink water"]
+
+    def test_suggestion_round_trip_keeps_text(self, client, test_db, test_user):
+        """Test that a suggestion posted back as a new task is stored like the original."""
+        # Arrange
+        client.post("/api/tasks?date=2024-01-01", json={"task_text": "Tea & toast", "user_id": test_user})
+
+        # Act
+        suggestion = client.get(f"/api/tasks/suggestions?user_id={test_user}&q=tea %26").json()["suggestions"][0]
+        client.post("/api/tasks?date=2024-01-02", json={"task_text": suggestion, "user_id": test_user})
+
+        # Assert
+        assert suggestion == "Tea & toast"
+        db = test_db()
+        stored = [task.task_text for task in db.query(DailyTask).order_by(DailyTask.id).all()]
+        db.close()
+        assert stored == ["Tea &amp; toast", "Tea &amp; toast"]
+
+    def test_suggestions_invalid_user(self, client):
+        """Test that unknown users are rejected."""
+        # Act
+        response = client.get("/api/tasks/suggestions?user_id=unknown&q=dr")
+
+        # Assert
+        assert response.status_code == 401
+
+
+@pytest.mark.integration
+class TestStatsAPI:
+    """Test task statistics API."""
+
+    def test_stats_follow_task_changes(self, client, test_user):
+        """Test that creating, completing and deleting tasks keeps the rollup in sync."""
+        # Arrange
+        from datetime import date, timedelta
+
+        # Streaks only look back a year, so use recent days
+        day = (date.today() - timedelta(days=1)).isoformat()
+        next_day = date.today().isoformat()
+        task_ids = [
+            client.post(f"/api/tasks?date={day}", json={"task_text": f"Task {i}", "user_id": test_user}).json()["id"]
+            for i in range(3)
+        ]
+        client.put(f"/api/tasks/{task_ids[0]}", json={"completed": True, "user_id": test_user})
+        client.put(f"/api/tasks/{task_ids[1]}", json={"completed": True, "user_id": test_user})
+        client.put(f"/api/tasks/{task_ids[1]}", json={"completed": True, "user_id": test_user})
+        client.delete(f"/api/tasks/{task_ids[0]}?user_id={test_user}")
+
+        # Act
+        response = client.get(f"/api/stats?user_id={test_user}&start_date={day}&end_date={next_day}")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["days"] == [
+            {"date": day, "total_tasks": 2, "completed_tasks": 1},
+            {"date": next_day, "total_tasks": 0, "completed_tasks": 0},
+        ]
+        assert data["completion_rate"] == 0.5
+        assert data["longest_streak"] == 1
+
+    def test_stats_toggle_with_stale_read_counts_once(self, client, test_user, monkeypatch):
+        """Test that a toggle whose read raced another toggle doesn't move the rollup twice."""
+        # Arrange
+        from types import SimpleNamespace
+
+        task_id = client.post("/api/tasks?date=2024-01-01", json={"task_text": "Task", "user_id": test_user}).json()[
+            "id"
+        ]
+        client.put(f"/api/tasks/{task_id}", json={"completed": True, "user_id": test_user})
+        stale = SimpleNamespace(id=task_id, task_text="Task", created_date="2024-01-01", completed=False)
+        monkeypatch.setattr("backend.main.find_task", lambda db, task_id, user_id: stale)
+
+        # Act
+        response = client.put(f"/api/tasks/{task_id}", json={"completed": True, "user_id": test_user})
+        stats = client.get(f"/api/stats?user_id={test_user}&start_date=2024-01-01&end_date=2024-01-01").json()
+
+        # Assert
+        assert response.status_code == 200
+        assert stats["days"] == [{"date": "2024-01-01", "total_tasks": 1, "completed_tasks": 1}]
+
+    def test_stats_defaults_to_last_30_days(self, client, test_user):
+        """Test the default date range."""
+        # Act
+        response = client.get(f"/api/stats?user_id={test_user}")
+
+        # Assert
+        assert response.status_code == 200
+        assert len(response.json()["days"]) == 30
+
+    def test_stats_invalid_range(self, client, test_user):
+        """Test that malformed, reversed and oversized ranges are rejected."""
+        # Act
+        responses = [
+            client.get(f"/api/stats?user_id={test_user}&start_date=01-01-2024"),
+            client.get(f"/api/stats?user_id={test_user}&start_date=2024-02-01&end_date=2024-01-01"),
+            client.get(f"/api/stats?user_id={test_user}&start_date=2020-01-01&end_date=2024-01-01"),
+        ]
+
+        # Assert
+        assert [response.status_code for response in responses] == [400, 400, 400]
+
 
 @pytest.mark.integration
 class TestCelebrateTaskAPI:
@@ -208,7 +640,8 @@ class TestCelebrateTaskAPI:
         request_data = {"completed_task": completed_task}
 
         # Act
-        with patch("backend.main.task_ai") as mock_task_ai:
+        with patch("backend.main.get_task_ai") as mock_get_task_ai:
+            mock_task_ai = mock_get_task_ai.return_value
             mock_task_ai.celebrate_task_completion.return_value = expected_message
             response = client.post("/api/celebrate-task", json=request_data)
 
@@ -218,6 +651,29 @@ class TestCelebrateTaskAPI:
         assert data["message"] == expected_message
         mock_task_ai.celebrate_task_completion.assert_called_once_with(completed_task)
 
+    def test_celebrate_task_rate_limited_per_user(self, client, test_user):
+        """Test that a user over the limit gets the fallback without an AI call."""
+        # Arrange
+        from unittest.mock import patch
+
+        from backend.rate_limit import TokenBucketLimiter
+
+        request_data = {"completed_task": "Drink water", "user_id": test_user}
+        expected_fallback = "Beautiful work completing 'Drink water'! You're taking such good care of yourself. 🌟"
+
+        # Act
+        with (
+            patch("backend.main.celebrate_limiter", TokenBucketLimiter(rate=0.01, capacity=1)),
+            patch("backend.task_ai.TaskAI.celebrate_task_completion", return_value="AI message") as mock_celebrate,
+        ):
+            first = client.post("/api/celebrate-task", json=request_data)
+            second = client.post("/api/celebrate-task", json=request_data)
+
+        # Assert
+        assert first.json()["message"] == "AI message"
+        assert second.json()["message"] == expected_fallback
+        mock_celebrate.assert_called_once()
+
     def test_celebrate_task_missing_task(self, client):
         """Test task celebration with missing completed_task."""
         # Arrange
@@ -231,6 +687,216 @@ class TestCelebrateTaskAPI:
         assert "completed_task is required" in response.json()["detail"]
 
 
+@pytest.mark.integration
+class TestAIStatusAPI:
+    """Test AI monitoring API."""
+
+    def test_ai_status(self, client):
+        """Test that the circuit breaker state is reported."""
+        # Act
+        response = client.get("/api/ai/status")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["circuit_breaker"]["state"] in ("closed", "open", "half_open")
+
+
+@pytest.mark.integration
+class TestHealthAPI:
+    """Test health check endpoints."""
+
+    def test_live(self, client):
+        """Test the liveness check always answers."""
+        # Act
+        response = client.get("/health/live")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    def test_ready(self, client):
+        """Test the readiness check reports its checks."""
+        # Act
+        response = client.get("/health/ready")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert data["checks"]["database"]["status"] == "ok"
+        assert data["checks"]["threadpool"]["limit"] > 0
+        assert "state" in data["checks"]["gemini"]
+
+    def test_not_ready_when_database_fails(self, client, monkeypatch):
+        """Test the readiness check answers 503 when the database doesn't respond."""
+        # Arrange
+        from backend.main import database_probe
+
+        async def timeout():
+            return {"status": "timeout", "timeout_ms": 1000}
+
+        monkeypatch.setattr(database_probe, "check", timeout)
+
+        # Act
+        response = client.get("/health/ready")
+
+        # Assert
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+
+
+@pytest.mark.integration
+class TestRequestIdAPI:
+    """Test request correlation ids."""
+
+    def test_request_id_echoed(self, client):
+        """Test a caller's request id is returned, and one is generated otherwise."""
+        # Act
+        echoed = client.get("/", headers={"X-Request-ID": "trace-42"})
+        generated = client.get("/", headers={"X-Request-ID": "not a valid id"})
+
+        # Assert
+        assert echoed.headers["X-Request-ID"] == "trace-42"
+        assert generated.headers["X-Request-ID"] not in ("", "not a valid id")
+
+
+@pytest.mark.integration
+class TestTracingMiddleware:
+    """Test the request tracing middleware."""
+
+    def _traced_client(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from backend.main import trace_request
+
+        traced_app = FastAPI()
+        traced_app.middleware("http")(trace_request)
+        traced_app.get("/ping")(lambda: {"ok": True})
+        return TestClient(traced_app)
+
+    def test_requests_pass_through_without_spans(self):
+        """Test requests succeed while tracing is shut down or samples nothing."""
+        # Arrange
+        from backend.tracing import InMemoryExporter, tracer
+
+        client = self._traced_client()
+        exporter = InMemoryExporter()
+
+        # Act
+        disabled = client.get("/ping")
+        tracer.configure(exporter, sample_percent=0)
+        try:
+            unsampled = client.get("/ping")
+        finally:
+            tracer.shutdown()
+
+        # Assert
+        assert (disabled.status_code, unsampled.status_code) == (200, 200)
+        assert exporter.spans == []
+
+    def test_sampled_requests_are_named_by_route(self):
+        """Test sampled requests record their route and status."""
+        # Arrange
+        from backend.tracing import InMemoryExporter, tracer
+
+        client = self._traced_client()
+        exporter = InMemoryExporter()
+
+        # Act
+        tracer.configure(exporter)
+        try:
+            client.get("/ping")
+        finally:
+            tracer.shutdown()
+
+        # Assert
+        (span,) = exporter.spans
+        assert span.name == "GET /ping"
+        assert span.attributes["http.response.status_code"] == 200
+
+
+@pytest.mark.integration
+class TestProfilingMiddleware:
+    """Test the request profiling middleware."""
+
+    def test_profile_write_failure_keeps_response(self, tmp_path, monkeypatch, caplog):
+        """Test a profile that can't be written is logged and the response still returned."""
+        # Arrange
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from backend.main import profile_request
+        from backend.profiling import RequestProfiler
+
+        not_a_directory = tmp_path / "profiles"
+        not_a_directory.write_text("")
+        monkeypatch.setattr(
+            "backend.main.request_profiler", RequestProfiler(str(not_a_directory / "nested"), sample_percent=100)
+        )
+        profiled_app = FastAPI()
+        profiled_app.middleware("http")(profile_request)
+        profiled_app.get("/ping")(lambda: {"ok": True})
+
+        # Act
+        response = TestClient(profiled_app).get("/ping")
+
+        # Assert
+        assert response.status_code == 200
+        assert "Request profile could not be written" in caplog.text
+
+
+@pytest.mark.integration
+class TestSyncAPI:
+    """Test syncing devices with sync codes."""
+
+    def _other_device(self, test_db):
+        from backend.database import User
+
+        db = test_db()
+        db.add(User(user_id="other-device"))
+        db.add(DailyTask(task_text="Phone task", created_date="2024-01-01", user_id="other-device", completed=True))
+        db.add(DailyTask(task_text="Shared", created_date="2024-01-01", user_id="other-device", completed=True))
+        db.commit()
+        db.close()
+        return "other-device"
+
+    def test_merge_moves_tasks_to_synced_user(self, client, test_db, test_user):
+        """Test that merging returns the code's UUID and moves the current device's tasks to it."""
+        # Arrange
+        other = self._other_device(test_db)
+        db = test_db()
+        db.add(DailyTask(task_text="Shared", created_date="2024-01-01", user_id=test_user, completed=False))
+        db.commit()
+        db.close()
+        sync_code = client.post("/api/sync/generate-code", json={"uuid": test_user}).json()["sync_code"]
+
+        # Act
+        response = client.post("/api/sync/merge", json={"sync_code": sync_code, "current_uuid": other})
+        day = client.get(f"/api/daily-data?date=2024-01-01&user_id={test_user}").json()
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"uuid": test_user, "tasks_moved": 1, "duplicates_merged": 1, "templates_moved": 0}
+        assert sorted((task["description"], task["completed"]) for task in day["tasks"]) == [
+            ("Phone task", True),
+            ("Shared", True),
+        ]
+
+    def test_merge_rejects_invalid_and_own_codes(self, client, test_user):
+        """Test that unknown codes and the device's own code are rejected."""
+        # Arrange
+        sync_code = client.post("/api/sync/generate-code", json={"uuid": test_user}).json()["sync_code"]
+
+        # Act
+        invalid = client.post("/api/sync/merge", json={"sync_code": "nope", "current_uuid": "other-device"})
+        own = client.post("/api/sync/merge", json={"sync_code": sync_code, "current_uuid": test_user})
+
+        # Assert
+        assert invalid.status_code == 400
+        assert own.status_code == 400
+
+
 @pytest.mark.integration
 class TestRootAPI:
     """Test root API endpoint."""
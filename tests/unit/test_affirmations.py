@@ -0,0 +1,167 @@
+"""Unit tests for weighted affirmation sampling."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from backend.affirmations import (
+    AffirmationSampler,
+    AliasTable,
+    affirmations_version,
+    import_affirmations,
+    load_affirmations,
+    read_affirmation_rows,
+)
+from backend.database import Affirmation
+
+
+@pytest.mark.unit
+class TestAffirmations:
+    """Test weighted sampling and bulk import of affirmations."""
+
+    def test_alias_table_follows_weights(self):
+        """Test draws follow the weights."""
+        # Arrange
+        table = AliasTable([1, 0, 3])
+        rng = random.Random(42)
+
+        # Act
+        counts = Counter(table.sample(rng) for _ in range(20000))
+
+        # Assert
+        assert counts[1] == 0
+        assert counts[2] / counts[0] == pytest.approx(3, rel=0.1)
+
+    def test_alias_table_rejects_zero_weights(self):
+        """Test a table needs a positive weight."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            AliasTable([0, 0])
+
+    def test_sampler_filters_by_category(self):
+        """Test draws can be limited to a category."""
+        # Arrange
+        sampler = AffirmationSampler()
+        rows = [(1, "Rest well", "Self-care", 1.0), (2, "Keep going", "motivation", 1.0), (3, "Breathe", None, 1.0)]
+
+        # Act
+        picks = {sampler.sample(lambda: rows, "SELF-CARE") for _ in range(50)}
+        everything = {sampler.sample(lambda: rows) for _ in range(200)}
+
+        # Assert
+        assert picks == {(1, "Rest well")}
+        assert everything == {(1, "Rest well"), (2, "Keep going"), (3, "Breathe")}
+        assert sampler.sample(lambda: rows, "unknown") is None
+        assert sampler.categories(lambda: rows) == ["motivation", "self-care"]
+
+    def test_sampler_rebuilds_only_when_stale_or_invalidated(self):
+        """Test tables are reused until they expire or are invalidated."""
+        # Arrange
+        sampler = AffirmationSampler(ttl=300)
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return [(1, "Rest well", None, 1.0)]
+
+        # Act
+        sampler.sample(loader)
+        sampler.sample(loader)
+        sampler.invalidate()
+        sampler.sample(loader)
+
+        # Assert
+        assert len(loads) == 2
+
+    def test_sampler_rebuilds_when_data_version_changes(self):
+        """Test tables are rebuilt when the data version changes."""
+        # Arrange
+        sampler = AffirmationSampler(ttl=300, check_interval=0)
+        rows, version = [(1, "Rest well", None, 1.0)], (1, 1)
+
+        # Act
+        before = sampler.sample(lambda: rows, version=lambda: version)
+        unchanged = sampler.sample(lambda: [(2, "Keep going", None, 1.0)], version=lambda: version)
+        rows, version = [(2, "Keep going", None, 1.0)], (1, 2)
+        after = sampler.sample(lambda: rows, version=lambda: version)
+
+        # Assert
+        assert before == unchanged == (1, "Rest well")
+        assert after == (2, "Keep going")
+
+    def test_imported_affirmations_are_drawn_without_invalidating(self, test_db):
+        """Test affirmations imported elsewhere are picked up without invalidating."""
+        # Arrange: tables built before another process imports affirmations
+        sampler = AffirmationSampler(ttl=300, check_interval=0)
+        with test_db() as db:
+            db.add(Affirmation(text="Rest well", category="rest"))
+            db.commit()
+            sampler.sample(lambda: load_affirmations(db), version=lambda: affirmations_version(db))
+
+        # Act
+        with test_db() as db:
+            import_affirmations(db, [{"text": "Keep going", "category": "motivation"}])
+        with test_db() as db:
+            categories = sampler.categories(lambda: load_affirmations(db), version=lambda: affirmations_version(db))
+
+        # Assert
+        assert categories == ["motivation", "rest"]
+
+    def test_load_affirmations_skips_zero_weights(self, test_db):
+        """Test affirmations weighted zero are never loaded."""
+        # Arrange
+        with test_db() as db:
+            db.add_all([Affirmation(text="Shown", weight=2.0), Affirmation(text="Hidden", weight=0)])
+            db.add(Affirmation(text="Default weight"))
+            db.commit()
+
+        # Act
+        with test_db() as db:
+            rows = load_affirmations(db)
+
+        # Assert
+        assert sorted((text, weight) for _, text, _, weight in rows) == [("Default weight", 1.0), ("Shown", 2.0)]
+
+    def test_import_normalizes_and_skips_duplicates(self, test_db):
+        """Test imports normalize text and skip duplicates and invalid rows."""
+        # Arrange
+        import io
+
+        with test_db() as db:
+            db.add(Affirmation(text="Already here."))
+            db.commit()
+
+        stream = io.StringIO(
+            "text,category,weight\n"
+            "  You   are enough. ,Self-Care,2\n"
+            "you are enough.,,\n"
+            "already here.,,\n"
+            ",motivation,1\n"
+            "Bad weight,,heavy\n"
+            "Keep going.,,\n"
+        )
+
+        # Act
+        with test_db() as db:
+            report = import_affirmations(db, read_affirmation_rows(stream, "csv"), batch_size=1)
+
+        # Assert
+        with test_db() as db:
+            stored = {a.text: (a.category, a.weight) for a in db.query(Affirmation).all()}
+        assert (report["read"], report["inserted"], report["duplicates"], report["invalid"]) == (6, 2, 2, 2)
+        assert stored["You are enough."] == ("self-care", 2.0)
+        assert stored["Keep going."] == (None, 1.0)
+
+    def test_read_ndjson_rows_flags_bad_lines(self):
+        """Test unparseable NDJSON lines are reported as None."""
+        # Arrange
+        import io
+
+        stream = io.StringIO('{"text": "One", "weight": 0}\n\nnot json\n[1, 2]\n')
+
+        # Act
+        rows = list(read_affirmation_rows(stream, "ndjson"))
+
+        # Assert
+        assert rows == [{"text": "One", "weight": 0}, None, None]
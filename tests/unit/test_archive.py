@@ -0,0 +1,97 @@
+"""Unit tests for archival of old daily tasks."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from backend.archive import archive_cutoff, archive_old_tasks, find_task, get_tasks_for_date, may_be_archived
+from backend.database import ArchivedTask, DailyTask
+
+
+def _days_ago(days):
+    return (date.today() - timedelta(days=days)).isoformat()
+
+
+def _add_tasks(test_db, task_dates, user_id="user"):
+    with test_db() as db:
+        tasks = [DailyTask(task_text=f"Task {i}", created_date=d, user_id=user_id) for i, d in enumerate(task_dates)]
+        db.add_all(tasks)
+        db.commit()
+        return [task.id for task in tasks]
+
+
+@pytest.mark.unit
+class TestArchive:
+    """Test moving old tasks to the archive and reading them back."""
+
+    def test_archive_cutoff(self):
+        """Test the cutoff is the first date kept in the hot table."""
+        # Act & Assert
+        assert archive_cutoff(30, today=date(2024, 3, 31)) == "2024-03-01"
+
+    def test_archive_moves_only_old_tasks_in_chunks(self, test_db):
+        """Test only tasks past the horizon move, chunk by chunk."""
+        # Arrange
+        old_ids = _add_tasks(test_db, [_days_ago(100)] * 5)
+        recent_ids = _add_tasks(test_db, [_days_ago(1)] * 2)
+
+        # Act
+        moved = archive_old_tasks(test_db, horizon_days=90, chunk_size=2)
+
+        # Assert
+        with test_db() as db:
+            hot_ids = [task.id for task in db.query(DailyTask).all()]
+            archived = db.query(ArchivedTask).all()
+        assert moved == 5
+        assert sorted(hot_ids) == recent_ids
+        assert sorted(task.id for task in archived) == old_ids
+        assert all(task.archived_at is not None for task in archived)
+
+    def test_archive_respects_chunk_budget(self, test_db):
+        """Test a run stops after its chunk budget."""
+        # Arrange
+        _add_tasks(test_db, [_days_ago(100)] * 5)
+
+        # Act
+        moved = archive_old_tasks(test_db, horizon_days=90, chunk_size=2, max_chunks=1)
+
+        # Assert
+        assert moved == 2
+
+    def test_reads_are_transparent_after_archival(self, test_db):
+        """Test archived tasks are still found by date and by id."""
+        # Arrange
+        old_date = _days_ago(100)
+        task_ids = _add_tasks(test_db, [old_date, old_date])
+        archive_old_tasks(test_db, horizon_days=90)
+
+        # Act
+        with test_db() as db:
+            tasks = get_tasks_for_date(db, "user", old_date)
+            found = find_task(db, task_ids[0], "user")
+            not_owned = find_task(db, task_ids[0], "someone-else")
+
+        # Assert
+        assert [task.id for task in tasks] == task_ids
+        assert isinstance(found, ArchivedTask)
+        assert not_owned is None
+
+    def test_archive_reads_follow_the_data_not_the_horizon(self, test_db):
+        """Test archive reads depend on what was archived, not the current horizon."""
+        # Arrange: archive under a short horizon, as if the setting was later raised or turned off
+        older, newer = _days_ago(100), _days_ago(40)
+        task_ids = _add_tasks(test_db, [older, newer])
+        archive_old_tasks(test_db, horizon_days=30)
+
+        # Act
+        with test_db() as db:
+            tasks = [get_tasks_for_date(db, "user", task_date) for task_date in (older, newer)]
+            checks = [
+                may_be_archived(db, "user", newer),
+                may_be_archived(db, "user", _days_ago(1)),
+                may_be_archived(db, "someone-else", older),
+            ]
+
+        # Assert
+        assert [[task.id for task in day] for day in tasks] == [[task_ids[0]], [task_ids[1]]]
+        assert checks == [True, False, False]
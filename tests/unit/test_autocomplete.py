@@ -0,0 +1,95 @@
+"""Unit tests for the task text prefix index."""
+
+import pytest
+
+from backend.autocomplete import PrefixIndex, load_task_history
+from backend.database import DailyTask
+
+
+def _loader(rows):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return rows
+
+    return load, calls
+
+
+@pytest.mark.unit
+class TestPrefixIndex:
+    """Test task text suggestions."""
+
+    def test_suggestions_match_prefix_ranked_by_frequency_then_recency(self):
+        """Test suggestions match the prefix, most used and then most recent first."""
+        # Arrange
+        index = PrefixIndex()
+        loader, _ = _loader(
+            [
+                ("Read a book", 2, "2024-01-01"),
+                ("Read the news", 2, "2024-02-01"),
+                ("Reach out to mom", 5, "2023-12-01"),
+                ("Walk the dog", 9, "2024-02-01"),
+            ]
+        )
+
+        # Act
+        suggestions = index.suggest("user", "rea", 5, loader)
+
+        # Assert
+        assert suggestions == ["Reach out to mom", "Read the news", "Read a book"]
+
+    def test_index_is_loaded_once_and_updated_on_record(self):
+        """Test a user's history is loaded once and kept current by new tasks."""
+        # Arrange
+        index = PrefixIndex()
+        loader, calls = _loader([("Stretch", 1, "2024-01-01")])
+        index.suggest("user", "st", 5, loader)
+
+        # Act
+        index.record("user", "Study Spanish", "2024-01-02")
+        index.record("user", "Study Spanish", "2024-01-03")
+        index.record("other", "Stretch more", "2024-01-03")
+        suggestions = index.suggest("user", "ST", 5, loader)
+
+        # Assert
+        assert calls == [1]
+        assert suggestions == ["Study Spanish", "Stretch"]
+        assert "other" not in index
+
+    def test_index_bounds_users_and_entries(self):
+        """Test both the users and the texts per user are bounded."""
+        # Arrange
+        index = PrefixIndex(max_users=2, max_entries_per_user=2)
+        loader, _ = _loader([("Task often", 3, "2024-01-01"), ("Task rarely", 1, "2024-01-01")])
+
+        # Act
+        for user_id in ("a", "b", "c"):
+            index.suggest(user_id, "task", 5, loader)
+        index.record("c", "Task new", "2024-01-02")
+
+        # Assert
+        assert "a" not in index
+        assert index.stats()["users"] == 2
+        assert index.suggest("c", "task", 5, loader) == ["Task often", "Task new"]
+
+    def test_load_task_history_groups_texts(self, test_db):
+        """Test history is grouped by text with counts and last dates."""
+        # Arrange
+        with test_db() as db:
+            db.add_all(
+                [
+                    DailyTask(task_text="Yoga", created_date="2024-01-01", user_id="user"),
+                    DailyTask(task_text="Yoga", created_date="2024-01-03", user_id="user"),
+                    DailyTask(task_text="Swim", created_date="2024-01-02", user_id="user"),
+                    DailyTask(task_text="Run", created_date="2024-01-02", user_id="other"),
+                ]
+            )
+            db.commit()
+
+        # Act
+        with test_db() as db:
+            history = load_task_history(db, "user", max_entries=10)
+
+        # Assert
+        assert history == [("Yoga", 2, "2024-01-03"), ("Swim", 1, "2024-01-02")]
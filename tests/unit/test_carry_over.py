@@ -0,0 +1,142 @@
+"""Unit tests for carrying unfinished tasks over to another day."""
+
+from datetime import date
+
+import pytest
+
+from backend.carry_over import carry_over_tasks, carry_over_yesterday
+from backend.database import DailyStat, DailyTask, TaskTemplate
+from backend.recurring import materialize_day
+from backend.stats import backfill_daily_stats
+
+
+def _add_tasks(test_db, tasks, user_id="user"):
+    with test_db() as db:
+        db.add_all(
+            [
+                DailyTask(task_text=task_text, created_date=task_date, completed=completed, user_id=user_id)
+                for task_text, task_date, completed in tasks
+            ]
+        )
+        db.commit()
+        backfill_daily_stats(db)
+
+
+def _day(test_db, task_date, user_id="user"):
+    with test_db() as db:
+        tasks = db.query(DailyTask).filter_by(user_id=user_id, created_date=task_date).order_by(DailyTask.id).all()
+        stat = db.get(DailyStat, (user_id, task_date))
+        return [task.task_text for task in tasks], stat.total_tasks if stat else 0
+
+
+@pytest.mark.unit
+class TestCarryOver:
+    """Test carrying unfinished tasks over to another day."""
+
+    def test_move_carries_only_incomplete_tasks(self, test_db):
+        """Test moving leaves completed tasks behind and updates the rollups."""
+        # Arrange
+        _add_tasks(
+            test_db,
+            [("Done", "2024-01-01", True), ("Open", "2024-01-01", False), ("Also open", "2024-01-01", False)],
+        )
+        _add_tasks(test_db, [("Open", "2024-01-01", False)], user_id="other")
+
+        # Act
+        with test_db() as db:
+            moved = carry_over_tasks(db, ["user"], "2024-01-01", "2024-01-02", mode="move")
+            db.commit()
+
+        # Assert
+        assert moved == 2
+        assert _day(test_db, "2024-01-01") == (["Done"], 1)
+        assert _day(test_db, "2024-01-02") == (["Open", "Also open"], 2)
+        assert _day(test_db, "2024-01-01", user_id="other") == (["Open"], 1)
+
+    def test_copy_keeps_originals_and_skips_duplicates(self, test_db):
+        """Test copying keeps the originals and doesn't copy twice."""
+        # Arrange
+        _add_tasks(test_db, [("Open", "2024-01-01", False), ("Read", "2024-01-01", False)])
+        _add_tasks(test_db, [("Read", "2024-01-02", False)])
+
+        # Act
+        with test_db() as db:
+            first = carry_over_tasks(db, ["user"], "2024-01-01", "2024-01-02", mode="copy")
+            second = carry_over_tasks(db, ["user"], "2024-01-01", "2024-01-02", mode="copy")
+            db.commit()
+
+        # Assert
+        assert (first, second) == (1, 0)
+        assert _day(test_db, "2024-01-01") == (["Open", "Read"], 2)
+        assert _day(test_db, "2024-01-02") == (["Read", "Open"], 2)
+
+    def test_recurring_tasks_are_not_duplicated(self, test_db):
+        """Test tasks already created by a template aren't carried onto the day."""
+        # Arrange
+        _add_tasks(test_db, [("Stretch", "2024-01-01", False)])
+        with test_db() as db:
+            db.add(TaskTemplate(user_id="user", task_text="Stretch", recurrence="daily", start_date="2024-01-01"))
+            db.commit()
+
+        # Act
+        with test_db() as db:
+            moved = carry_over_tasks(db, ["user"], "2024-01-01", "2024-01-02")
+            db.commit()
+
+        # Assert
+        assert moved == 0
+        assert _day(test_db, "2024-01-02") == (["Stretch"], 1)
+
+    def test_carry_over_yesterday_moves_every_user(self, test_db):
+        """Test the nightly move covers every user and is idempotent."""
+        # Arrange
+        _add_tasks(test_db, [("Open", "2024-01-01", False)])
+        _add_tasks(test_db, [("Open too", "2024-01-01", False)], user_id="other")
+
+        # Act
+        moved = carry_over_yesterday(test_db, today=date(2024, 1, 2))
+        moved_again = carry_over_yesterday(test_db, today=date(2024, 1, 2))
+
+        # Assert
+        assert (moved, moved_again) == (2, 0)
+        assert _day(test_db, "2024-01-02") == (["Open"], 1)
+        assert _day(test_db, "2024-01-02", user_id="other") == (["Open too"], 1)
+
+    def test_carry_over_yesterday_works_in_chunks_within_budget(self, test_db):
+        """Test the nightly move commits in chunks and leaves the rest for the next run."""
+        # Arrange
+        for index in range(5):
+            _add_tasks(test_db, [("Open", "2024-01-01", False)], user_id=f"user-{index}")
+
+        # Act
+        first = carry_over_yesterday(test_db, today=date(2024, 1, 2), chunk_size=2, max_chunks=2)
+        second = carry_over_yesterday(test_db, today=date(2024, 1, 2), chunk_size=2, max_chunks=2)
+
+        # Assert
+        assert (first, second) == (4, 1)
+        for index in range(5):
+            assert _day(test_db, "2024-01-01", user_id=f"user-{index}") == ([], 0)
+            assert _day(test_db, "2024-01-02", user_id=f"user-{index}") == (["Open"], 1)
+
+    def test_recurring_tasks_created_after_nightly_move_are_not_duplicated(self, test_db):
+        """Test a day materialized after the nightly move skips texts already moved there."""
+        # Arrange
+        _add_tasks(test_db, [("Stretch", "2024-01-01", False)])
+        with test_db() as db:
+            db.add_all(
+                [
+                    TaskTemplate(user_id="user", task_text="Stretch", recurrence="daily", start_date="2024-01-02"),
+                    TaskTemplate(user_id="user", task_text="Read", recurrence="daily", start_date="2024-01-02"),
+                ]
+            )
+            db.commit()
+
+        # Act
+        carry_over_yesterday(test_db, today=date(2024, 1, 2))
+        with test_db() as db:
+            created = [template.task_text for template in materialize_day(db, "user", "2024-01-02")]
+            db.commit()
+
+        # Assert
+        assert created == ["Read"]
+        assert _day(test_db, "2024-01-02") == (["Stretch", "Read"], 2)
@@ -7,6 +7,7 @@ import pytest
 from backend.config import Settings, get_env_bool, get_env_int, get_env_str
 
 
+@pytest.mark.unit
 class TestEnvironmentFunctions:
     """Test environment variable helper functions."""
 
@@ -45,6 +46,18 @@ class TestEnvironmentFunctions:
         # Assert
         assert result == expected_result
 
+    def test_get_env_int_default(self):
+        """Test that a default is returned when an optional variable is missing."""
+        # Arrange
+        default_value = 4
+
+        # Act
+        with patch("os.getenv", return_value=None):
+            result = get_env_int("TEST_VAR", default=default_value)
+
+        # Assert
+        assert result == default_value
+
     def test_get_env_int_invalid(self):
         """Test error when integer environment variable is invalid."""
         # Arrange
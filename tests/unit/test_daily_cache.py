@@ -0,0 +1,95 @@
+"""Unit tests for the serialized daily task list cache."""
+
+import pytest
+
+from backend.daily_cache import DailyDataCache
+
+
+@pytest.mark.unit
+class TestDailyDataCache:
+    """Test caching, invalidation and memory bounds."""
+
+    def test_get_returns_stored_payload_and_counts_hits(self):
+        # Arrange
+        cache = DailyDataCache(max_bytes=1000)
+
+        # Act
+        miss = cache.get("user", "2024-01-01")
+        cache.put("user", "2024-01-01", b"[]", cache.version)
+        hit = cache.get("user", "2024-01-01")
+
+        # Assert
+        assert (miss, hit) == (None, b"[]")
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_invalidate_drops_only_the_given_days(self):
+        # Arrange
+        cache = DailyDataCache(max_bytes=1000)
+        for user_id, task_date in [("user", "2024-01-01"), ("user", "2024-01-02"), ("other", "2024-01-01")]:
+            cache.put(user_id, task_date, b"[]", cache.version)
+
+        # Act
+        cache.invalidate("user", ["2024-01-01"])
+
+        # Assert
+        assert cache.get("user", "2024-01-01") is None
+        assert cache.get("user", "2024-01-02") == b"[]"
+        assert cache.get("other", "2024-01-01") == b"[]"
+
+    def test_invalidate_user_drops_all_their_days(self):
+        # Arrange
+        cache = DailyDataCache(max_bytes=1000)
+        cache.put("user", "2024-01-01", b"[]", cache.version)
+        cache.put("user", "2024-01-02", b"[]", cache.version)
+        cache.put("other", "2024-01-01", b"[]", cache.version)
+
+        # Act
+        cache.invalidate_user("user")
+
+        # Assert
+        assert cache.stats()["entries"] == 1
+        assert cache.get("other", "2024-01-01") == b"[]"
+
+    def test_put_after_invalidation_is_dropped(self):
+        # Arrange
+        cache = DailyDataCache(max_bytes=1000)
+        version = cache.version
+
+        # Act
+        cache.invalidate("user", ["2024-01-01"])
+        cache.put("user", "2024-01-01", b"[stale]", version)
+
+        # Assert
+        assert cache.get("user", "2024-01-01") is None
+
+    def test_evicts_least_recently_used_within_budget(self):
+        # Arrange
+        cache = DailyDataCache(max_bytes=100)
+        for day in range(1, 4):
+            cache.put("user", f"2024-01-0{day}", b"x" * 25, cache.version)
+        cache.get("user", "2024-01-01")
+
+        # Act
+        cache.put("user", "2024-01-04", b"x" * 25, cache.version)
+        cache.put("user", "2024-01-05", b"x" * 25, cache.version)
+
+        # Assert
+        assert cache.stats()["bytes"] <= 100
+        assert cache.stats()["evictions"] == 1
+        assert cache.get("user", "2024-01-01") is not None
+        assert cache.get("user", "2024-01-02") is None
+
+    def test_expired_and_disabled_entries_are_not_served(self):
+        # Arrange
+        expired = DailyDataCache(max_bytes=1000, ttl=-1)
+        disabled = DailyDataCache(max_bytes=0)
+
+        # Act
+        for cache in (expired, disabled):
+            cache.put("user", "2024-01-01", b"[]", cache.version)
+
+        # Assert
+        assert expired.get("user", "2024-01-01") is None
+        assert expired.stats()["entries"] == 0
+        assert disabled.get("user", "2024-01-01") is None
@@ -0,0 +1,70 @@
+"""Unit tests for the fake Gemini API used by the benchmarks."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.fake_gemini import FakeConfig, FakeGemini, create_app
+
+
+@pytest.fixture
+def fake_client():
+    """Client for a fake without latency."""
+    return TestClient(create_app(FakeGemini(FakeConfig(latency_ms=0, chunk_delay_ms=0, seed=1))))
+
+
+@pytest.mark.unit
+class TestFakeGemini:
+    """Test the fake Gemini API."""
+
+    def test_generate_content(self, fake_client):
+        """Test a completion comes back in the Gemini response format."""
+        # Act
+        response = fake_client.post("/v1beta/models/gemini-2.0-flash-001:generateContent", json={"contents": []})
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["candidates"][0]["content"]["parts"][0]["text"] == FakeConfig().text
+        assert fake_client.get("/_fake/stats").json() == {"requests": 1, "completions": 1}
+
+    def test_stream_generate_content(self, fake_client):
+        """Test streamed chunks join up to the full text."""
+        # Act
+        response = fake_client.post("/v1beta/models/gemini-2.0-flash-001:streamGenerateContent?alt=sse", json={})
+
+        # Assert
+        events = [json.loads(line[len("data: ") :]) for line in response.text.splitlines() if line.startswith("data:")]
+        assert len(events) == FakeConfig().stream_chunks
+        text = "".join(event["candidates"][0]["content"]["parts"][0]["text"] for event in events)
+        assert text.strip() == FakeConfig().text
+
+    def test_injected_errors(self, fake_client):
+        """Test the configured share of requests fails with the configured status."""
+        # Arrange
+        fake_client.put("/_fake/config", json={"latency_ms": 0, "error_rate": 1, "error_status": 429})
+
+        # Act
+        response = fake_client.post("/v1beta/models/gemini-2.0-flash-001:generateContent", json={})
+
+        # Assert
+        assert response.status_code == 429
+        assert response.json()["error"]["status"] == "RESOURCE_EXHAUSTED"
+        assert fake_client.get("/_fake/config").json()["error_rate"] == 1
+
+    def test_latency_distributions(self):
+        """Test sampled latencies follow the configured distribution."""
+        # Arrange
+        fixed = FakeGemini(FakeConfig(latency="fixed", latency_ms=200))
+        uniform = FakeGemini(FakeConfig(latency="uniform", latency_ms=200, seed=1))
+        lognormal = FakeGemini(FakeConfig(latency="lognormal", latency_ms=200, seed=1))
+
+        # Act
+        uniform_samples = [uniform.draw()[0] for _ in range(1000)]
+        lognormal_samples = sorted(lognormal.draw()[0] for _ in range(1000))
+
+        # Assert
+        assert fixed.draw() == (0.2, False)
+        assert all(0 <= sample <= 0.4 for sample in uniform_samples)
+        assert 0.15 < lognormal_samples[500] < 0.25
+        assert lognormal_samples[-1] > 0.4
@@ -0,0 +1,88 @@
+"""Unit tests for health checks."""
+
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.health import DatabaseProbe, job_status, pool_status
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """File-backed engine with a small queue pool."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'health.db'}", pool_size=1, max_overflow=0)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.unit
+class TestHealth:
+    """Test the readiness probes."""
+
+    @pytest.mark.asyncio
+    async def test_database_probe_ok(self, engine):
+        """Test a reachable database reports its ping latency."""
+        # Act
+        result = await DatabaseProbe(sessionmaker(bind=engine)).check()
+
+        # Assert
+        assert result["status"] == "ok"
+        assert result["latency_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_database_probe_times_out_once(self, engine):
+        """Test a slow database fails the check quickly without starting another ping."""
+        # Arrange
+        pings = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def slow(*args):
+            pings.append(1)
+            time.sleep(0.3)
+
+        probe = DatabaseProbe(sessionmaker(bind=engine), timeout=0.05)
+
+        # Act
+        first = await probe.check()
+        second = await probe.check()
+
+        # Assert
+        assert first["status"] == second["status"] == "timeout"
+        assert len(pings) == 1
+
+    @pytest.mark.asyncio
+    async def test_database_probe_error(self, tmp_path):
+        """Test an unusable database is reported as an error."""
+        # Arrange
+        engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'health.db'}")
+
+        # Act
+        result = await DatabaseProbe(sessionmaker(bind=engine)).check()
+
+        # Assert
+        assert result == {"status": "error", "error": "OperationalError"}
+
+    def test_pool_status_saturated(self, engine):
+        """Test the pool reports saturation once every connection is checked out."""
+        # Act
+        idle = pool_status(engine)
+        with engine.connect():
+            busy = pool_status(engine)
+
+        # Assert
+        assert idle["status"] == "ok"
+        assert busy["status"] == "saturated"
+        assert busy["checked_out"] == busy["capacity"] == 1
+
+    def test_job_status(self):
+        """Test a job is lagging only when overdue and not running."""
+        # Arrange
+        stats = {"running": False, "lag_s": 120.0, "last_run_at": None, "next_run_in_s": 0, "runs": 3, "failures": 0}
+
+        # Act & Assert
+        assert job_status(None)["status"] == "not_scheduled"
+        assert job_status(stats)["status"] == "lagging"
+        assert job_status({**stats, "running": True})["status"] == "ok"
+        assert job_status({**stats, "lag_s": 1.0})["status"] == "ok"
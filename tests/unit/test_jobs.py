@@ -0,0 +1,119 @@
+"""Unit tests for the asyncio background job runner."""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.jobs import Job, JobRunner
+
+
+@pytest.mark.unit
+class TestJob:
+    """Test Job scheduling and metrics."""
+
+    def test_idle_runs_back_off(self):
+        """Test that idle runs grow the interval up to the maximum."""
+        # Arrange
+        job = Job("test", lambda: 0, interval=10, max_interval=35, jitter=0)
+
+        # Act
+        intervals = []
+        for _ in range(3):
+            job.record_run(0.01, work_done=0)
+            intervals.append(job.current_interval)
+
+        # Assert
+        assert intervals == [20, 35, 35]
+        assert job.idle_runs == 3
+
+    def test_work_resets_interval(self):
+        """Test that finding work returns the job to its base interval."""
+        # Arrange
+        job = Job("test", lambda: 0, interval=10, max_interval=100, jitter=0)
+        job.record_run(0.01, work_done=0)
+
+        # Act
+        job.record_run(0.02, work_done=3)
+
+        # Assert
+        assert job.current_interval == 10
+        assert job.runs == 2
+        assert job.stats()["max_duration_ms"] == 20.0
+
+    def test_jitter_stays_within_bounds(self):
+        """Test that jitter keeps the next deadline within the configured spread."""
+        # Arrange
+        job = Job("test", lambda: 0, interval=10, jitter=0.1)
+
+        # Act
+        delays = []
+        for _ in range(50):
+            job.schedule_next()
+            delays.append(job.stats()["next_run_in_s"])
+
+        # Assert
+        assert all(8.9 <= delay <= 11.0 for delay in delays)
+
+
+@pytest.mark.unit
+class TestJobRunner:
+    """Test JobRunner execution and shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_runs_job_and_records_metrics(self):
+        """Test that a started runner executes its jobs and collects metrics."""
+        # Arrange
+        calls = []
+        runner = JobRunner()
+        runner.add_job("test", lambda: calls.append(1) or 1, interval=0.01, jitter=0)
+
+        # Act
+        runner.start()
+        await asyncio.sleep(0.1)
+        await runner.stop()
+
+        # Assert
+        assert len(calls) >= 2
+        assert runner.stats()["test"]["runs"] == len(calls)
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted(self):
+        """Test that exceptions in a job are counted instead of stopping the runner."""
+
+        # Arrange
+        def failing_job():
+            raise RuntimeError("boom")
+
+        runner = JobRunner()
+        runner.add_job("failing", failing_job, interval=0.01, jitter=0)
+
+        # Act
+        runner.start()
+        await asyncio.sleep(0.05)
+        await runner.stop()
+
+        # Assert
+        assert runner.stats()["failing"]["failures"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_in_flight_run(self):
+        """Test that shutdown lets a running job finish instead of abandoning it."""
+        # Arrange
+        finished = []
+
+        def slow_job():
+            time.sleep(0.1)
+            finished.append(True)
+            return 1
+
+        runner = JobRunner()
+        runner.add_job("slow", slow_job, interval=0.01, jitter=0)
+
+        # Act
+        runner.start()
+        await asyncio.sleep(0.03)
+        await runner.stop()
+
+        # Assert
+        assert finished == [True]
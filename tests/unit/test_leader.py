@@ -0,0 +1,58 @@
+"""Unit tests for background job leader election."""
+
+import pytest
+
+from backend.leader import LeaderLock
+
+
+@pytest.mark.unit
+class TestLeaderLock:
+    """Test LeaderLock acquisition and release."""
+
+    def test_only_one_holder(self, tmp_path):
+        """Test that a second lock on the same file cannot become leader."""
+        # Arrange
+        lock_path = str(tmp_path / "scheduler.lock")
+        first = LeaderLock(lock_path)
+        second = LeaderLock(lock_path)
+
+        # Act
+        first_acquired = first.try_acquire()
+        second_acquired = second.try_acquire()
+
+        # Assert
+        assert first_acquired is True
+        assert second_acquired is False
+        assert first.is_leader is True
+        assert second.is_leader is False
+
+        first.release()
+
+    def test_reacquire_is_idempotent(self, tmp_path):
+        """Test that the current leader keeps leadership on repeated attempts."""
+        # Arrange
+        lock = LeaderLock(str(tmp_path / "scheduler.lock"))
+
+        # Act & Assert
+        assert lock.try_acquire() is True
+        assert lock.try_acquire() is True
+
+        lock.release()
+
+    def test_release_hands_over_leadership(self, tmp_path):
+        """Test that another worker can take over after the leader releases."""
+        # Arrange
+        lock_path = str(tmp_path / "scheduler.lock")
+        first = LeaderLock(lock_path)
+        second = LeaderLock(lock_path)
+        first.try_acquire()
+
+        # Act
+        first.release()
+        second_acquired = second.try_acquire()
+
+        # Assert
+        assert second_acquired is True
+        assert first.is_leader is False
+
+        second.release()
@@ -0,0 +1,88 @@
+"""Unit tests for structured logging."""
+
+import json
+import logging
+
+import pytest
+
+from backend.logs import JsonFormatter, SamplingFilter, get_request_id, request_id_var, setup_logging, stop_logging
+
+
+def make_record(level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("backend.test", level, __file__, 1, "Hello %s", ("world",), None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+@pytest.mark.unit
+class TestLogging:
+    """Test JSON formatting, sampling and the queued pipeline."""
+
+    def test_json_formatter_includes_extra_fields(self):
+        """Test records become one JSON object with their extra fields and request id."""
+        # Arrange
+        record = make_record(request_id="abc", status=200, sample=True)
+
+        # Act
+        entry = json.loads(JsonFormatter().format(record))
+
+        # Assert
+        assert entry["message"] == "Hello world"
+        assert entry["level"] == "INFO"
+        assert entry["request_id"] == "abc"
+        assert entry["status"] == 200
+        assert "sample" not in entry
+
+    def test_sampling_filter_keeps_whole_requests(self):
+        """Test sampled records are kept or dropped per request id, and warnings always pass."""
+        # Arrange
+        sampler = SamplingFilter(percent=50)
+
+        # Act
+        kept = {}
+        for index in range(200):
+            token = request_id_var.set(f"request-{index}")
+            try:
+                first = sampler.filter(make_record(sample=True))
+                assert sampler.filter(make_record(sample=True)) == first
+                assert sampler.filter(make_record(logging.WARNING, sample=True))
+                assert sampler.filter(make_record())
+                kept[index] = first
+            finally:
+                request_id_var.reset(token)
+
+        # Assert
+        assert 50 < sum(kept.values()) < 150
+        assert sampler.dropped == 2 * (200 - sum(kept.values()))
+
+    def test_get_request_id(self):
+        """Test well-formed incoming ids are reused and anything else is replaced."""
+        # Act & Assert
+        assert get_request_id("abc-123") == "abc-123"
+        assert len(get_request_id(None)) == 32
+        assert get_request_id("bad id\n{}") != "bad id\n{}"
+        assert get_request_id("x" * 65) != "x" * 65
+
+    def test_records_written_by_listener(self, capsys):
+        """Test records go through the queue and come out as JSON lines with the request id."""
+        # Arrange
+        setup_logging("INFO", "json")
+        token = request_id_var.set("req-1")
+
+        # Act
+        try:
+            logging.getLogger("backend.test").info("Task created", extra={"task_id": 7})
+            logging.getLogger("backend.test").debug("Not logged")
+        finally:
+            request_id_var.reset(token)
+            stop_logging()
+
+        # Assert
+        lines = capsys.readouterr().err.strip().splitlines()
+        assert len(lines) == 1
+        entry = json.loads(lines[0])
+        assert entry["message"] == "Task created"
+        assert entry["request_id"] == "req-1"
+        assert entry["task_id"] == 7
+        assert logging.getLogger("backend").propagate
@@ -0,0 +1,166 @@
+"""Unit tests for merging one user's task history into another's."""
+
+import pytest
+
+from backend.database import ArchivedTask, DailyStat, DailyTask, MaterializedDay, TaskTemplate
+from backend.merge import merge_user_tasks
+from backend.search import search_tasks
+from backend.stats import backfill_daily_stats
+
+
+def _add_tasks(test_db, tasks, user_id, table=DailyTask):
+    with test_db() as db:
+        # Archived tasks keep their original ids; make up unused ones
+        first_id = 1000 + db.query(table).count() if table is ArchivedTask else None
+        db.add_all(
+            [
+                table(
+                    id=first_id + index if first_id else None,
+                    task_text=task_text,
+                    created_date=task_date,
+                    completed=completed,
+                    user_id=user_id,
+                )
+                for index, (task_text, task_date, completed) in enumerate(tasks)
+            ]
+        )
+        db.commit()
+        backfill_daily_stats(db)
+
+
+def _tasks(test_db, user_id, table=DailyTask):
+    with test_db() as db:
+        rows = db.query(table).filter_by(user_id=user_id).order_by(table.created_date, table.id).all()
+        return [(row.task_text, row.created_date, row.completed) for row in rows]
+
+
+def _merge(test_db, source="phone", target="laptop"):
+    with test_db() as db:
+        result = merge_user_tasks(db, source, target)
+        db.commit()
+        return result
+
+
+@pytest.mark.unit
+class TestMergeUserTasks:
+    """Test merging a device's task history into another user."""
+
+    def test_merge_moves_all_tasks(self, test_db):
+        """Test every task of the source moves to the target."""
+        # Arrange
+        _add_tasks(test_db, [("Walk", "2024-01-01", True), ("Read", "2024-01-02", False)], "phone")
+        _add_tasks(test_db, [("Stretch", "2024-01-01", False)], "laptop")
+
+        # Act
+        result = _merge(test_db)
+
+        # Assert
+        assert result == {"tasks_moved": 2, "duplicates_merged": 0, "templates_moved": 0}
+        assert _tasks(test_db, "phone") == []
+        assert _tasks(test_db, "laptop") == [
+            ("Walk", "2024-01-01", True),
+            ("Stretch", "2024-01-01", False),
+            ("Read", "2024-01-02", False),
+        ]
+
+    def test_merge_drops_duplicates_and_keeps_completion(self, test_db):
+        """Test duplicate tasks merge, keeping either completion."""
+        # Arrange
+        _add_tasks(test_db, [("Walk", "2024-01-01", True), ("Read", "2024-01-01", False)], "phone")
+        _add_tasks(test_db, [("Walk", "2024-01-01", False), ("Read", "2024-01-01", True)], "laptop")
+
+        # Act
+        result = _merge(test_db)
+
+        # Assert
+        assert result["tasks_moved"] == 0
+        assert result["duplicates_merged"] == 2
+        assert _tasks(test_db, "laptop") == [("Walk", "2024-01-01", True), ("Read", "2024-01-01", True)]
+
+    def test_merge_deduplicates_across_hot_and_archived_tasks(self, test_db):
+        """Test duplicates are found across the hot and archive tables."""
+        # Arrange
+        _add_tasks(test_db, [("Walk", "2020-01-01", True), ("Read", "2020-01-01", False)], "phone")
+        _add_tasks(test_db, [("Walk", "2020-01-01", False)], "laptop", table=ArchivedTask)
+
+        # Act
+        result = _merge(test_db)
+
+        # Assert
+        assert result == {"tasks_moved": 1, "duplicates_merged": 1, "templates_moved": 0}
+        assert _tasks(test_db, "laptop", table=ArchivedTask) == [("Walk", "2020-01-01", True)]
+        assert _tasks(test_db, "laptop") == [("Read", "2020-01-01", False)]
+
+    def test_merge_recomputes_stats_and_search(self, test_db):
+        """Test rollups and the search index follow the merge."""
+        # Arrange
+        _add_tasks(test_db, [("Water plants", "2024-01-01", True)], "phone")
+        _add_tasks(test_db, [("Water plants", "2020-01-01", False)], "phone", table=ArchivedTask)
+        _add_tasks(test_db, [("Walk", "2024-01-01", False)], "laptop")
+
+        # Act
+        _merge(test_db)
+
+        # Assert
+        with test_db() as db:
+            stat = db.get(DailyStat, ("laptop", "2024-01-01"))
+            assert (stat.total_tasks, stat.completed_tasks) == (2, 1)
+            assert db.get(DailyStat, ("phone", "2024-01-01")) is None
+            assert len(search_tasks(db, "laptop", "plants")[0]) == 2
+            assert search_tasks(db, "phone", "plants")[0] == []
+
+    def test_merge_moves_new_templates_and_materialized_days(self, test_db):
+        """Test templates the target lacks move with their materialized days."""
+        # Arrange
+        with test_db() as db:
+            db.add_all(
+                [
+                    TaskTemplate(task_text="Meditate", recurrence="daily", start_date="2024-01-01", user_id="phone"),
+                    TaskTemplate(task_text="Journal", recurrence="daily", start_date="2024-01-01", user_id="phone"),
+                    TaskTemplate(task_text="Journal", recurrence="daily", start_date="2024-01-01", user_id="laptop"),
+                    MaterializedDay(user_id="phone", date="2024-01-02"),
+                    DailyTask(task_text="Meditate", created_date="2024-01-02", completed=False, user_id="phone"),
+                    DailyTask(task_text="Journal", created_date="2024-01-02", completed=False, user_id="phone"),
+                ]
+            )
+            db.commit()
+
+        # Act
+        result = _merge(test_db)
+
+        # Assert
+        assert result["templates_moved"] == 1
+        with test_db() as db:
+            templates = db.query(TaskTemplate).filter_by(user_id="laptop").order_by(TaskTemplate.task_text).all()
+            assert [template.task_text for template in templates] == ["Journal", "Meditate"]
+            assert db.query(TaskTemplate).filter_by(user_id="phone").count() == 0
+            assert db.get(MaterializedDay, ("laptop", "2024-01-02")) is not None
+        assert sorted(task[0] for task in _tasks(test_db, "laptop")) == ["Journal", "Meditate"]
+
+    def test_merge_adds_target_templates_to_claimed_days(self, test_db):
+        """Test moved days get the target's own recurring tasks."""
+        # Arrange
+        with test_db() as db:
+            db.add_all(
+                [
+                    TaskTemplate(task_text="Stretch", recurrence="daily", start_date="2024-01-01", user_id="laptop"),
+                    MaterializedDay(user_id="phone", date="2024-01-02"),
+                    DailyTask(task_text="Meditate", created_date="2024-01-02", completed=False, user_id="phone"),
+                ]
+            )
+            db.commit()
+
+        # Act
+        _merge(test_db)
+
+        # Assert
+        assert _tasks(test_db, "laptop") == [
+            ("Meditate", "2024-01-02", False),
+            ("Stretch", "2024-01-02", False),
+        ]
+
+    def test_merge_into_itself_is_rejected(self, test_db):
+        """Test a user can't be merged into itself."""
+        # Act / Assert
+        with test_db() as db, pytest.raises(ValueError):
+            merge_user_tasks(db, "laptop", "laptop")
@@ -7,6 +7,8 @@ from sqlalchemy.orm import sessionmaker
 from backend.database import OTP, Base
 from backend.otp_handler import generate_and_store_otp, generate_otp, validate_otp
 
+pytestmark = pytest.mark.unit
+
 
 @pytest.fixture(scope="function")
 def db_session():
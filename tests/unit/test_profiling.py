@@ -0,0 +1,87 @@
+"""Unit tests for request profiling."""
+
+import threading
+import time
+
+import pytest
+
+from backend.profiling import RequestProfiler, StackSampler
+
+
+def busy_work(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.mark.unit
+class TestProfiling:
+    """Test the stack sampler and the request profiler."""
+
+    def test_sampler_records_busy_threads(self):
+        """Test stacks of working threads are collected as collapsed stacks."""
+        # Arrange
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_work, args=(stop,))
+        sampler = StackSampler(interval=0.001)
+
+        # Act
+        worker.start()
+        sampler.start()
+        time.sleep(0.05)
+        stacks = sampler.stop()
+        stop.set()
+        worker.join()
+
+        # Assert
+        assert sampler.samples > 0
+        assert any(stack.split(";")[-1].startswith("busy_work (test_profiling.py") for stack in stacks)
+
+    def test_should_profile(self):
+        """Test requests are profiled only with the token or when sampled."""
+        # Arrange
+        by_token = RequestProfiler("unused", token="s3cret")
+        always = RequestProfiler("unused", sample_percent=100)
+        disabled = RequestProfiler("unused")
+
+        # Act & Assert
+        assert by_token.should_profile("s3cret")
+        assert not by_token.should_profile("wrong")
+        assert not by_token.should_profile(None)
+        assert always.should_profile(None)
+        assert not disabled.enabled
+        assert not disabled.should_profile("")
+
+    def test_one_profile_at_a_time(self, tmp_path):
+        """Test a second request isn't profiled while one is running."""
+        # Arrange
+        profiler = RequestProfiler(str(tmp_path), sample_percent=100)
+
+        # Act
+        first = profiler.start()
+        second = profiler.start()
+        profiler.finish(first, "GET-/api/daily-data")
+        third = profiler.start()
+        profiler.finish(third, "GET-/")
+
+        # Assert
+        assert second is None
+        assert profiler.skipped_busy == 1
+        assert profiler.profiled == 2
+
+    def test_finish_writes_and_prunes_profiles(self, tmp_path):
+        """Test profiles are written with a safe name and only the newest are kept."""
+        # Arrange
+        profiler = RequestProfiler(str(tmp_path), sample_percent=100, max_files=2)
+
+        # Act
+        paths = []
+        for index in range(3):
+            sampler = profiler.start()
+            sampler.stacks["main;handler"] = index + 1
+            paths.append(profiler.finish(sampler, f"GET /api/tasks?x=../{index}"))
+
+        # Assert
+        assert all(path.parent == tmp_path for path in paths)
+        assert "/" not in paths[0].name.removesuffix(".collapsed")
+        assert sorted(tmp_path.glob("*.collapsed")) == sorted(paths[1:])
+        assert "main;handler 3\n" in paths[2].read_text()
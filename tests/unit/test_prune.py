@@ -0,0 +1,94 @@
+"""Unit tests for pruning inactive users."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from backend.database import OTP, DailyStat, DailyTask, MaterializedDay, TaskTemplate, User
+from backend.prune import prune_inactive_users
+
+NOW = datetime(2025, 6, 1, tzinfo=UTC)
+OLD = NOW - timedelta(days=100)
+
+
+def _add_users(test_db, user_ids, created_at=OLD):
+    with test_db() as db:
+        db.add_all([User(user_id=user_id, created_at=created_at) for user_id in user_ids])
+        db.commit()
+
+
+def _remaining(test_db):
+    with test_db() as db:
+        return sorted(db.execute(select(User.user_id)).scalars())
+
+
+def _prune(test_db, **kwargs):
+    options = {"inactive_days": 30, "pause": 0, "now": NOW, **kwargs}
+    return prune_inactive_users(test_db, **options)
+
+
+@pytest.mark.unit
+class TestPruneInactiveUsers:
+    """Test pruning inactive users in bounded chunks."""
+
+    def test_prune_deletes_only_inactive_users(self, test_db):
+        """Test only users without recent tasks, templates or sync codes are deleted."""
+        # Arrange
+        _add_users(test_db, ["empty", "stale", "active", "habit", "syncing", "default"])
+        _add_users(test_db, ["new"], created_at=NOW - timedelta(days=1))
+        with test_db() as db:
+            db.add_all(
+                [
+                    DailyTask(task_text="Old", created_date="2025-01-01", user_id="stale"),
+                    DailyTask(task_text="Old", created_date="2025-01-01", user_id="active"),
+                    DailyTask(task_text="Recent", created_date="2025-05-20", user_id="active"),
+                    TaskTemplate(task_text="Walk", recurrence="daily", start_date="2025-01-01", user_id="habit"),
+                    OTP("abc123", "syncing"),
+                ]
+            )
+            db.commit()
+
+        # Act
+        pruned = _prune(test_db, protected_user_ids=["default"])
+
+        # Assert
+        assert pruned == 2
+        assert _remaining(test_db) == ["active", "default", "habit", "new", "syncing"]
+
+    def test_prune_deletes_owned_rows(self, test_db):
+        """Test a pruned user's tasks, rollups and materialized days go too."""
+        # Arrange
+        _add_users(test_db, ["stale", "active"])
+        with test_db() as db:
+            db.add_all(
+                [
+                    DailyTask(task_text="Old", created_date="2025-01-01", user_id="stale"),
+                    DailyTask(task_text="Recent", created_date="2025-05-20", user_id="active"),
+                    DailyStat(user_id="stale", date="2025-01-01", total_tasks=1, completed_tasks=0),
+                    MaterializedDay(user_id="stale", date="2025-01-01"),
+                ]
+            )
+            db.commit()
+
+        # Act
+        _prune(test_db)
+
+        # Assert
+        with test_db() as db:
+            assert [task.user_id for task in db.query(DailyTask).all()] == ["active"]
+            assert db.query(DailyStat).count() == 0
+            assert db.query(MaterializedDay).count() == 0
+
+    def test_prune_works_in_chunks_within_budget(self, test_db):
+        """Test pruning stops after its chunk budget and resumes on the next run."""
+        # Arrange
+        _add_users(test_db, [f"user-{index:02}" for index in range(25)])
+
+        # Act
+        first = _prune(test_db, chunk_size=10, max_chunks=2)
+        second = _prune(test_db, chunk_size=10, max_chunks=2)
+
+        # Assert
+        assert (first, second) == (20, 5)
+        assert _remaining(test_db) == []
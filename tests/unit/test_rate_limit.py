@@ -0,0 +1,66 @@
+"""Unit tests for the token bucket rate limiter."""
+
+from unittest.mock import patch
+
+import pytest
+
+from backend.rate_limit import TokenBucketLimiter
+
+
+@pytest.mark.unit
+class TestTokenBucketLimiter:
+    """Test TokenBucketLimiter behavior."""
+
+    def test_allows_burst_then_limits(self):
+        """Test that a key can spend its burst capacity and is then limited."""
+        # Arrange
+        limiter = TokenBucketLimiter(rate=1, capacity=3)
+
+        # Act
+        results = [limiter.allow("user-1") for _ in range(4)]
+
+        # Assert
+        assert results == [True, True, True, False]
+        assert limiter.stats() == {"keys": 1, "allowed": 3, "limited": 1}
+
+    def test_keys_are_independent(self):
+        """Test that one key being limited does not affect another."""
+        # Arrange
+        limiter = TokenBucketLimiter(rate=1, capacity=1)
+        limiter.allow("user-1")
+
+        # Act & Assert
+        assert limiter.allow("user-1") is False
+        assert limiter.allow("user-2") is True
+
+    def test_tokens_refill_over_time(self):
+        """Test that tokens refill at the configured rate."""
+        # Arrange
+        limiter = TokenBucketLimiter(rate=2, capacity=1)
+
+        # Act
+        with patch("backend.rate_limit.time.monotonic", side_effect=[100.0, 100.1, 100.6]):
+            first = limiter.allow("user-1")
+            too_soon = limiter.allow("user-1")
+            refilled = limiter.allow("user-1")
+
+        # Assert
+        assert (first, too_soon, refilled) == (True, False, True)
+
+    def test_memory_is_bounded(self):
+        """Test that the number of tracked keys never exceeds the shard limits."""
+        # Arrange
+        limiter = TokenBucketLimiter(rate=1, capacity=1, shards=4, max_keys_per_shard=8)
+
+        # Act
+        for i in range(1000):
+            limiter.allow(f"user-{i}")
+
+        # Assert
+        assert limiter.stats()["keys"] <= 4 * 8
+
+    def test_invalid_configuration(self):
+        """Test that a non-positive rate is rejected."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            TokenBucketLimiter(rate=0, capacity=1)
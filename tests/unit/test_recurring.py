@@ -0,0 +1,150 @@
+"""Unit tests for recurring task templates."""
+
+from datetime import date
+
+import pytest
+
+from backend.database import DailyStat, DailyTask, MaterializedDay, TaskTemplate
+from backend.recurring import _claim_day, add_template_to_materialized_days, materialize_day, occurs_on
+
+
+def _add_templates(test_db, templates, user_id="user"):
+    with test_db() as db:
+        rows = [
+            TaskTemplate(user_id=user_id, task_text=task_text, recurrence=recurrence, weekday=weekday, start_date=start)
+            for task_text, recurrence, weekday, start in templates
+        ]
+        db.add_all(rows)
+        db.commit()
+        return [row.id for row in rows]
+
+
+def _task_texts(test_db, task_date, user_id="user"):
+    with test_db() as db:
+        tasks = db.query(DailyTask).filter_by(user_id=user_id, created_date=task_date).order_by(DailyTask.id).all()
+        return [task.task_text for task in tasks]
+
+
+@pytest.mark.unit
+class TestRecurringTasks:
+    """Test recurrence rules and materializing days."""
+
+    def test_occurs_on_rules(self):
+        """Test daily, weekday and weekly rules and the start date."""
+        # Arrange: 2024-01-01 is a Monday
+        daily = TaskTemplate(recurrence="daily", start_date="2024-01-01")
+        weekdays = TaskTemplate(recurrence="weekdays", start_date="2024-01-01")
+        weekly = TaskTemplate(recurrence="weekly", weekday=2, start_date="2024-01-01")
+
+        # Act & Assert
+        assert occurs_on(daily, date(2024, 1, 6))
+        assert not occurs_on(daily, date(2023, 12, 31))
+        assert occurs_on(weekdays, date(2024, 1, 5))
+        assert not occurs_on(weekdays, date(2024, 1, 6))
+        assert occurs_on(weekly, date(2024, 1, 3))
+        assert not occurs_on(weekly, date(2024, 1, 4))
+
+    def test_materialize_day_creates_matching_tasks_once(self, test_db):
+        """Test a day's recurring tasks are created on the first view only."""
+        # Arrange
+        _add_templates(
+            test_db,
+            [("Stretch", "daily", None, "2024-01-01"), ("Standup", "weekdays", None, "2024-01-01")],
+        )
+
+        # Act
+        with test_db() as db:
+            first = [template.task_text for template in materialize_day(db, "user", "2024-01-06")]
+            db.commit()
+        with test_db() as db:
+            second = materialize_day(db, "user", "2024-01-06")
+            db.commit()
+
+        # Assert
+        assert first == ["Stretch"]
+        assert second == []
+        assert _task_texts(test_db, "2024-01-06") == ["Stretch"]
+        with test_db() as db:
+            assert db.get(DailyStat, ("user", "2024-01-06")).total_tasks == 1
+
+    def test_materialize_day_without_templates_writes_nothing(self, test_db):
+        """Test days without matching templates aren't recorded."""
+        # Arrange
+        _add_templates(test_db, [("Stretch", "daily", None, "2024-02-01")])
+
+        # Act
+        with test_db() as db:
+            created = materialize_day(db, "user", "2024-01-15")
+            invalid = materialize_day(db, "user", "not-a-date")
+            db.commit()
+
+        # Assert
+        assert created == invalid == []
+        with test_db() as db:
+            assert db.query(MaterializedDay).count() == 0
+
+    def test_new_template_reaches_materialized_days(self, test_db):
+        """Test a new template adds its task to days already materialized."""
+        # Arrange
+        _add_templates(test_db, [("Stretch", "daily", None, "2024-01-01")])
+        with test_db() as db:
+            for task_date in ("2024-01-01", "2024-01-02", "2024-01-03"):
+                materialize_day(db, "user", task_date)
+            db.commit()
+
+        # Act
+        with test_db() as db:
+            template = TaskTemplate(
+                user_id="user", task_text="Read", recurrence="weekly", weekday=2, start_date="2024-01-02"
+            )
+            db.add(template)
+            db.flush()
+            task_dates = add_template_to_materialized_days(db, template)
+            db.commit()
+
+        # Assert
+        assert task_dates == ["2024-01-03"]
+        assert _task_texts(test_db, "2024-01-03") == ["Stretch", "Read"]
+        assert _task_texts(test_db, "2024-01-02") == ["Stretch"]
+
+    def test_new_template_skips_days_that_already_have_its_text(self, test_db):
+        """Test a new template doesn't duplicate a task already on a materialized day."""
+        # Arrange
+        _add_templates(test_db, [("Stretch", "daily", None, "2024-01-01")])
+        with test_db() as db:
+            for task_date in ("2024-01-01", "2024-01-02"):
+                materialize_day(db, "user", task_date)
+            db.add(DailyTask(task_text="Read", created_date="2024-01-01", user_id="user"))
+            db.commit()
+
+        # Act
+        with test_db() as db:
+            template = TaskTemplate(user_id="user", task_text="Read", recurrence="daily", start_date="2024-01-01")
+            db.add(template)
+            db.flush()
+            task_dates = add_template_to_materialized_days(db, template)
+            db.commit()
+
+        # Assert
+        assert task_dates == ["2024-01-02"]
+        assert _task_texts(test_db, "2024-01-01") == ["Stretch", "Read"]
+        assert _task_texts(test_db, "2024-01-02") == ["Stretch", "Read"]
+
+    def test_materialize_day_without_upsert_support(self, test_db, monkeypatch):
+        """Test a day is claimed once on a dialect without ON CONFLICT."""
+        # Arrange
+        monkeypatch.setattr("backend.recurring.UPSERT_INSERTS", {})
+        _add_templates(test_db, [("Stretch", "daily", None, "2024-01-01")])
+
+        # Act
+        with test_db() as db:
+            created = [template.task_text for template in materialize_day(db, "user", "2024-01-01")]
+            db.commit()
+        with test_db() as db:
+            claimed_again = _claim_day(db, "user", "2024-01-01")
+            db.commit()
+
+        # Assert
+        assert created == ["Stretch"]
+        assert claimed_again is False
+        assert _task_texts(test_db, "2024-01-01") == ["Stretch"]
@@ -0,0 +1,153 @@
+"""Unit tests for full-text search over task history."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.archive import archive_old_tasks
+from backend.database import TASK_SEARCH_TABLE, Base, DailyTask, init_db
+from backend.search import build_match_query, build_user_match_query, rebuild_search_index, search_tasks
+
+
+def _add_tasks(test_db, tasks, user_id="user"):
+    with test_db() as db:
+        rows = [
+            DailyTask(task_text=task_text, created_date=task_date, user_id=user_id) for task_text, task_date in tasks
+        ]
+        db.add_all(rows)
+        db.commit()
+        return [row.id for row in rows]
+
+
+def _descriptions(results):
+    return [result["description"] for result in results]
+
+
+@pytest.mark.unit
+class TestTaskSearch:
+    """Test full-text search over task history."""
+
+    def test_build_match_query_quotes_words_and_prefixes_last(self):
+        """Test query words are quoted and the last one matched as a prefix."""
+        # Act & Assert
+        assert build_match_query('Go "running" OR -park') == '"go" "running" "or" "park"*'
+        assert build_match_query("  *** ") is None
+
+    def test_build_user_match_query_filters_on_indexed_owner(self):
+        """Test the owner filter quotes the user id inside the MATCH."""
+        # Act & Assert
+        assert build_user_match_query('a"b', '"run"*') == 'user_id : "a""b" AND task_text : ("run"*)'
+
+    def test_search_is_scoped_to_user_and_matches_prefixes(self, test_db):
+        """Test a search only finds the user's tasks and matches prefixes."""
+        # Arrange
+        _add_tasks(test_db, [("Go running", "2024-01-01"), ("Read a book", "2024-01-02")])
+        _add_tasks(test_db, [("Go running too", "2024-01-01")], user_id="other")
+
+        # Act
+        with test_db() as db:
+            results, has_more = search_tasks(db, "user", "run")
+
+        # Assert
+        assert _descriptions(results) == ["Go running"]
+        assert has_more is False
+
+    def test_search_follows_updates_deletes_and_archival(self, test_db):
+        """Test the index follows renames, deletes and archival."""
+        # Arrange
+        old_id, renamed_id, deleted_id = _add_tasks(
+            test_db, [("Old walk", "2000-01-01"), ("Quick walk", "2024-01-01"), ("Walk the dog", "2024-01-01")]
+        )
+
+        # Act
+        with test_db() as db:
+            db.get(DailyTask, renamed_id).task_text = "Quick swim"
+            db.delete(db.get(DailyTask, deleted_id))
+            db.commit()
+        archive_old_tasks(test_db, horizon_days=90)
+
+        with test_db() as db:
+            walk_results, _ = search_tasks(db, "user", "walk")
+            swim_results, _ = search_tasks(db, "user", "swim")
+
+        # Assert
+        assert [result["id"] for result in walk_results] == [old_id]
+        assert _descriptions(swim_results) == ["Quick swim"]
+
+    def test_search_paginates(self, test_db):
+        """Test results are paged with a flag for more."""
+        # Arrange
+        _add_tasks(test_db, [(f"Stretch {i}", f"2024-01-0{i}") for i in range(1, 6)])
+
+        # Act
+        with test_db() as db:
+            first_page, first_has_more = search_tasks(db, "user", "stretch", limit=2)
+            last_page, last_has_more = search_tasks(db, "user", "stretch", limit=2, offset=4)
+
+        # Assert
+        assert len(first_page) == 2
+        assert first_has_more is True
+        assert len(last_page) == 1
+        assert last_has_more is False
+
+    def test_rebuild_indexes_existing_tasks(self, test_db):
+        """Test a rebuild indexes tasks written before the index."""
+        # Arrange: simulate tasks written before the index existed
+        _add_tasks(test_db, [("Meditate", "2024-01-01"), ("Journal", "2024-01-01")])
+        with test_db() as db:
+            db.execute(text("DELETE FROM task_search"))
+            db.commit()
+
+        # Act
+        with test_db() as db:
+            indexed = rebuild_search_index(db)
+            results, _ = search_tasks(db, "user", "meditate")
+
+        # Assert
+        assert indexed == 2
+        assert _descriptions(results) == ["Meditate"]
+
+    def test_search_only_returns_the_users_rows_among_many_others(self, test_db):
+        """Test other users' matching rows, even with similar ids, never show up."""
+        # Arrange: other users with the same task text, including ids sharing the user's tokens
+        other_user_ids = [f"other-{index}" for index in range(200)] + ["user-2", "default_user"]
+        with test_db() as db:
+            db.add_all(
+                DailyTask(task_text="Go running", created_date="2024-01-01", user_id=other_user_id)
+                for other_user_id in other_user_ids
+            )
+            db.commit()
+        _add_tasks(test_db, [("Go running", "2024-01-02"), ("Read a book", "2024-01-02")])
+
+        # Act
+        with test_db() as db:
+            results, has_more = search_tasks(db, "user", "running", limit=1)
+            owner_token_results, _ = search_tasks(db, "user", "user")
+
+        # Assert
+        assert [(result["description"], result["date"]) for result in results] == [("Go running", "2024-01-02")]
+        assert has_more is False
+        assert owner_token_results == []
+
+    def test_init_db_reindexes_search_table_without_indexed_owner(self):
+        """Test an index from before the owner was indexed is rebuilt on start."""
+        # Arrange: a database whose search table predates the indexed owner column
+        engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f"DROP TABLE {TASK_SEARCH_TABLE}")
+            connection.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {TASK_SEARCH_TABLE} USING fts5(task_text, user_id UNINDEXED, created_date UNINDEXED)"
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO daily_tasks (task_text, created_date, user_id) VALUES ('Meditate', '2024-01-01', 'user')"
+            )
+
+        # Act
+        init_db(engine)
+
+        # Assert
+        with sessionmaker(bind=engine)() as db:
+            results, _ = search_tasks(db, "user", "meditate")
+        assert _descriptions(results) == ["Meditate"]
+        engine.dispose()
@@ -0,0 +1,171 @@
+"""Unit tests for daily stats rollups and streaks."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from backend.database import ArchivedTask, DailyStat, DailyTask
+from backend.stats import STREAK_WINDOW_DAYS, adjust_daily_stats, backfill_daily_stats, get_user_stats
+from backend.write_behind import CompletionBuffer
+
+
+def _rollup(test_db, user_id="user"):
+    with test_db() as db:
+        rows = db.query(DailyStat).filter(DailyStat.user_id == user_id).order_by(DailyStat.date).all()
+        return [(row.date, row.total_tasks, row.completed_tasks) for row in rows]
+
+
+@pytest.mark.unit
+class TestDailyStats:
+    """Test rollup maintenance and statistics reads."""
+
+    def test_adjust_creates_and_accumulates_rows(self, test_db):
+        """Test adjustments create a day's row and then add to it."""
+        # Act
+        with test_db() as db:
+            adjust_daily_stats(db, "user", "2024-03-01", total_delta=1)
+            adjust_daily_stats(db, "user", "2024-03-01", total_delta=1, completed_delta=1)
+            adjust_daily_stats(db, "user", "2024-03-02", total_delta=1)
+            db.commit()
+
+        # Assert
+        assert _rollup(test_db) == [("2024-03-01", 2, 1), ("2024-03-02", 1, 0)]
+
+    def test_adjust_without_upsert_support(self, test_db, monkeypatch):
+        """Test adjustments on a dialect without ON CONFLICT."""
+        # Arrange: behave like a dialect without ON CONFLICT
+        monkeypatch.setattr("backend.stats.UPSERT_INSERTS", {})
+
+        # Act
+        with test_db() as db:
+            adjust_daily_stats(db, "user", "2024-03-01", total_delta=1)
+            adjust_daily_stats(db, "user", "2024-03-01", total_delta=1, completed_delta=1)
+            db.commit()
+
+        # Assert
+        assert _rollup(test_db) == [("2024-03-01", 2, 1)]
+
+    def test_backfill_counts_hot_and_archived_tasks(self, test_db):
+        """Test the backfill counts tasks in both tables."""
+        # Arrange
+        with test_db() as db:
+            db.add_all(
+                [
+                    DailyTask(task_text="Hot", created_date="2024-03-02", user_id="user", completed=True),
+                    DailyTask(task_text="Hot", created_date="2024-03-02", user_id="user", completed=False),
+                    DailyTask(task_text="Other", created_date="2024-03-02", user_id="other", completed=True),
+                    ArchivedTask(id=100, task_text="Old", created_date="2024-01-01", user_id="user", completed=True),
+                    DailyStat(user_id="user", date="2023-01-01", total_tasks=9, completed_tasks=9),
+                ]
+            )
+            db.commit()
+
+        # Act
+        with test_db() as db:
+            written = backfill_daily_stats(db)
+
+        # Assert
+        assert written == 3
+        assert _rollup(test_db) == [("2024-01-01", 1, 1), ("2024-03-02", 2, 1)]
+        assert _rollup(test_db, "other") == [("2024-03-02", 1, 1)]
+
+    def test_user_stats_zero_fills_range_and_counts_streaks(self, test_db):
+        """Test days without tasks are zero-filled and streaks counted."""
+        # Arrange: a 3 day run, a gap, then a 2 day run ending yesterday
+        with test_db() as db:
+            for day in ["2024-03-01", "2024-03-02", "2024-03-03", "2024-03-07", "2024-03-08"]:
+                adjust_daily_stats(db, "user", day, total_delta=2, completed_delta=1)
+            adjust_daily_stats(db, "user", "2024-03-05", total_delta=1)
+            db.commit()
+
+        # Act
+        with test_db() as db:
+            stats = get_user_stats(db, "user", date(2024, 3, 5), date(2024, 3, 9), today=date(2024, 3, 9))
+
+        # Assert
+        assert [day["date"] for day in stats["days"]] == [
+            "2024-03-05",
+            "2024-03-06",
+            "2024-03-07",
+            "2024-03-08",
+            "2024-03-09",
+        ]
+        assert stats["days"][1] == {"date": "2024-03-06", "total_tasks": 0, "completed_tasks": 0}
+        assert stats["total_tasks"] == 5
+        assert stats["completed_tasks"] == 2
+        assert stats["completion_rate"] == 0.4
+        assert stats["current_streak"] == 2
+        assert stats["longest_streak"] == 3
+
+    def test_user_stats_streak_broken_before_yesterday(self, test_db):
+        """Test the current streak ends when neither today nor yesterday was completed."""
+        # Arrange
+        with test_db() as db:
+            adjust_daily_stats(db, "user", "2024-03-01", total_delta=1, completed_delta=1)
+            db.commit()
+
+        # Act
+        with test_db() as db:
+            stats = get_user_stats(db, "user", date(2024, 3, 1), date(2024, 3, 3), today=date(2024, 3, 3))
+
+        # Assert
+        assert stats["current_streak"] == 0
+        assert stats["longest_streak"] == 1
+
+    def test_user_stats_streaks_only_look_back_a_bounded_window(self, test_db):
+        """Test streaks only consider days within the window."""
+        # Arrange: a long run of completed days, most of it older than the window
+        with test_db() as db:
+            for offset in range(STREAK_WINDOW_DAYS + 100):
+                day = (date(2024, 3, 1) - timedelta(days=offset)).isoformat()
+                adjust_daily_stats(db, "user", day, total_delta=1, completed_delta=1)
+            db.commit()
+
+        # Act
+        with test_db() as db:
+            stats = get_user_stats(db, "user", date(2024, 3, 1), date(2024, 3, 1), today=date(2024, 3, 1))
+
+        # Assert
+        assert stats["current_streak"] == STREAK_WINDOW_DAYS
+        assert stats["longest_streak"] == STREAK_WINDOW_DAYS
+        assert stats["streak_window_days"] == STREAK_WINDOW_DAYS
+
+    def test_write_behind_flush_adjusts_rollups(self, test_db):
+        """Test flushed toggles move the completed counts."""
+        # Arrange
+        with test_db() as db:
+            task = DailyTask(task_text="Task", created_date="2024-03-01", user_id="user", completed=False)
+            db.add(task)
+            adjust_daily_stats(db, "user", "2024-03-01", total_delta=1)
+            db.commit()
+            task_id = task.id
+
+        buffer = CompletionBuffer()
+
+        # Act: an unchanged state must not be counted twice
+        buffer.record(task_id, True)
+        buffer.flush(test_db)
+        buffer.record(task_id, True)
+        buffer.flush(test_db)
+
+        # Assert
+        assert _rollup(test_db) == [("2024-03-01", 1, 1)]
+
+    def test_write_behind_flush_ignores_state_changed_by_another_writer(self, test_db):
+        """Test a flush doesn't count a state another writer already stored."""
+        # Arrange: another writer completed the task, and counted it, after the toggle was buffered
+        with test_db() as db:
+            task = DailyTask(task_text="Task", created_date="2024-03-01", user_id="user", completed=True)
+            db.add(task)
+            adjust_daily_stats(db, "user", "2024-03-01", total_delta=1, completed_delta=1)
+            db.commit()
+            task_id = task.id
+
+        buffer = CompletionBuffer()
+        buffer.record(task_id, True)
+
+        # Act
+        buffer.flush(test_db)
+
+        # Assert
+        assert _rollup(test_db) == [("2024-03-01", 1, 1)]
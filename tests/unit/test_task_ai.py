@@ -4,7 +4,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from backend.task_ai import TaskAI
+from backend.task_ai import CircuitBreaker, TaskAI
 
 
 @pytest.mark.unit
@@ -17,13 +17,31 @@ class TestTaskAI:
         test_api_key = "test-api-key"
 
         # Act
-        with patch("backend.task_ai.genai.Client") as mock_client:
+        with patch("google.genai.Client") as mock_client:
             task_ai = TaskAI(test_api_key)
+            mock_client.assert_not_called()
+            client = task_ai.client
 
         # Assert
-        mock_client.assert_called_once_with(api_key=test_api_key)
+        mock_client.assert_called_once()
+        assert mock_client.call_args.kwargs["api_key"] == test_api_key
+        assert mock_client.call_args.kwargs["http_options"].timeout == 5000
+        assert client is task_ai.client
         assert task_ai.model == "gemini-2.0-flash-001"
 
+    def test_init_with_base_url(self):
+        """Test TaskAI can be pointed at another Gemini endpoint."""
+        # Arrange
+        base_url = "http://127.0.0.1:8090"
+
+        # Act
+        with patch("google.genai.Client") as mock_client:
+            client = TaskAI("test-api-key", base_url=base_url).client
+
+        # Assert
+        assert client is mock_client.return_value
+        assert mock_client.call_args.kwargs["http_options"].base_url == base_url
+
     def test_celebrate_task_completion_empty_task(self):
         """Test celebration with empty task returns fallback."""
         # Arrange
@@ -31,7 +49,7 @@ class TestTaskAI:
         expected_fallback = "Great job completing your task! You're taking wonderful care of yourself. 🌟"
 
         # Act
-        with patch("backend.task_ai.genai.Client"):
+        with patch("google.genai.Client"):
             task_ai = TaskAI("test-api-key")
             result = task_ai.celebrate_task_completion(empty_task)
 
@@ -46,7 +64,7 @@ class TestTaskAI:
         expected_response = "Amazing work on that task! 🍂✨"
 
         # Act
-        with patch("backend.task_ai.genai.Client") as mock_client:
+        with patch("google.genai.Client") as mock_client:
             mock_response = Mock()
             mock_response.text = expected_response
             mock_client.return_value.models.generate_content.return_value = mock_response
@@ -63,7 +81,7 @@ class TestTaskAI:
         task_description = "Complete morning routine"
 
         # Act
-        with patch("backend.task_ai.genai.Client") as mock_client:
+        with patch("google.genai.Client") as mock_client:
             mock_client.return_value.models.generate_content.side_effect = Exception("API Error")
 
             task_ai = TaskAI("test-api-key")
@@ -79,7 +97,7 @@ class TestTaskAI:
         malicious_input = "<script>alert('test')</script>"
 
         # Act
-        with patch("backend.task_ai.genai.Client") as mock_client:
+        with patch("google.genai.Client") as mock_client:
             mock_response = Mock()
             mock_response.text = "Great job! 🌟"
             mock_client.return_value.models.generate_content.return_value = mock_response
@@ -100,9 +118,110 @@ class TestTaskAI:
         expected_message = "Beautiful work completing 'Test task'! You're taking such good care of yourself. 🌟"
 
         # Act
-        with patch("backend.task_ai.genai.Client"):
+        with patch("google.genai.Client"):
             task_ai = TaskAI("test-api-key")
             result = task_ai._get_fallback_message(task_description)
 
         # Assert
         assert result == expected_message
+
+    def test_get_fallback_message_sanitizes_input(self):
+        """Test that the public fallback escapes the task and never calls Gemini."""
+        # Arrange
+        task_description = "<b>Stretch</b>"
+
+        # Act
+        with patch("google.genai.Client") as mock_client:
+            task_ai = TaskAI("test-api-key")
+            result = task_ai.get_fallback_message(task_description)
+
+        # Assert
+        mock_client.assert_not_called()
+        assert "&lt;b&gt;Stretch&lt;/b&gt;" in result
+
+    def test_open_breaker_skips_gemini(self):
+        """Test that repeated failures open the breaker and later calls fall back without Gemini."""
+        # Arrange
+        breaker = CircuitBreaker(min_calls=2, open_seconds=60)
+
+        # Act
+        with patch("google.genai.Client") as mock_client:
+            mock_client.return_value.models.generate_content.side_effect = Exception("API Error")
+
+            task_ai = TaskAI("test-api-key", breaker=breaker)
+            results = [task_ai.celebrate_task_completion("Stretch") for _ in range(4)]
+
+        # Assert
+        assert mock_client.return_value.models.generate_content.call_count == 2
+        assert all("Beautiful work completing 'Stretch'!" in result for result in results)
+        assert breaker.snapshot()["state"] == "open"
+        assert breaker.snapshot()["rejected"] == 2
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    def test_opens_on_failure_rate(self):
+        """Test that the breaker opens once the failure rate reaches the threshold."""
+        # Arrange
+        breaker = CircuitBreaker(window_size=4, min_calls=4, failure_rate_threshold=0.5)
+
+        # Act
+        for success in (True, True, False):
+            breaker.record(success=success, duration=0.1)
+        state_before = breaker.state
+        breaker.record(success=False, duration=0.1)
+
+        # Assert
+        assert state_before == "closed"
+        assert breaker.state == "open"
+        assert breaker.allow() is False
+
+    def test_slow_calls_count_as_failures(self):
+        """Test that calls over the latency threshold open the breaker."""
+        # Arrange
+        breaker = CircuitBreaker(min_calls=2, slow_call_seconds=1.0)
+
+        # Act
+        breaker.record(success=True, duration=1.5)
+        breaker.record(success=True, duration=2.0)
+
+        # Assert
+        assert breaker.state == "open"
+        assert breaker.snapshot()["slow_calls"] == 2
+
+    def test_snapshot_reports_latency_percentiles(self):
+        """Test recent call durations are summarized in the snapshot."""
+        # Arrange
+        breaker = CircuitBreaker(window_size=20)
+
+        # Act
+        empty = breaker.snapshot()
+        for duration_ms in range(1, 21):
+            breaker.record(success=True, duration=duration_ms / 1000)
+        snapshot = breaker.snapshot()
+
+        # Assert
+        assert empty["latency_p50_ms"] is None
+        assert snapshot["latency_p50_ms"] == 11.0
+        assert snapshot["latency_p95_ms"] == 20.0
+
+    def test_half_open_probe_closes_or_reopens(self):
+        """Test that a successful probe closes the breaker and a failed one re-opens it."""
+        # Arrange
+        breaker = CircuitBreaker(min_calls=1, open_seconds=0, half_open_probes=1)
+        breaker.record(success=False, duration=0.1)
+
+        # Act
+        first_probe = breaker.allow()
+        second_probe = breaker.allow()
+        breaker.record(success=False, duration=0.1)
+        reopened = breaker.snapshot()["times_opened"]
+        breaker.allow()
+        breaker.record(success=True, duration=0.1)
+
+        # Assert
+        assert (first_probe, second_probe) == (True, False)
+        assert reopened == 2
+        assert breaker.state == "closed"
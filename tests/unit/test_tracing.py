@@ -0,0 +1,161 @@
+"""Unit tests for span tracing."""
+
+import asyncio
+import io
+import json
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from backend.jobs import JobRunner
+from backend.tracing import (
+    SERVER,
+    BatchExporter,
+    InMemoryExporter,
+    Span,
+    instrument_engine,
+    parse_traceparent,
+    tracer,
+)
+
+
+@pytest.fixture
+def spans():
+    """Record spans from the shared tracer in memory."""
+    exporter = InMemoryExporter()
+    tracer.configure(exporter)
+    yield exporter.spans
+    tracer.shutdown()
+
+
+@pytest.mark.unit
+class TestTracing:
+    """Test span creation, propagation and export."""
+
+    def test_nested_spans_share_trace(self, spans):
+        """Test child spans link to their parent and finish first."""
+        # Act
+        with tracer.span("parent", kind=SERVER) as parent:
+            with tracer.span("child", attributes={"answer": 42}):
+                pass
+
+        # Assert
+        child, recorded_parent = spans
+        assert recorded_parent is parent
+        assert child.trace_id == parent.trace_id
+        assert child.parent_span_id == parent.span_id
+        assert parent.parent_span_id is None
+        assert child.attributes == {"answer": 42}
+
+    def test_exceptions_mark_span_failed(self, spans):
+        """Test an exception escaping a span sets its error status."""
+        # Act
+        with pytest.raises(ValueError):
+            with tracer.span("failing"):
+                raise ValueError("boom")
+
+        # Assert
+        assert spans[0].error == "ValueError: boom"
+        assert spans[0].to_otlp()["status"]["code"] == "STATUS_CODE_ERROR"
+
+    def test_continues_remote_trace(self, spans):
+        """Test a valid traceparent header makes the span part of the caller's trace."""
+        # Arrange
+        header = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+        # Act
+        with tracer.span("request", traceparent=header):
+            pass
+        with tracer.span("unsampled", traceparent="00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-00"):
+            pass
+
+        # Assert
+        assert len(spans) == 1
+        assert spans[0].trace_id == "0af7651916cd43dd8448eb211c80319c"
+        assert spans[0].parent_span_id == "b7ad6b7169203331"
+
+    def test_parse_traceparent(self):
+        """Test malformed or all-zero traceparent headers are ignored."""
+        # Act & Assert
+        assert parse_traceparent("00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01") == (
+            "0af7651916cd43dd8448eb211c80319c",
+            "b7ad6b7169203331",
+            True,
+        )
+        assert parse_traceparent(None) is None
+        assert parse_traceparent("garbage") is None
+        assert parse_traceparent("00-" + "0" * 32 + "-b7ad6b7169203331-01") is None
+
+    def test_disabled_tracer_records_nothing(self):
+        """Test spans are skipped entirely while no exporter is configured."""
+        # Act
+        with tracer.span("ignored") as span:
+            pass
+
+        # Assert
+        assert span is None
+
+    def test_sql_statements_traced_inside_traces(self, spans):
+        """Test SQL runs under the current span and is ignored outside traces."""
+        # Arrange
+        engine = create_engine("sqlite:///:memory:")
+        instrument_engine(engine)
+
+        # Act
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            with tracer.span("request"):
+                connection.execute(text("SELECT 2"))
+
+        # Assert
+        statement, request = spans
+        assert statement.name == "db SELECT"
+        assert statement.parent_span_id == request.span_id
+        assert statement.attributes["db.query.text"] == "SELECT 2"
+        engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_job_runs_are_traced(self, spans):
+        """Test each job run gets a span that its worker thread's spans nest under."""
+
+        # Arrange
+        def job():
+            with tracer.span("work"):
+                return 3
+
+        runner = JobRunner()
+        runner.add_job("traced", job, interval=60, jitter=0)
+        runner.jobs["traced"].next_run_at = 0
+
+        # Act
+        runner.start()
+        await asyncio.sleep(0.05)
+        await runner.stop()
+
+        # Assert
+        work, run = spans[:2]
+        assert run.name == "job traced"
+        assert run.attributes["job.work_done"] == 3
+        assert work.parent_span_id == run.span_id
+
+    def test_batch_exporter_writes_otlp_json(self):
+        """Test queued spans are written as OTLP/JSON lines on shutdown at the latest."""
+        # Arrange
+        stream = io.StringIO()
+        stream.close = lambda: None
+        exporter = BatchExporter(stream, "test-service")
+        span = Span("request", SERVER, "a" * 32, None, True)
+        span.attributes["http.response.status_code"] = 200
+
+        # Act
+        exporter.submit(span)
+        exporter.shutdown()
+
+        # Assert
+        line = json.loads(stream.getvalue().splitlines()[0])
+        resource_spans = line["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"][0]["value"]["stringValue"] == "test-service"
+        exported = resource_spans["scopeSpans"][0]["spans"][0]
+        assert exported["traceId"] == "a" * 32
+        assert exported["kind"] == "SPAN_KIND_SERVER"
+        assert exported["attributes"] == [{"key": "http.response.status_code", "value": {"intValue": "200"}}]
@@ -0,0 +1,96 @@
+"""Unit tests for the write-behind completion buffer."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base, DailyTask
+from backend.write_behind import CompletionBuffer
+
+
+@pytest.fixture(scope="function")
+def session_factory():
+    # Setup in-memory SQLite database for testing
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield SessionLocal
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def _create_tasks(session_factory, count):
+    with session_factory() as db:
+        tasks = [DailyTask(task_text=f"Task {i}", created_date="2024-01-01", user_id="user") for i in range(count)]
+        db.add_all(tasks)
+        db.commit()
+        return [task.id for task in tasks]
+
+
+@pytest.mark.unit
+class TestCompletionBuffer:
+    """Test CompletionBuffer coalescing, read-through and flushing."""
+
+    def test_coalesces_toggles(self):
+        """Test that only the latest state per task is kept."""
+        # Arrange
+        buffer = CompletionBuffer()
+
+        # Act
+        for completed in (True, False, True):
+            buffer.record(1, completed)
+
+        # Assert
+        assert len(buffer) == 1
+        assert buffer.get(1) is True
+        assert buffer.stats() == {"pending": 1, "recorded": 3, "flushed": 0}
+
+    def test_flush_writes_latest_state(self, session_factory):
+        """Test that a flush writes every buffered task in one batch."""
+        # Arrange
+        task_ids = _create_tasks(session_factory, 3)
+        buffer = CompletionBuffer()
+        buffer.record(task_ids[0], True)
+        buffer.record(task_ids[0], False)
+        buffer.record(task_ids[1], True)
+
+        # Act
+        written = buffer.flush(session_factory)
+
+        # Assert
+        with session_factory() as db:
+            states = {task.id: task.completed for task in db.query(DailyTask).all()}
+        assert written == 2
+        assert states == {task_ids[0]: False, task_ids[1]: True, task_ids[2]: False}
+        assert len(buffer) == 0
+        assert buffer.get(task_ids[1]) is None
+
+    def test_flush_failure_keeps_states(self):
+        """Test that buffered states survive a failed flush."""
+
+        # Arrange
+        def broken_session():
+            raise RuntimeError("database unavailable")
+
+        buffer = CompletionBuffer()
+        buffer.record(1, True)
+
+        # Act
+        with pytest.raises(RuntimeError):
+            buffer.flush(broken_session)
+
+        # Assert
+        assert buffer.get(1) is True
+        assert len(buffer) == 1
+
+    def test_discard_forgets_state(self):
+        """Test that discarded tasks are no longer buffered."""
+        # Arrange
+        buffer = CompletionBuffer()
+        buffer.record(1, True)
+
+        # Act
+        buffer.discard([1])
+
+        # Assert
+        assert buffer.get(1) is None